@@ -0,0 +1,322 @@
+"""
+Copyright (c) Cutleast
+
+Generator for synthetic XML files in the format FFDec converts SWF files to. The
+generated files have the same structure as real ones, so that the XML processing can
+be benchmarked at any size without FFDec or the original SWF files.
+"""
+
+import xml.etree.ElementTree as ET
+from collections.abc import Iterator
+from dataclasses import dataclass
+from typing import Optional
+
+from core.patch.patch_item import PatchItem
+
+
+@dataclass(frozen=True)
+class SwfSize:
+    """
+    Size of a synthetic SWF file.
+    """
+
+    sprites: int
+    """Number of `DefineSpriteTag` items."""
+
+    frames: int = 4
+    """Number of frames of each sprite. Should be at least 2."""
+
+    items_per_frame: int = 5
+    """Number of `PlaceObject2Tag` items in each frame of a sprite."""
+
+    shapes: int = 0
+    """Number of `DefineShapeTag` items. 0 creates one shape per sprite."""
+
+    edges_per_shape: int = 20
+    """Number of edge records of each shape."""
+
+    @property
+    def shape_count(self) -> int:
+        """
+        The actual number of shapes.
+        """
+
+        return self.shapes or self.sprites
+
+
+@dataclass(frozen=True)
+class Placement:
+    """
+    A `PlaceObject2Tag` item in a frame of a sprite.
+    """
+
+    sprite_id: int
+    frame_id: int
+    depth: int
+    character_id: int
+    translate_x: int
+    translate_y: int
+
+
+def iter_placements(size: SwfSize, moved: int = 0) -> Iterator[Placement]:
+    """
+    Yields the placements of all sprites in the order they appear in the XML.
+
+    The shapes have the character ids from 1 and the sprites the ones after them.
+    Each sprite places shapes and the sprites defined before it, so that the sprites
+    are nested like the movie clips of a real menu.
+
+    Args:
+        size (SwfSize): Size of the SWF file.
+        moved (int, optional):
+            Moves every n-th placement, as a patch would. Defaults to 0 (none).
+
+    Yields:
+        Placement: The placements
+    """
+
+    first_sprite_id: int = size.shape_count + 1
+    index: int = 0
+
+    for sprite in range(size.sprites):
+        sprite_id: int = first_sprite_id + sprite
+
+        for frame_id in range(1, size.frames + 1):
+            for depth in range(1, size.items_per_frame + 1):
+                # every other item is a sprite that was defined before this one
+                if depth % 2 == 0 and sprite > 0:
+                    character_id: int = first_sprite_id + (sprite + depth) % sprite
+                else:
+                    character_id = 1 + (sprite + depth) % size.shape_count
+
+                translate_x: int = depth * 400 + frame_id * 20
+                translate_y: int = depth * 200
+                if moved and index % moved == 0:
+                    translate_x -= 1240
+                    translate_y += 560
+                index += 1
+
+                yield Placement(
+                    sprite_id, frame_id, depth, character_id, translate_x, translate_y
+                )
+
+
+def create_shape(shape_id: int, edges: int, changed: bool) -> ET.Element:
+    """
+    Creates a `DefineShapeTag` item with a fill style and a closed outline.
+
+    Args:
+        shape_id (int): The id of the shape.
+        edges (int): The number of edge records.
+        changed (bool): Whether the outline is changed, as a patch would.
+
+    Returns:
+        ET.Element: The shape item
+    """
+
+    shape = ET.Element("item", type="DefineShapeTag", shapeId=str(shape_id))
+    ET.SubElement(
+        shape, "shapeBounds", type="RECT", Xmin="0", Xmax="2000", Ymin="0", Ymax="2000"
+    )
+
+    shapes = ET.SubElement(shape, "shapes", type="SHAPEWITHSTYLE")
+    fill_styles = ET.SubElement(
+        ET.SubElement(shapes, "fillStyles", type="FILLSTYLEARRAY"), "fillStyles"
+    )
+    fill_style = ET.SubElement(fill_styles, "item", type="FILLSTYLE", fillStyleType="0")
+    ET.SubElement(
+        fill_style, "color", type="RGB", red=str(shape_id % 256), green="0", blue="0"
+    )
+    ET.SubElement(
+        ET.SubElement(shapes, "lineStyles", type="LINESTYLEARRAY"), "lineStyles"
+    )
+
+    records = ET.SubElement(shapes, "shapeRecords")
+    ET.SubElement(
+        records,
+        "item",
+        type="StyleChangeRecord",
+        stateFillStyle0="true",
+        fillStyle0="1",
+        stateMoveTo="true",
+        moveDeltaX="0",
+        moveDeltaY="0",
+    )
+    for edge in range(edges):
+        delta: int = 2000 // max(edges // 4, 1)
+        if changed and edge == 0:
+            delta += 100
+        delta_x: int = delta if edge % 4 == 0 else -delta if edge % 4 == 2 else 0
+        delta_y: int = delta if edge % 4 == 1 else -delta if edge % 4 == 3 else 0
+        ET.SubElement(
+            records,
+            "item",
+            type="StraightEdgeRecord",
+            generalLineFlag="true",
+            deltaX=str(delta_x),
+            deltaY=str(delta_y),
+        )
+    ET.SubElement(records, "item", type="EndShapeRecord")
+
+    return shape
+
+
+def create_placement(placement: Placement) -> ET.Element:
+    """
+    Creates a `PlaceObject2Tag` item with a matrix.
+
+    Args:
+        placement (Placement): The placement.
+
+    Returns:
+        ET.Element: The placement item
+    """
+
+    item = ET.Element(
+        "item",
+        type="PlaceObject2Tag",
+        characterId=str(placement.character_id),
+        depth=str(placement.depth),
+        placeFlagHasCharacter="true",
+        placeFlagHasMatrix="true",
+        placeFlagMove="false",
+    )
+    ET.SubElement(
+        item,
+        "matrix",
+        type="MATRIX",
+        hasRotate="false",
+        hasScale="false",
+        translateX=str(placement.translate_x),
+        translateY=str(placement.translate_y),
+    )
+
+    return item
+
+
+def generate_ffdec_xml(
+    size: SwfSize, moved: int = 0, reshaped: int = 0
+) -> ET.ElementTree:
+    """
+    Generates the XML of a synthetic SWF file.
+
+    Args:
+        size (SwfSize): Size of the SWF file.
+        moved (int, optional):
+            Moves every n-th placement, as a patch would. Defaults to 0 (none).
+        reshaped (int, optional):
+            Changes the outline of every n-th shape, as a patch would. Defaults to 0
+            (none).
+
+    Returns:
+        ET.ElementTree: The XML
+    """
+
+    root = ET.Element("swf", type="SWF", frameCount="1", frameRate="30.0", version="15")
+    tags = ET.SubElement(root, "tags")
+
+    for shape_id in range(1, size.shape_count + 1):
+        tags.append(
+            create_shape(
+                shape_id,
+                size.edges_per_shape,
+                changed=bool(reshaped) and shape_id % reshaped == 0,
+            )
+        )
+
+    sprite: Optional[ET.Element] = None
+    sub_tags: Optional[ET.Element] = None
+    frame_id: int = 0
+    for placement in iter_placements(size, moved):
+        if sprite is None or sprite.get("spriteId") != str(placement.sprite_id):
+            sprite = ET.SubElement(
+                tags,
+                "item",
+                type="DefineSpriteTag",
+                spriteId=str(placement.sprite_id),
+                frameCount=str(size.frames),
+            )
+            sub_tags = ET.SubElement(sprite, "subTags")
+            frame_id = 1
+
+        # every frame ends with a ShowFrameTag, including the last one
+        assert sub_tags is not None
+        if placement.frame_id != frame_id:
+            ET.SubElement(sub_tags, "item", type="ShowFrameTag")
+            frame_id = placement.frame_id
+
+        sub_tags.append(create_placement(placement))
+
+        if (
+            placement.frame_id == size.frames
+            and placement.depth == size.items_per_frame
+        ):
+            ET.SubElement(sub_tags, "item", type="ShowFrameTag")
+
+    # the main timeline shows the last sprite in a single frame
+    ET.SubElement(
+        tags,
+        "item",
+        type="PlaceObject2Tag",
+        characterId=str(size.shape_count + size.sprites),
+        depth="1",
+        placeFlagHasCharacter="true",
+    )
+    ET.SubElement(tags, "item", type="ShowFrameTag")
+    ET.SubElement(tags, "item", type="EndTag")
+
+    return ET.ElementTree(root)
+
+
+def generate_patch_items(size: SwfSize, moved: int) -> list[PatchItem]:
+    """
+    Generates the patch items that move the placements like
+    `generate_ffdec_xml(size, moved)` does. The filters address the frames of the
+    sprites like the ones created by the patch creator.
+
+    Args:
+        size (SwfSize): Size of the SWF file.
+        moved (int): Moves every n-th placement.
+
+    Returns:
+        list[PatchItem]: The patch items
+    """
+
+    original: list[Placement] = list(iter_placements(size))
+    items: list[PatchItem] = []
+
+    for before, after in zip(original, iter_placements(size, moved)):
+        if before == after:
+            continue
+
+        item_filter: str = (
+            f"/tags/item[@type='DefineSpriteTag'][@spriteId='{after.sprite_id}']"
+            f"/subTags/frame[@frameId='{after.frame_id}']"
+            f"/subTags/item[@type='PlaceObject2Tag'][@characterId='{after.character_id}']"
+            f"[@depth='{after.depth}']/matrix"
+        )
+        items.append(
+            PatchItem(
+                item_filter,
+                {
+                    "translateX": str(after.translate_x),
+                    "translateY": str(after.translate_y),
+                },
+            )
+        )
+
+    return items
+
+
+def count_elements(tree: ET.ElementTree) -> int:
+    """
+    Counts the elements of an XML.
+
+    Args:
+        tree (ET.ElementTree): The XML.
+
+    Returns:
+        int: The number of elements
+    """
+
+    return sum(1 for _ in tree.iter())
@@ -0,0 +1,81 @@
+"""
+Copyright (c) Cutleast
+"""
+
+import json
+from typing import Any
+
+import jstyleson
+import pytest
+
+from core.utilities import json_utils
+
+from .timing import measure, report
+
+
+def generate_patch_json(sprites: int, items_per_sprite: int) -> str:
+    """
+    Generates the text of a synthetic patch JSON file with comments, similar to the
+    ones written by hand or by the patch creator.
+
+    Args:
+        sprites (int): Number of `DefineSpriteTag` entries.
+        items_per_sprite (int): Number of `PlaceObject2Tag` entries per sprite.
+
+    Returns:
+        str: JSON text with comments
+    """
+
+    tags: list[dict[str, Any]] = [
+        {
+            "#type": "DefineSpriteTag",
+            "#spriteId": str(sprite_id),
+            "subTags": [
+                {
+                    "#type": "PlaceObject2Tag",
+                    "#characterId": str(item_id),
+                    "#depth": str(item_id + 1),
+                    "~placeFlagHasMatrix": "true",
+                    "matrix": {"~translateX": "-1240", "~translateY": "560"},
+                }
+                for item_id in range(items_per_sprite)
+            ],
+        }
+        for sprite_id in range(sprites)
+    ]
+    lines: list[str] = json.dumps(
+        {"optional": False, "shapes": [], "swf": {"tags": tags}}, indent=4
+    ).splitlines()
+
+    # add a comment every few lines like hand-written patches do
+    for i in range(len(lines) - 1, 0, -25):
+        lines.insert(i, "    // moved the element to the left")
+
+    return "\n".join(lines)
+
+
+@pytest.mark.parametrize("sprites", [10, 100, 1000])
+def test_loads(sprites: int) -> None:
+    """
+    Compares `json_utils.loads()` with `jstyleson.loads()`.
+    """
+
+    json_str: str = generate_patch_json(sprites, 20)
+    assert json_utils.loads(json_str) == jstyleson.loads(json_str)
+
+    repeat: int = 5 if sprites < 1000 else 2
+    stripped_str: str = json_utils.strip_comments(json_str)
+    jstyleson_strip_time: float = measure(lambda: jstyleson.dispose(json_str), repeat)
+    json_utils_strip_time: float = measure(
+        lambda: json_utils.strip_comments(json_str), repeat
+    )
+    parse_time: float = measure(lambda: json.loads(stripped_str), repeat)
+
+    report(
+        f"Loading a {len(json_str) / 1024 / 1024:.2f} MiB patch JSON",
+        ["stripper", "strip (s)", "strip + parse (s)"],
+        [
+            ["jstyleson", jstyleson_strip_time, jstyleson_strip_time + parse_time],
+            ["json_utils", json_utils_strip_time, json_utils_strip_time + parse_time],
+        ],
+    )
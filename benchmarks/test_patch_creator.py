@@ -0,0 +1,113 @@
+"""
+Copyright (c) Cutleast
+"""
+
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Optional
+
+from core.config.config import Config
+from core.config.patch_creator_config import PatchCreatorConfig
+from core.patch.patch_item import PatchItem
+from core.patch_creator.patch_creator import PatchCreator
+from core.utilities.xml_utils import split_frames
+
+from .ffdec_xml import SwfSize, generate_ffdec_xml, generate_patch_items
+from .timing import measure, report
+
+SIZES: list[int] = [10, 40, 160]
+"""Numbers of sprites of the synthetic SWF files."""
+
+MOVED: int = 10
+"""Every n-th placement or shape is changed in the patched files."""
+
+RES_PATH: Path = Path(__file__).parent.parent / "res"
+
+
+def create_patch_creator(tmp_path: Path) -> PatchCreator:
+    """
+    Creates a patch creator with the bundled patch creator config.
+
+    Args:
+        tmp_path (Path): Folder for the general config.
+
+    Returns:
+        PatchCreator: The patch creator
+    """
+
+    return PatchCreator(
+        Config.load(tmp_path / "config", log_settings=False),
+        PatchCreatorConfig.load(RES_PATH / "config"),
+    )
+
+
+def test_create_patch_items(tmp_path: Path) -> None:
+    """
+    Measures how `PatchCreator.create_patch_items()` scales with the size of the XML
+    files.
+    """
+
+    patch_creator: PatchCreator = create_patch_creator(tmp_path)
+
+    rows: list[list[object]] = []
+    for sprites in SIZES:
+        size = SwfSize(sprites)
+        original_root: Optional[ET.Element] = generate_ffdec_xml(size).getroot()
+        patched_root: Optional[ET.Element] = generate_ffdec_xml(size, MOVED).getroot()
+        assert original_root is not None and patched_root is not None
+        original: ET.Element = split_frames(original_root)
+        patched: ET.Element = split_frames(patched_root)
+
+        patch_items: list[PatchItem] = patch_creator.create_patch_items(
+            original, patched, ".", "swf"
+        )
+        # the patch creator's filters are relative to the root element
+        created: dict[str, dict[str, str]] = {
+            item.filter: item.changes for item in patch_items
+        }
+        for item in generate_patch_items(size, MOVED):
+            assert created["." + item.filter] == item.changes
+
+        create_time: float = measure(
+            lambda: patch_creator.create_patch_items(original, patched, ".", "swf"), 3
+        )
+
+        rows.append([sprites, len(patch_items), create_time])
+
+    report(
+        "Creating patch items from synthetic XML files",
+        ["sprites", "patch items", "create (s)"],
+        rows,
+    )
+
+
+def test_get_different_shapes(tmp_path: Path) -> None:
+    """
+    Measures how `PatchCreator.get_different_shapes()` scales with the number of
+    shapes.
+    """
+
+    patch_creator: PatchCreator = create_patch_creator(tmp_path)
+
+    rows: list[list[object]] = []
+    for shapes in [100, 400, 1600]:
+        size = SwfSize(sprites=2, shapes=shapes)
+        original: ET.ElementTree = generate_ffdec_xml(size)
+        patched: ET.ElementTree = generate_ffdec_xml(size, reshaped=MOVED)
+
+        different_shapes: list[int] = patch_creator.get_different_shapes(
+            original, patched
+        )
+        assert different_shapes == list(range(MOVED, shapes + 1, MOVED))
+
+        compare_time: float = measure(
+            lambda: patch_creator.get_different_shapes(original, patched), 3
+        )
+
+        rows.append([shapes, len(different_shapes), compare_time])
+
+    report(
+        "Comparing the shapes of synthetic XML files",
+        ["shapes", "different shapes", "compare (s)"],
+        rows,
+    )
@@ -0,0 +1,77 @@
+"""
+Copyright (c) Cutleast
+"""
+
+import pickle
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+
+from core.patch.patch_data import PatchData
+from core.patch.patch_file import PatchFile
+from core.patch.patch_item import PatchItem
+
+from .test_json_utils import generate_patch_json
+from .timing import measure, report
+
+
+def measure_memory(func: Callable[[], object]) -> int:
+    """
+    Measures the memory that is still allocated by the result of a function.
+
+    Args:
+        func (Callable[[], object]): Function to measure.
+
+    Returns:
+        int: Allocated memory in bytes
+    """
+
+    tracemalloc.start()
+    try:
+        result: object = func()
+        size: int = tracemalloc.get_traced_memory()[0]
+        del result
+    finally:
+        tracemalloc.stop()
+
+    return size
+
+
+@pytest.mark.parametrize("sprites", [100, 1000])
+def test_patch_data(sprites: int) -> None:
+    """
+    Compares the memory usage and construction time of `PatchData` with a list of
+    `PatchItem` objects.
+    """
+
+    patch_data: PatchData = PatchFile.parse_json(
+        generate_patch_json(sprites, 20).encode(), Path("hudmenu.json"), Path()
+    ).data
+    items: list[tuple[str, dict[str, str]]] = list(patch_data.items())
+
+    # parsing creates a new string for every filter, so copy them for a fair comparison
+    list_memory: int = measure_memory(
+        lambda: [PatchItem(filter=f[:1] + f[1:], changes=c) for f, c in items]
+    )
+    data_memory: int = measure_memory(lambda: PatchData(items))
+    list_time: float = measure(
+        lambda: [PatchItem(filter=f, changes=c) for f, c in items], 3
+    )
+    data_time: float = measure(lambda: PatchData(items), 3)
+    list_pickle: int = len(
+        pickle.dumps([PatchItem(filter=f, changes=c) for f, c in items])
+    )
+    data_pickle: int = len(pickle.dumps(patch_data))
+
+    report(
+        f"Storing {len(items)} patch items",
+        ["representation", "memory (KiB)", "pickled (KiB)", "construction (s)"],
+        [
+            ["list[PatchItem]", list_memory // 1024, list_pickle // 1024, list_time],
+            ["PatchData", data_memory // 1024, data_pickle // 1024, data_time],
+        ],
+    )
+
+    assert data_memory < list_memory
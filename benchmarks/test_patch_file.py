@@ -0,0 +1,183 @@
+"""
+Copyright (c) Cutleast
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Optional
+
+import pytest
+
+from core.patch.patch_file import PatchFile
+from core.patch.patch_item import PatchItem
+from core.patch.patch_type import PatchType
+from core.utilities.xml_utils import parse_xpath_part
+
+from .ffdec_xml import SwfSize
+from .ffdec_xml import generate_patch_items as generate_frame_patch_items
+from .timing import measure, report
+
+LIST_TAGS: list[str] = ["tags", "subTags"]
+
+
+def generate_patch_items(count: int) -> list[PatchItem]:
+    """
+    Generates patch items that all end up under the same `subTags` list, which is the
+    worst case for dumping them.
+
+    Args:
+        count (int): Number of patch items. Should be even.
+
+    Returns:
+        list[PatchItem]: Generated patch items
+    """
+
+    prefix: str = "./tags/item[@type='DefineSpriteTag'][@spriteId='12']/subTags"
+    items: list[PatchItem] = []
+    for i in range(count // 2):
+        item_filter: str = (
+            f"{prefix}/item[@type='PlaceObject2Tag'][@characterId='{i}'][@depth='{i}']"
+        )
+        items.append(PatchItem(item_filter, {"placeFlagHasMatrix": "true"}))
+        items.append(PatchItem(item_filter + "/matrix", {"translateX": str(i)}))
+
+    return items
+
+
+def dump_patch_items_quadratic(
+    patch_items: list[PatchItem], list_tags: list[str]
+) -> dict[str, Any]:
+    """
+    The previous implementation of `PatchFile.__dump_patch_items()` that scans a list
+    section for every path segment. Used as reference for the output.
+    """
+
+    def get_item_with_filter(
+        filter: dict[str, str], items: list[dict[str, Any]]
+    ) -> Optional[dict[str, Any]]:
+        for item in items:
+            item_filter: dict[str, str] = {
+                key: value for key, value in item.items() if key.startswith("#")
+            }
+
+            if item_filter == filter:
+                return item
+
+    result: dict[str, Any] = {}
+
+    for patch_item in patch_items:
+        cur_section: dict[str, Any] | list[dict[str, Any]] = result
+        for part in patch_item.filter.split("/"):
+            if not part.strip() or part.strip() == ".":
+                continue
+
+            tag, attr_filters = parse_xpath_part(part)
+            filter_dict: dict[str, str] = {
+                f"#{key}": value for key, value in attr_filters.items()
+            }
+
+            if isinstance(cur_section, dict):
+                cur_section = cur_section.setdefault(
+                    tag, [] if tag in list_tags else {}
+                )
+            else:
+                matching_item = get_item_with_filter(filter_dict, cur_section)
+                if not matching_item:
+                    cur_section.append({})
+                    cur_section = cur_section[-1]
+                else:
+                    cur_section = matching_item
+
+            if filter_dict:
+                if isinstance(cur_section, dict):
+                    cur_section.update(filter_dict)
+                else:
+                    cur_section.append(filter_dict)
+
+        if isinstance(cur_section, list):
+            cur_section = cur_section[-1]  # type: ignore
+
+        cur_section.update(
+            {f"~{key}": value for key, value in patch_item.changes.items()}
+        )
+
+    return result
+
+
+@pytest.mark.parametrize("count", [1000, 2500, 5000, 10000])
+def test_dump(count: int) -> None:
+    """
+    Compares `PatchFile.dump()` with the previous quadratic implementation.
+    """
+
+    patch_items: list[PatchItem] = generate_patch_items(count)
+    patch_file = PatchFile(
+        path=Path("hudmenu.json"),
+        type=PatchType.Json,
+        optional=False,
+        data=patch_items,
+    )
+
+    expected: str = json.dumps(
+        dump_patch_items_quadratic(patch_items, LIST_TAGS), indent=4
+    )
+    actual: str = json.dumps(patch_file.dump(LIST_TAGS)["swf"], indent=4)
+    assert actual == expected
+
+    quadratic_time: float = measure(
+        lambda: dump_patch_items_quadratic(patch_items, LIST_TAGS), 1
+    )
+    indexed_time: float = measure(lambda: patch_file.dump(LIST_TAGS), 3)
+
+    report(
+        f"Dumping {count} items under one subTags list",
+        ["quadratic (s)", "indexed (s)"],
+        [[quadratic_time, indexed_time]],
+    )
+
+
+def test_load_dump(tmp_path: Path) -> None:
+    """
+    Measures how `PatchFile.dump()` and `PatchFile.load()` scale with the number of
+    patch items, using the frame filters of the synthetic SWF files.
+    """
+
+    patch_path: Path = tmp_path / "Synthetic DIP Patch"
+    json_file: Path = patch_path / "interface" / "hudmenu.json"
+    json_file.parent.mkdir(parents=True)
+
+    rows: list[list[object]] = []
+    for sprites in [100, 400, 1600]:
+        patch_items: list[PatchItem] = generate_frame_patch_items(SwfSize(sprites), 2)
+        patch_file = PatchFile(
+            path=Path("interface") / "hudmenu.json",
+            type=PatchType.Json,
+            optional=False,
+            data=patch_items,
+        )
+
+        json_file.write_text(json.dumps(patch_file.dump(LIST_TAGS), indent=4))
+        loaded: PatchFile = PatchFile.load(json_file, patch_path)
+        assert dict(loaded.data.items()) == {
+            item.filter: item.changes for item in patch_items
+        }
+
+        dump_time: float = measure(lambda: patch_file.dump(LIST_TAGS), 3)
+        load_time: float = measure(
+            lambda: len(PatchFile.load(json_file, patch_path).data), 3
+        )
+
+        rows.append(
+            [
+                len(patch_items),
+                f"{json_file.stat().st_size / 1024:.0f} KiB",
+                dump_time,
+                load_time,
+            ]
+        )
+
+    report(
+        "Dumping and loading patch files with frame filters",
+        ["patch items", "JSON size", "dump (s)", "load (s)"],
+        rows,
+    )
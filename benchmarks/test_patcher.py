@@ -0,0 +1,72 @@
+"""
+Copyright (c) Cutleast
+"""
+
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Optional
+
+from core.config.config import Config
+from core.patch.patch_data import PatchData
+from core.patcher.patcher import Patcher
+
+from .ffdec_xml import SwfSize, generate_ffdec_xml, generate_patch_items
+from .timing import measure, report
+
+SIZES: list[int] = [10, 40, 160, 640]
+"""Numbers of sprites of the synthetic SWF files."""
+
+MOVED: int = 10
+"""Every n-th placement is moved by the patch."""
+
+
+def test_patch_xml_file(tmp_path: Path) -> None:
+    """
+    Measures how `Patcher.patch_xml_file()` scales with the size of the XML file. The
+    time includes parsing and writing the file.
+    """
+
+    patcher = Patcher(Config.load(tmp_path / "config", log_settings=False))
+    xml_file: Path = tmp_path / "hudmenu.xml"
+
+    rows: list[list[object]] = []
+    for sprites in SIZES:
+        size = SwfSize(sprites)
+        original_root: Optional[ET.Element] = generate_ffdec_xml(size).getroot()
+        patched_root: Optional[ET.Element] = generate_ffdec_xml(size, MOVED).getroot()
+        assert original_root is not None and patched_root is not None
+        original: bytes = ET.tostring(original_root)
+        expected: bytes = ET.tostring(patched_root)
+        patch_data: dict[Path, PatchData] = {
+            Path("Synthetic DIP Patch"): PatchData.from_patch_items(
+                generate_patch_items(size, MOVED)
+            )
+        }
+
+        xml_file.write_bytes(original)
+        patcher.patch_xml_file(xml_file, patch_data)
+        assert ET.tostring(ET.parse(xml_file).getroot()) == expected
+
+        # the patcher modifies the file in place, so it's restored before every run
+        patch_time: float = measure(
+            lambda: (
+                xml_file.write_bytes(original),
+                patcher.patch_xml_file(xml_file, patch_data),
+            ),
+            3,
+        )
+
+        rows.append(
+            [
+                sprites,
+                f"{len(original) / 1024:.0f} KiB",
+                len(patch_data[Path("Synthetic DIP Patch")]),
+                patch_time,
+            ]
+        )
+
+    report(
+        "Patching synthetic XML files",
+        ["sprites", "XML size", "patch items", "patch (s)"],
+        rows,
+    )
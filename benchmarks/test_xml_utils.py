@@ -0,0 +1,59 @@
+"""
+Copyright (c) Cutleast
+"""
+
+import copy
+import xml.etree.ElementTree as ET
+from typing import Optional
+
+from core.utilities.xml_utils import split_frames, unsplit_frames
+
+from .ffdec_xml import SwfSize, count_elements, generate_ffdec_xml
+from .timing import measure, report
+
+SIZES: list[int] = [10, 40, 160, 640]
+"""Numbers of sprites of the synthetic SWF files."""
+
+
+def test_split_frames() -> None:
+    """
+    Measures how `split_frames()` and `unsplit_frames()` scale with the size of the
+    XML.
+    """
+
+    rows: list[list[object]] = []
+    for sprites in SIZES:
+        tree: ET.ElementTree = generate_ffdec_xml(SwfSize(sprites))
+        root: Optional[ET.Element] = tree.getroot()
+        assert root is not None
+        elements: int = count_elements(tree)
+
+        expected: bytes = ET.tostring(root)
+        assert (
+            ET.tostring(unsplit_frames(split_frames(copy.deepcopy(root)))) == expected
+        )
+
+        # both functions modify the element, so every run gets its own copy
+        repeat: int = 3
+        unsplit_roots: list[ET.Element] = [copy.deepcopy(root) for _ in range(repeat)]
+        split_roots: list[ET.Element] = [
+            split_frames(copy.deepcopy(root)) for _ in range(repeat)
+        ]
+        split_time: float = measure(lambda: split_frames(unsplit_roots.pop()), repeat)
+        unsplit_time: float = measure(lambda: unsplit_frames(split_roots.pop()), repeat)
+
+        rows.append(
+            [
+                sprites,
+                elements,
+                split_time,
+                unsplit_time,
+                (split_time + unsplit_time) / elements * 1_000_000,
+            ]
+        )
+
+    report(
+        "Splitting and unsplitting the frames of synthetic SWF files",
+        ["sprites", "elements", "split (s)", "unsplit (s)", "both (us/element)"],
+        rows,
+    )
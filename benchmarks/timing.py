@@ -0,0 +1,55 @@
+"""
+Copyright (c) Cutleast
+"""
+
+import logging
+import time
+from collections.abc import Callable
+
+log: logging.Logger = logging.getLogger("Benchmark")
+
+
+def measure(func: Callable[[], object], repeat: int = 5) -> float:
+    """
+    Measures the best wall clock time of a function over several runs.
+
+    Args:
+        func (Callable[[], object]): Function to measure.
+        repeat (int, optional): Number of runs. Defaults to 5.
+
+    Returns:
+        float: Best duration in seconds
+    """
+
+    best: float = float("inf")
+    for _ in range(repeat):
+        start: float = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+
+    return best
+
+
+def report(title: str, header: list[str], rows: list[list[object]]) -> None:
+    """
+    Logs a benchmark result as a simple table.
+
+    Args:
+        title (str): Title of the benchmark.
+        header (list[str]): Column names.
+        rows (list[list[object]]): Table rows.
+    """
+
+    cells: list[list[str]] = [header] + [
+        [f"{value:.4f}" if isinstance(value, float) else str(value) for value in row]
+        for row in rows
+    ]
+    widths: list[int] = [max(len(row[i]) for row in cells) for i in range(len(header))]
+
+    lines: list[str] = [title]
+    for row in cells:
+        lines.append(
+            " | ".join(value.rjust(width) for value, width in zip(row, widths))
+        )
+
+    log.info("\n".join(lines))
@@ -18,7 +18,7 @@ from cutleast_core_lib.builder.builder import Builder
 
 class Backend(NuitkaBackend):
     """
-    Backend that injects the project version into the app module before building.
+    Backend that injects the project version into the version module before building.
     """
 
     # this injects the version at, e.g. `APP_VERSION: str = "development"`
@@ -28,15 +28,16 @@ class Backend(NuitkaBackend):
 
     @override
     def preprocess_source(self, source_folder: Path, metadata: BuildMetadata) -> None:
-        app_module: Path = source_folder / "app.py"
-        app_module.write_text(
+        version_module: Path = source_folder / "core" / "version.py"
+        version_module.write_text(
             Backend.VERSION_PATTERN.sub(
-                str(metadata.project_version), app_module.read_text(encoding="utf8")
+                str(metadata.project_version),
+                version_module.read_text(encoding="utf8"),
             ),
             encoding="utf8",
         )
         self.log.info(
-            f"Injected version '{metadata.project_version}' into '{app_module}'."
+            f"Injected version '{metadata.project_version}' into '{version_module}'."
         )
 
 
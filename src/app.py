@@ -3,7 +3,7 @@ Copyright (c) Cutleast
 """
 
 from argparse import Namespace
-from typing import Optional, override
+from typing import TYPE_CHECKING, Optional, override
 
 from cutleast_core_lib.base_app import BaseApp
 from cutleast_core_lib.core.config.app_config import AppConfig
@@ -12,28 +12,33 @@ from cutleast_core_lib.core.utilities.singleton import Singleton
 from PySide6.QtGui import QIcon
 
 import resources_rc as resources_rc
+from core import version
+from core.cli_interface import tool_backend
 from core.config.config import Config
 from core.config.patch_creator_config import PatchCreatorConfig
-from core.patch_creator.patch_creator import PatchCreator
 from core.patcher.patcher import Patcher
 from core.utilities import filesystem as filesystem
+from core.utilities import glob
 from ui.main_window import MainWindow
 from ui.utilities.theme_manager import ThemeManager
 
+if TYPE_CHECKING:
+    from core.patch_creator.patch_creator import PatchCreator
+
 
 class App(BaseApp, Singleton):
     """
     Main application class.
     """
 
-    APP_NAME: str = "Dynamic Interface Patcher"
-    APP_VERSION: str = "development"
+    APP_NAME: str = version.APP_NAME
+    APP_VERSION: str = version.APP_VERSION
 
     config: Config
     patch_creator_config: PatchCreatorConfig
 
     patcher: Patcher
-    patch_creator: PatchCreator
+    __patch_creator: Optional["PatchCreator"] = None
 
     def __init__(self, args: Namespace) -> None:
         Singleton.__init__(self)
@@ -67,19 +72,33 @@ class App(BaseApp, Singleton):
         self.config = Config.load(self.config_path, log_settings=False)
         self.config.apply_from_namespace(self.args)
         self.config.print_settings_to_log()
+        glob.set_backend(self.config.glob_backend)
+        tool_backend.set_backend(self.config.tool_backend)
         self.patch_creator_config = PatchCreatorConfig.load(self.res_path / "config")
 
         self.patcher = Patcher(self.config)
-        self.patch_creator = PatchCreator(self.config, self.patch_creator_config)
 
         return MainWindow(
             logger=self.logger,
             config=self.config,
             patch_creator_config=self.patch_creator_config,
             patcher=self.patcher,
-            patch_creator=self.patch_creator,
+            get_patch_creator=lambda: self.patch_creator,
         )
 
+    @property
+    def patch_creator(self) -> "PatchCreator":
+        """
+        The patch creator. Created on first use, since it isn't needed for patching.
+        """
+
+        if self.__patch_creator is None:
+            from core.patch_creator.patch_creator import PatchCreator
+
+            self.__patch_creator = PatchCreator(self.config, self.patch_creator_config)
+
+        return self.__patch_creator
+
     @override
     def exec(self) -> int:  # pyright: ignore[reportIncompatibleMethodOverride]
         silent: bool = self.config.auto_patch and self.config.silent
@@ -91,7 +110,8 @@ class App(BaseApp, Singleton):
         super().clean()
 
         self.patcher.clean()
-        self.patch_creator.clean()
+        if self.__patch_creator is not None:
+            self.__patch_creator.clean()
 
     @override
     @classmethod
@@ -0,0 +1,161 @@
+"""
+Copyright (c) Cutleast
+
+Entry point of the pipeline benchmark that runs patches and creates them again with
+the stand-in tool backend, so that neither FFDec nor xdelta is needed:
+
+    python -m core.bench [patchpath ...] [--runs N] [--startup S] [...]
+
+The Example Patch is used if no patch is specified.
+"""
+
+import logging
+import shutil
+import sys
+import tempfile
+from argparse import ArgumentParser, Namespace
+from pathlib import Path
+from typing import Optional
+
+from cutleast_core_lib.core.utilities.exe_info import get_current_path
+from pydantic import TypeAdapter
+
+from core.bench.bench import Bench, BenchResult
+from core.cli_interface import stand_in, tool_backend
+from core.cli_interface.tool_backend import ToolBackend
+from core.config.config import Config
+from core.config.patch_creator_config import PatchCreatorConfig
+from core.utilities import glob, trace
+
+log: logging.Logger = logging.getLogger("Bench")
+
+WORK_PATH: Path = Path(tempfile.gettempdir()) / "DIP_bench"
+"""The folder the patches are run in."""
+
+
+def __init_argparser() -> ArgumentParser:
+    """
+    Initializes commandline argument parser.
+    """
+
+    parser = ArgumentParser(
+        prog="python -m core.bench",
+        description="Runs DIP patches and creates them again with stand-ins for FFDec "
+        "and xdelta and reports the duration of each stage.",
+    )
+    parser.add_argument(
+        "patchpaths",
+        nargs="*",
+        help="Paths to the patches that get benchmarked. Defaults to the Example Patch.",
+    )
+    parser.add_argument(
+        "-d",
+        "--debug",
+        help="Enables debug logging.",
+        action="store_true",
+    )
+    parser.add_argument(
+        "-r",
+        "--runs",
+        help="Number of runs of each patch. The best duration of each stage is "
+        "reported.",
+        type=int,
+        default=1,
+    )
+    parser.add_argument(
+        "--startup",
+        help="Simulated startup time of FFDec and xdelta in seconds.",
+        type=float,
+        default=stand_in.DEFAULT_STARTUP,
+    )
+    parser.add_argument(
+        "--seconds-per-mib",
+        help="Simulated time FFDec and xdelta take per MiB of their input file.",
+        type=float,
+        default=stand_in.DEFAULT_SECONDS_PER_MIB,
+    )
+    parser.add_argument(
+        "-c",
+        "--config-path",
+        help="Specifies the folder with the config. Defaults to the default config.",
+    )
+    parser.add_argument(
+        "-o",
+        "--output-path",
+        help="Writes the durations to the specified JSON file.",
+    )
+    parser.add_argument(
+        "--trace",
+        help="Writes the time spent in each stage and external process to the "
+        "specified JSON file in Chrome trace event format.",
+    )
+
+    return parser
+
+
+def main(args: Namespace) -> int:
+    """
+    Benchmarks the patches specified by the commandline arguments.
+
+    Args:
+        args (Namespace): Commandline arguments.
+
+    Returns:
+        int: Exit code
+    """
+
+    logging.basicConfig(
+        level=logging.DEBUG if args.debug else logging.INFO,
+        format="[%(asctime)s.%(msecs)03d][%(levelname)s][%(name)s.%(funcName)s]: "
+        "%(message)s",
+        datefmt="%H:%M:%S",
+    )
+
+    shutil.rmtree(WORK_PATH, ignore_errors=True)
+    config_path: Path = (
+        Path(args.config_path) if args.config_path else WORK_PATH / "config"
+    )
+    config: Config = Config.load(config_path, log_settings=False)
+    glob.set_backend(config.glob_backend)
+    tool_backend.set_backend(ToolBackend.StandIn)
+    stand_in.set_cost(args.startup, args.seconds_per_mib)
+
+    patch_paths: list[Path] = [Path(path).resolve() for path in args.patchpaths] or [
+        get_current_path() / "Example Patch"
+    ]
+    bench = Bench(
+        config,
+        PatchCreatorConfig.load(get_current_path() / "res" / "config"),
+        WORK_PATH,
+    )
+
+    trace_path: Optional[str] = args.trace
+    if trace_path:
+        trace.start_tracing()
+
+    results: list[BenchResult] = []
+    try:
+        for patch_path in patch_paths:
+            result: BenchResult = bench.run(patch_path, args.runs)
+            log.info(Bench.format_result(result))
+            results.append(result)
+
+    except Exception as ex:
+        log.error(f"Failed to benchmark: {ex}", exc_info=ex)
+        return 1
+    finally:
+        trace.stop_tracing(Path(trace_path) if trace_path else None)
+        shutil.rmtree(WORK_PATH, ignore_errors=True)
+
+    if args.output_path:
+        Path(args.output_path).write_bytes(
+            TypeAdapter(list[BenchResult]).dump_json(results, indent=4)
+        )
+        log.info(f"Saved durations to '{args.output_path}'.")
+
+    return 0
+
+
+if __name__ == "__main__":
+    parser: ArgumentParser = __init_argparser()
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,210 @@
+"""
+Copyright (c) Cutleast
+"""
+
+import logging
+import shutil
+from pathlib import Path
+
+from pydantic import BaseModel, Field
+
+from core.bench.original_mod import create_original_mod
+from core.config.config import Config
+from core.config.patch_creator_config import PatchCreatorConfig
+from core.patch.patch import Patch
+from core.patch_creator.patch_creator import PatchCreator
+from core.patcher.patcher import Patcher
+from core.utilities.progress import ProgressEvent, ProgressReporter, StageFinished
+
+
+class BenchResult(BaseModel):
+    """
+    Model representing the timings of a benchmarked patch.
+    """
+
+    patch: Path
+    """The path to the patch."""
+
+    runs: int
+    """The number of runs the timings are the best of."""
+
+    patcher_stages: dict[str, float] = Field(default_factory=dict)
+    """The duration of each stage of `Patcher.patch()` in seconds."""
+
+    patcher_total: float = float("inf")
+    """The duration of `Patcher.patch()` in seconds."""
+
+    patch_creator_stages: dict[str, float] = Field(default_factory=dict)
+    """The duration of each stage of `PatchCreator.create_patch()` in seconds."""
+
+    patch_creator_total: float = float("inf")
+    """The duration of `PatchCreator.create_patch()` in seconds."""
+
+
+class Bench:
+    """
+    Runs patches end to end with `Patcher.patch()` and creates them again from the
+    patched files with `PatchCreator.create_patch()`, recording the duration of each
+    stage. The original mods are created from the patches, so this should be used with
+    the stand-in tool backend.
+    """
+
+    log: logging.Logger = logging.getLogger("Bench")
+
+    config: Config
+    """The config the patcher and the patch creator are created with."""
+
+    patch_creator_config: PatchCreatorConfig
+    """The config of the patch creator."""
+
+    work_path: Path
+    """The folder for the copies of the patches, the original mods and the outputs."""
+
+    def __init__(
+        self,
+        config: Config,
+        patch_creator_config: PatchCreatorConfig,
+        work_path: Path,
+    ) -> None:
+        self.config = config
+        self.patch_creator_config = patch_creator_config
+        self.work_path = work_path
+
+    def run(self, patch_path: Path, runs: int = 1) -> BenchResult:
+        """
+        Benchmarks a patch. Every run starts from a fresh copy of the patch, so that
+        the compiled patch cache isn't used.
+
+        Args:
+            patch_path (Path): The path to the patch.
+            runs (int, optional): The number of runs. Defaults to 1.
+
+        Returns:
+            BenchResult: The best timings of the runs.
+        """
+
+        result = BenchResult(patch=patch_path, runs=runs)
+
+        for run in range(1, runs + 1):
+            self.log.info(f"Benchmarking '{patch_path.name}' ({run}/{runs})...")
+
+            run_path: Path = self.work_path / patch_path.name
+            shutil.rmtree(run_path, ignore_errors=True)
+            patch_copy_path: Path = run_path / patch_path.name
+            original_mod_path: Path = run_path / "Original"
+            patched_mod_path: Path = run_path / "Patched"
+            created_patch_path: Path = run_path / "Created"
+
+            # 1. Create the original mod from a copy of the patch
+            shutil.copytree(patch_path, patch_copy_path)
+            create_original_mod(
+                Patch.load(patch_copy_path, use_cache=False), original_mod_path
+            )
+
+            # 2. Run the patch
+            patcher = Patcher(
+                self.config.model_copy(
+                    update={
+                        "output_folder": patched_mod_path,
+                        "debug_mode": False,
+                        "repack_bsas": False,
+                    }
+                )
+            )
+            patcher_stages: dict[str, float] = self.__record_stages(patcher)
+            try:
+                patcher_total: float = patcher.patch(patch_copy_path, original_mod_path)
+            finally:
+                patcher.clean()
+
+            # 3. Create the patch again from the patched files
+            patch_creator = PatchCreator(
+                self.config.model_copy(
+                    update={"output_folder": created_patch_path, "debug_mode": False}
+                ),
+                self.patch_creator_config,
+            )
+            patch_creator_stages: dict[str, float] = self.__record_stages(patch_creator)
+            try:
+                patch_creator_total: float = patch_creator.create_patch(
+                    patched_mod_path, original_mod_path
+                )
+            finally:
+                patch_creator.clean()
+
+            Bench.__keep_best(result.patcher_stages, patcher_stages)
+            Bench.__keep_best(result.patch_creator_stages, patch_creator_stages)
+            result.patcher_total = min(result.patcher_total, patcher_total)
+            result.patch_creator_total = min(
+                result.patch_creator_total, patch_creator_total
+            )
+
+            shutil.rmtree(run_path, ignore_errors=True)
+
+        return result
+
+    @staticmethod
+    def __record_stages(runner: Patcher | PatchCreator) -> dict[str, float]:
+        """
+        Replaces the progress reporter of a patcher or patch creator with one that
+        records the durations of the stages. The reporter doesn't keep a history, so
+        that the ETA of real runs isn't affected by the benchmark.
+
+        Args:
+            runner (Patcher | PatchCreator): The patcher or patch creator.
+
+        Returns:
+            dict[str, float]: Maps the names of the finished stages to their durations.
+        """
+
+        stages: dict[str, float] = {}
+
+        def record(event: ProgressEvent) -> None:
+            if isinstance(event, StageFinished):
+                stages[event.stage] = stages.get(event.stage, 0.0) + event.duration
+
+        runner.progress = ProgressReporter(history_path=None)
+        runner.progress.add_listener(record)
+
+        return stages
+
+    @staticmethod
+    def __keep_best(best: dict[str, float], stages: dict[str, float]) -> None:
+        """
+        Updates the best durations of the stages with the durations of a run.
+
+        Args:
+            best (dict[str, float]): The best durations so far.
+            stages (dict[str, float]): The durations of the run.
+        """
+
+        for stage, duration in stages.items():
+            best[stage] = min(best.get(stage, duration), duration)
+
+    @staticmethod
+    def format_result(result: BenchResult) -> str:
+        """
+        Formats the timings of a patch as a table.
+
+        Args:
+            result (BenchResult): The timings.
+
+        Returns:
+            str: The table
+        """
+
+        rows: list[tuple[str, str]] = [("Stage", "Duration (s)")]
+        for title, stages, total in [
+            ("Patcher", result.patcher_stages, result.patcher_total),
+            ("Patch creator", result.patch_creator_stages, result.patch_creator_total),
+        ]:
+            rows += [(f"{title}: {stage}", f"{d:.3f}") for stage, d in stages.items()]
+            rows.append((f"{title}: Total", f"{total:.3f}"))
+
+        width: int = max(len(stage) for stage, _ in rows)
+        lines: list[str] = [
+            f"'{result.patch.name}' (best of {result.runs} run(s))",
+            *(f"{stage.ljust(width)} | {duration}" for stage, duration in rows),
+        ]
+
+        return "\n".join(lines)
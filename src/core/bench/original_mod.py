@@ -0,0 +1,145 @@
+"""
+Copyright (c) Cutleast
+
+This module creates synthetic original mods for patches, so that the patches can be
+run with the stand-in tool backend. The original files are stand-in SWF files with an
+XML that contains every element the patch data of the file addresses.
+"""
+
+import logging
+import shutil
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Optional
+
+from core.cli_interface import stand_in
+from core.patch.patch import Patch
+from core.patch.patch_file import PatchFile
+from core.patch.patch_type import PatchType
+from core.utilities.filesystem import mkdir
+from core.utilities.path_splitter import split_path_with_bsa
+from core.utilities.xml_utils import parse_xpath_part, unsplit_frames
+
+log: logging.Logger = logging.getLogger("OriginalMod")
+
+
+def create_original_xml(file: PatchFile) -> ET.Element:
+    """
+    Creates the XML of an original file with every element that the patch data of the
+    specified file addresses and the shapes it replaces. The frames of the patch data
+    are merged into the XML like FFDec writes them.
+
+    Args:
+        file (PatchFile): The JSON patch file.
+
+    Returns:
+        ET.Element: The root of the XML
+    """
+
+    root = ET.Element("swf", type="SWF", version=str(stand_in.VERSION))
+
+    # Maps the ids of the parents and the segments of the filters to the elements
+    elements: dict[tuple[int, str], ET.Element] = {}
+
+    for filter, _ in file.data.items():
+        element: ET.Element = root
+        for part in filter.split("/"):
+            part = part.strip()
+            if not part or part == ".":
+                continue
+
+            child: Optional[ET.Element] = elements.get((id(element), part))
+            if child is None:
+                tag, attributes = parse_xpath_part(part)
+                child = ET.SubElement(element, tag, attributes)
+                elements[(id(element), part)] = child
+
+            element = child
+
+    tags: Optional[ET.Element] = root.find("tags")
+    if tags is None:
+        tags = ET.SubElement(root, "tags")
+
+    for shape_ids in file.shapes.values():
+        for shape_id in shape_ids:
+            if tags.find(f"item[@shapeId='{shape_id}']") is not None:
+                continue
+
+            shape = ET.SubElement(
+                tags, "item", type="DefineShapeTag", shapeId=str(shape_id)
+            )
+            records = ET.SubElement(
+                ET.SubElement(shape, "shapes", type="SHAPEWITHSTYLE"), "shapeRecords"
+            )
+            ET.SubElement(records, "item", type="EndShapeRecord")
+
+    # frames are only split if there are at least two of them and they're numbered
+    # from 1 without gaps
+    for element in list(root.iter()):
+        frames: dict[int, ET.Element] = {
+            int(frame.get("frameId", "0")): frame for frame in element.findall("frame")
+        }
+        if not frames:
+            continue
+
+        for frame in frames.values():
+            element.remove(frame)
+
+        for frame_id in range(1, max(*frames, 2) + 1):
+            if frame_id not in frames:
+                frames[frame_id] = ET.Element("frame", frameId=str(frame_id))
+                ET.SubElement(frames[frame_id], "subTags")
+            element.append(frames[frame_id])
+
+    return unsplit_frames(root)
+
+
+def create_original_mod(patch: Patch, original_mod_path: Path) -> None:
+    """
+    Creates a synthetic original mod for the specified patch with stand-in SWF files.
+    Files in BSAs are packed into BSAs with the same names.
+
+    Args:
+        patch (Patch): The patch.
+        original_mod_path (Path): The folder to create the original mod in.
+
+    Raises:
+        ValueError: When the patch contains binary patches, since their original files
+            can't be created.
+    """
+
+    log.info(
+        f"Creating original mod for '{patch.path.name}' at '{original_mod_path}'..."
+    )
+
+    bsa_names: set[str] = set()
+    for file in patch.files:
+        if file.type == PatchType.Binary:
+            raise ValueError(
+                f"The original file of the binary patch '{file.path}' can't be created."
+            )
+
+        bsa_file, mod_file = split_path_with_bsa(file.original_file_path)
+        if mod_file is None:
+            continue
+
+        swf_file: Path = original_mod_path / mod_file
+        if bsa_file is not None:
+            bsa_names.add(bsa_file.name)
+            swf_file = original_mod_path / f"{bsa_file.name}.content" / mod_file
+
+        mkdir(swf_file.parent)
+        stand_in.write_swf(
+            ET.tostring(create_original_xml(file), encoding="utf-8"), swf_file
+        )
+
+    if bsa_names:
+        # only imported if needed to speed up the startup
+        from sse_bsa import BSAArchive
+
+        for bsa_name in bsa_names:
+            content_path: Path = original_mod_path / f"{bsa_name}.content"
+            BSAArchive.create_archive(content_path, original_mod_path / bsa_name)
+            shutil.rmtree(content_path)
+
+    log.info(f"Created {len(patch.files)} original file(s).")
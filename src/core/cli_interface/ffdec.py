@@ -4,12 +4,15 @@ Copyright (c) Cutleast
 
 import logging
 from pathlib import Path
+from typing import Optional
 
-from cutleast_core_lib.core.archive.archive import Archive
 from cutleast_core_lib.core.utilities.exe_info import get_current_path
 from cutleast_core_lib.core.utilities.process_runner import run_process
 
-from core.utilities.filesystem import is_file
+from core.cli_interface import stand_in, tool_backend
+from core.cli_interface.tool_backend import ToolBackend
+from core.utilities import trace
+from core.utilities.filesystem import invalidate, is_file, mkdir
 from core.utilities.glob import glob
 
 
@@ -23,6 +26,22 @@ class FFDecInterface:
     bin_path: Path = get_current_path() / "res" / "ffdec" / "ffdec.bat"
     jre_archive_path: Path = get_current_path() / "res" / "jre.7z"
 
+    java_path: Optional[Path] = None
+    """The path to the extracted java.exe FFDec is set up with."""
+
+    def get_command(self) -> list[str]:
+        """
+        Returns the command for running FFDec with the current tool backend.
+
+        Returns:
+            list[str]: The command, without arguments
+        """
+
+        if tool_backend.get_backend() == ToolBackend.StandIn:
+            return stand_in.get_command("ffdec")
+
+        return [str(self.bin_path)]
+
     def replace_shapes(self, swf_file: Path, shapes: dict[Path, list[int]]) -> None:
         """
         Replaces shapes in an SWF file.
@@ -56,15 +75,18 @@ class FFDecInterface:
         cmdfile: Path = swf_file.parent / "shapes.txt"
         with open(cmdfile, "w", encoding="utf8") as file:
             file.writelines(cmds)
+        invalidate(cmdfile)
 
         cmd: list[str] = [
-            str(self.bin_path),
+            *self.get_command(),
             "-replace",
             str(swf_file),
             str(swf_file),
             str(cmdfile.resolve()),
         ]
-        run_process(cmd)
+        with trace.span("replace_shapes", "process", file=swf_file, shapes=len(cmds)):
+            run_process(cmd)
+        invalidate(swf_file)
 
         self.log.info("Shapes patched.")
 
@@ -84,12 +106,14 @@ class FFDecInterface:
         out_path: Path = swf_file.with_suffix(".xml")
 
         cmd: list[str] = [
-            str(self.bin_path),
+            *self.get_command(),
             "-swf2xml",
             str(swf_file),
             str(out_path),
         ]
-        run_process(cmd)
+        with trace.span("swf2xml", "process", file=swf_file):
+            run_process(cmd)
+        invalidate(out_path)
 
         self.log.info("Converted to XML.")
 
@@ -111,12 +135,14 @@ class FFDecInterface:
         out_path: Path = xml_file.with_suffix(".swf")
 
         cmd: list[str] = [
-            str(self.bin_path),
+            *self.get_command(),
             "-xml2swf",
             str(xml_file),
             str(out_path),
         ]
-        run_process(cmd)
+        with trace.span("xml2swf", "process", file=xml_file):
+            run_process(cmd)
+        invalidate(out_path)
 
         self.log.info("Converted to SWF.")
 
@@ -138,7 +164,7 @@ class FFDecInterface:
         self.log.info(f"Exporting {len(shape_ids)} shape(s) from '{swf_file}'...")
 
         cmd: list[str] = [
-            str(self.bin_path),
+            *self.get_command(),
             "-format",
             "shape:" + format,
             "-selectid",
@@ -148,27 +174,49 @@ class FFDecInterface:
             str(outpath),
             str(swf_file),
         ]
-        run_process(cmd)
+        with trace.span(
+            "export_shapes", "process", file=swf_file, shapes=len(shape_ids)
+        ):
+            run_process(cmd)
+        invalidate(outpath, recursive=True)
 
         self.log.info(f"Shape(s) exported to '{outpath}'.")
 
     def setup_jre(self, temp_folder: Path) -> None:
         """
         Extracts Java Runtime from jre.7z to the specified folder and redirects FFDec to
-        it.
+        it. Does nothing if the Java Runtime was already extracted to the folder.
 
         Args:
             temp_folder (Path): Folder to extract Java Runtime to
         """
 
+        if tool_backend.get_backend() == ToolBackend.StandIn:
+            self.log.info("The FFDec stand-in doesn't need a Java Runtime.")
+            return
+
+        if (
+            self.java_path is not None
+            and self.java_path.is_relative_to(temp_folder)
+            and is_file(self.java_path)
+        ):
+            self.log.info(f"Using Java Runtime at '{self.java_path}'.")
+            return
+
         self.log.info("Extracting Java Runtime from jre.7z...")
 
+        # only imported if needed to speed up the startup
+        from cutleast_core_lib.core.archive.archive import Archive
+
         archive: Archive = Archive.load_archive(self.jre_archive_path)
 
         if not archive.glob("*/bin/java.exe"):
             raise Exception("Archive does not contain a valid java.exe!")
 
-        archive.extract_all(temp_folder)
+        mkdir(temp_folder)
+        with trace.span("extract_jre", "io", archive=self.jre_archive_path):
+            archive.extract_all(temp_folder)
+        invalidate(temp_folder, recursive=True)
         java_path: Path = list(glob(temp_folder, "java.exe"))[0]
 
         self.log.info(f"Java Runtime extracted to '{java_path}'.")
@@ -186,5 +234,6 @@ class FFDecInterface:
         lines[-1] = last_line
 
         ffdec_bat_path.write_text("\n".join(lines))
+        self.java_path = java_path
 
         self.log.info("FFDec setup complete.")
@@ -0,0 +1,312 @@
+"""
+Copyright (c) Cutleast
+
+Deterministic stand-ins for FFDec and xdelta, used by the stand-in tool backend. They
+take the same commandline arguments as the real tools and simulate their cost by
+sleeping for a startup time and a time per MiB of the input file:
+
+    python stand_in.py [--startup S] [--seconds-per-mib S] ffdec -swf2xml <swf> <xml>
+    python stand_in.py [--startup S] [--seconds-per-mib S] xdelta -d -f -s <src> ...
+
+The SWF files of the stand-ins are SWF-like: they have the header of a compressed
+SWF file, followed by the zlib-compressed XML of the file instead of its tags.
+
+This module is run as a script, so it only imports the standard library at module
+level.
+"""
+
+import struct
+import sys
+import time
+import xml.etree.ElementTree as ET
+import zlib
+from argparse import REMAINDER, ArgumentParser, Namespace
+from pathlib import Path
+from typing import Optional
+
+SIGNATURE: bytes = b"CWS"
+"""The signature of compressed SWF files."""
+
+VERSION: int = 15
+"""The SWF version written to the header."""
+
+SVG_NAMESPACE: str = "http://www.w3.org/2000/svg"
+
+DEFAULT_STARTUP: float = 0.5
+"""Default simulated startup time of a tool in seconds."""
+
+DEFAULT_SECONDS_PER_MIB: float = 1.0
+"""Default simulated time a tool takes per MiB of its input file."""
+
+__startup: float = DEFAULT_STARTUP
+__seconds_per_mib: float = DEFAULT_SECONDS_PER_MIB
+
+
+def set_cost(startup: float, seconds_per_mib: float) -> None:
+    """
+    Sets the simulated cost of the stand-ins that are run via `get_command()`.
+
+    Args:
+        startup (float): Startup time of a tool in seconds.
+        seconds_per_mib (float): Time a tool takes per MiB of its input file.
+    """
+
+    global __startup, __seconds_per_mib
+
+    __startup = startup
+    __seconds_per_mib = seconds_per_mib
+
+
+def get_command(tool: str) -> list[str]:
+    """
+    Returns the command for running a stand-in with the simulated cost.
+
+    Args:
+        tool (str): "ffdec" or "xdelta".
+
+    Returns:
+        list[str]: The command, to be followed by the arguments of the real tool
+    """
+
+    return [
+        sys.executable,
+        str(Path(__file__).resolve()),
+        "--startup",
+        str(__startup),
+        "--seconds-per-mib",
+        str(__seconds_per_mib),
+        tool,
+    ]
+
+
+def write_swf(xml_data: bytes, swf_file: Path) -> None:
+    """
+    Writes the XML of a file as stand-in SWF file.
+
+    Args:
+        xml_data (bytes): The XML.
+        swf_file (Path): The path to the SWF file.
+    """
+
+    header: bytes = SIGNATURE + bytes([VERSION]) + struct.pack("<I", 8 + len(xml_data))
+
+    swf_file.write_bytes(header + zlib.compress(xml_data, 9))
+
+
+def read_swf(swf_file: Path) -> bytes:
+    """
+    Reads the XML of a stand-in SWF file.
+
+    Args:
+        swf_file (Path): The path to the SWF file.
+
+    Raises:
+        ValueError: When the file is not a stand-in SWF file.
+
+    Returns:
+        bytes: The XML
+    """
+
+    data: bytes = swf_file.read_bytes()
+
+    try:
+        if not data.startswith(SIGNATURE):
+            raise ValueError("Invalid signature.")
+
+        return zlib.decompress(data[8:])
+    except (ValueError, zlib.error) as ex:
+        raise ValueError(f"'{swf_file}' is not a stand-in SWF file: {ex}") from ex
+
+
+def simulate_cost(input_file: Path) -> None:
+    """
+    Sleeps for the startup time and the time for the size of the input file.
+
+    Args:
+        input_file (Path): The input file of the tool.
+    """
+
+    size: int = input_file.stat().st_size
+
+    time.sleep(__startup + size / 1024 / 1024 * __seconds_per_mib)
+
+
+def replace_shapes(swf_file: Path, out_file: Path, cmd_file: Path) -> None:
+    """
+    Replaces shapes like `ffdec -replace`. Shapes exported by the stand-in are
+    replaced with the exported shape and other images with a shape derived from their
+    size.
+
+    Args:
+        swf_file (Path): The SWF file.
+        out_file (Path): The path to write the SWF file with the replaced shapes to.
+        cmd_file (Path): File with alternating lines of shape ids and images.
+    """
+
+    root: ET.Element = ET.fromstring(read_swf(swf_file))
+    lines: list[str] = cmd_file.read_text(encoding="utf8").splitlines()
+
+    for shape_id, image_path in zip(lines[::2], lines[1::2]):
+        shape: Optional[ET.Element] = root.find(f".//item[@shapeId='{shape_id}']")
+        if shape is None:
+            continue
+
+        image_file = Path(image_path)
+        replacement: Optional[ET.Element] = None
+        if image_file.suffix.lower() == ".svg":
+            replacement = ET.parse(image_file).find(f"{{{SVG_NAMESPACE}}}metadata/item")
+
+        if replacement is None:
+            replacement = ET.Element("item")
+            records = ET.SubElement(
+                ET.SubElement(replacement, "shapes", type="SHAPEWITHSTYLE"),
+                "shapeRecords",
+            )
+            ET.SubElement(
+                records,
+                "item",
+                type="StraightEdgeRecord",
+                deltaX=str(image_file.stat().st_size % 20000),
+                deltaY="0",
+            )
+            ET.SubElement(records, "item", type="EndShapeRecord")
+
+        shape[:] = list(replacement)
+
+    write_swf(ET.tostring(root, encoding="utf-8"), out_file)
+
+
+def export_shapes(
+    swf_file: Path, shape_ids: list[str], out_path: Path, format: str
+) -> None:
+    """
+    Exports shapes like `ffdec -export shape`. The shapes are written as SVG files with
+    the XML of the shape as metadata, regardless of the format.
+
+    Args:
+        swf_file (Path): The SWF file.
+        shape_ids (list[str]): The ids of the shapes to export.
+        out_path (Path): The folder to export the shapes to.
+        format (str): The format, for example "shape:svg".
+    """
+
+    root: ET.Element = ET.fromstring(read_swf(swf_file))
+    suffix: str = format.split(":")[-1]
+
+    out_path.mkdir(parents=True, exist_ok=True)
+    for shape_id in shape_ids:
+        shape: Optional[ET.Element] = root.find(f".//item[@shapeId='{shape_id}']")
+        if shape is None:
+            continue
+
+        svg = ET.Element(f"{{{SVG_NAMESPACE}}}svg")
+        ET.SubElement(svg, f"{{{SVG_NAMESPACE}}}metadata").append(shape)
+        (out_path / f"{shape_id}.{suffix}").write_bytes(
+            ET.tostring(svg, encoding="utf-8")
+        )
+
+
+def ffdec(args: list[str]) -> None:
+    """
+    Runs the FFDec stand-in with the arguments that `FFDecInterface` uses.
+
+    Args:
+        args (list[str]): The arguments.
+
+    Raises:
+        ValueError: When the arguments are not supported.
+    """
+
+    match args:
+        case ["-swf2xml", swf_file, xml_file]:
+            simulate_cost(Path(swf_file))
+            Path(xml_file).write_bytes(read_swf(Path(swf_file)))
+
+        case ["-xml2swf", xml_file, swf_file]:
+            simulate_cost(Path(xml_file))
+            xml_data: bytes = Path(xml_file).read_bytes()
+            ET.fromstring(xml_data)  # FFDec fails for invalid XML as well
+            write_swf(xml_data, Path(swf_file))
+
+        case ["-replace", swf_file, out_file, cmd_file]:
+            simulate_cost(Path(swf_file))
+            replace_shapes(Path(swf_file), Path(out_file), Path(cmd_file))
+
+        case [
+            "-format",
+            format,
+            "-selectid",
+            shape_ids,
+            "-export",
+            "shape",
+            out_path,
+            swf_file,
+        ]:
+            simulate_cost(Path(swf_file))
+            export_shapes(Path(swf_file), shape_ids.split(","), Path(out_path), format)
+
+        case _:
+            raise ValueError(f"Unsupported FFDec arguments: {args}")
+
+
+def xdelta(args: list[str]) -> None:
+    """
+    Runs the xdelta stand-in with the arguments that `XDeltaInterface` uses. The
+    patches are decoded with the in-process decoder.
+
+    Args:
+        args (list[str]): The arguments.
+
+    Raises:
+        ValueError: When the arguments are not supported.
+    """
+
+    # imported here since this module is run as a script
+    from core.utilities import vcdiff
+
+    match args:
+        case ["-d", "-f", "-s", source_file, delta_file, target_file]:
+            simulate_cost(Path(source_file))
+            vcdiff.decode(Path(delta_file), Path(source_file), Path(target_file))
+
+        case _:
+            raise ValueError(f"Unsupported xdelta arguments: {args}")
+
+
+def main(argv: list[str]) -> int:
+    """
+    Runs a stand-in.
+
+    Args:
+        argv (list[str]): The commandline arguments.
+
+    Returns:
+        int: Exit code
+    """
+
+    parser = ArgumentParser(prog="stand_in.py")
+    parser.add_argument("--startup", type=float, default=DEFAULT_STARTUP)
+    parser.add_argument(
+        "--seconds-per-mib", type=float, default=DEFAULT_SECONDS_PER_MIB
+    )
+    parser.add_argument("tool", choices=["ffdec", "xdelta"])
+    parser.add_argument("args", nargs=REMAINDER)
+    namespace: Namespace = parser.parse_args(argv)
+
+    set_cost(namespace.startup, namespace.seconds_per_mib)
+    try:
+        if namespace.tool == "ffdec":
+            ffdec(namespace.args)
+        else:
+            xdelta(namespace.args)
+    except Exception as ex:
+        print(f"{namespace.tool} stand-in failed: {ex}", file=sys.stderr)
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    # the source folder isn't on the path when this module is run as a script
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,53 @@
+"""
+Copyright (c) Cutleast
+
+This module contains the backend that is used for running FFDec and xdelta:
+- the bundled executables in `res/ffdec` and `res/xdelta`
+- deterministic stand-ins (`core.cli_interface.stand_in`) that simulate their cost,
+  so that the whole pipeline can be run and benchmarked without them, for example on
+  Linux
+"""
+
+from enum import StrEnum
+
+
+class ToolBackend(StrEnum):
+    """
+    Enum for the available tool backends.
+    """
+
+    Native = "native"
+    """The bundled FFDec and xdelta executables."""
+
+    StandIn = "stand-in"
+    """
+    Stand-ins that convert between XML and SWF-like files. Only for benchmarks and
+    tests, since they can't read real SWF files.
+    """
+
+
+__backend: ToolBackend = ToolBackend.Native
+
+
+def set_backend(backend: ToolBackend) -> None:
+    """
+    Sets the backend used by `FFDecInterface` and `XDeltaInterface`.
+
+    Args:
+        backend (ToolBackend): The backend to use.
+    """
+
+    global __backend
+
+    __backend = backend
+
+
+def get_backend() -> ToolBackend:
+    """
+    Returns the backend used by `FFDecInterface` and `XDeltaInterface`.
+
+    Returns:
+        ToolBackend: The used backend
+    """
+
+    return __backend
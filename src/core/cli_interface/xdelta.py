@@ -9,6 +9,11 @@ from pathlib import Path
 from cutleast_core_lib.core.utilities.exe_info import get_current_path
 from cutleast_core_lib.core.utilities.process_runner import run_process
 
+from core.cli_interface import stand_in, tool_backend
+from core.cli_interface.tool_backend import ToolBackend
+from core.utilities import trace, vcdiff
+from core.utilities.filesystem import invalidate
+
 
 class XDeltaInterface:
     """
@@ -18,22 +23,92 @@ class XDeltaInterface:
     log: logging.Logger = logging.getLogger("xdelta")
     bin_path: Path = get_current_path() / "res" / "xdelta" / "xdelta.exe"
 
+    def get_command(self) -> list[str]:
+        """
+        Returns the command for running xdelta with the current tool backend.
+
+        Returns:
+            list[str]: The command, without arguments
+        """
+
+        if tool_backend.get_backend() == ToolBackend.StandIn:
+            return stand_in.get_command("xdelta")
+
+        return [str(self.bin_path)]
+
     def patch_file(self, original_file_path: Path, xdelta_file_path: Path) -> None:
+        """
+        Applies an xdelta patch to a file. The patch is decoded in-process and xdelta
+        is only run for patches that use features the decoder doesn't support.
+
+        Args:
+            original_file_path (Path): Path to the file to patch.
+            xdelta_file_path (Path): Path to the xdelta patch.
+        """
+
         self.log.info(f"Patching {original_file_path.name!r} with xdelta...")
 
-        output_file_path: Path = original_file_path.with_suffix(".patched")
+        try:
+            with trace.span("vcdiff_decode", "io", file=original_file_path):
+                vcdiff.decode(
+                    xdelta_file_path,
+                    original_file_path,
+                    XDeltaInterface.get_output_path(original_file_path),
+                )
+        except NotImplementedError as ex:
+            self.log.debug(f"Falling back to xdelta: {ex}")
+            self.run_xdelta(original_file_path, xdelta_file_path)
+
+        self.replace_original(original_file_path)
+
+    def run_xdelta(self, original_file_path: Path, xdelta_file_path: Path) -> None:
+        """
+        Runs xdelta to decode an xdelta patch to the output path of a file.
+
+        Args:
+            original_file_path (Path): Path to the file to patch.
+            xdelta_file_path (Path): Path to the xdelta patch.
+        """
+
         cmd: list[str] = [
-            str(self.bin_path),
+            *self.get_command(),
             "-d",
+            "-f",
             "-s",
             str(original_file_path),
             str(xdelta_file_path),
-            str(output_file_path),
+            str(XDeltaInterface.get_output_path(original_file_path)),
         ]
         self.log.debug(" ".join(cmd))
-        run_process(cmd)
+        with trace.span("xdelta", "process", file=original_file_path):
+            run_process(cmd)
+
+    def replace_original(self, original_file_path: Path) -> None:
+        """
+        Replaces a file with its decoded output.
+
+        Args:
+            original_file_path (Path): Path to the patched file.
+        """
+
+        output_file_path: Path = XDeltaInterface.get_output_path(original_file_path)
 
-        os.remove(original_file_path)
-        os.rename(output_file_path, original_file_path)
+        os.replace(output_file_path, original_file_path)
+        invalidate(original_file_path)
+        invalidate(output_file_path)
 
         self.log.info(f"{original_file_path.name!r} patched.")
+
+    @staticmethod
+    def get_output_path(original_file_path: Path) -> Path:
+        """
+        Returns the path a patch for a file is decoded to.
+
+        Args:
+            original_file_path (Path): Path to the file to patch.
+
+        Returns:
+            Path: The output path
+        """
+
+        return original_file_path.with_suffix(".patched")
@@ -7,9 +7,11 @@ from pathlib import Path
 from typing import Optional, Self, override
 
 from cutleast_core_lib.core.config.base_config import BaseConfig
-from pydantic import model_validator
+from pydantic import Field, model_validator
 
+from core.cli_interface.tool_backend import ToolBackend
 from core.utilities.filesystem import is_dir
+from core.utilities.glob import GlobBackend
 
 
 class Config(BaseConfig):
@@ -29,6 +31,48 @@ class Config(BaseConfig):
     output_folder: Optional[Path] = None
     """Specifies output path for patched files."""
 
+    patch_load_workers: int = 0
+    """
+    Maximum number of worker processes for loading patch files. 0 uses the number of
+    CPUs and 1 loads patch files serially.
+    """
+
+    binary_patch_workers: int = 0
+    """
+    Maximum number of worker processes for applying binary patches. 0 sizes the pool
+    from the number of CPUs and the size of the patched files and 1 applies them
+    serially.
+    """
+
+    backup_retention: int = 3
+    """
+    Number of backups kept for each overwritten output file in the `.dip_backups`
+    folder of the output folder. 0 disables backups.
+    """
+
+    patch_search_paths: list[Path] = Field(default_factory=list)
+    """
+    Folders that are scanned for patches on startup. Empty scans the current working
+    directory and its parent folder.
+    """
+
+    patch_search_depth: int = 1
+    """
+    Number of subfolder levels below the patch search paths that are scanned for
+    patches.
+    """
+
+    glob_backend: GlobBackend = GlobBackend.Auto
+    """
+    Backend for searching files. `auto` uses glob.dll only when running in MO2's VFS.
+    """
+
+    tool_backend: ToolBackend = ToolBackend.Native
+    """
+    Backend for running FFDec and xdelta. `stand-in` simulates them for benchmarks and
+    can't patch real SWF files.
+    """
+
     # Auto patch config
     auto_patch: bool = False
     """Whether to automatically run the configured patch on startup."""
@@ -40,6 +40,13 @@ class PatchCreatorConfig(BaseConfig):
     shape_types: list[str] = Field(default_factory=list)
     """Shape types that are compared and exported"""
 
+    binary_patch_threshold: float = 0.0
+    """
+    Maximum size of a binary patch relative to the JSON patch of the same SWF file for
+    creating the binary patch instead. Binary patches don't need FFDec for patching, so
+    they may be larger than the JSON patches. 0 disables binary patches.
+    """
+
     @override
     @staticmethod
     def get_config_name() -> str:
@@ -5,13 +5,22 @@ Copyright (c) Cutleast
 from __future__ import annotations
 
 import logging
+import os
+from concurrent.futures import (
+    BrokenExecutor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
 from pathlib import Path
+from typing import ClassVar, Optional
 
 from pydantic import BaseModel
 
 from core.patch.patch_type import PatchType
 from core.utilities.glob import glob
 
+from .patch_cache import PatchCache
 from .patch_file import PatchFile
 
 
@@ -26,6 +35,13 @@ class Patch(BaseModel):
     files: list[PatchFile]
     """The files in the patch."""
 
+    PARALLEL_THRESHOLD: ClassVar[int] = 32
+    """
+    Minimum number of JSON files that need to be parsed for loading a patch in
+    parallel. Smaller patches are loaded serially since starting the worker processes
+    takes longer than parsing the files.
+    """
+
     @property
     def patch_folder_path(self) -> Path:
         """
@@ -48,30 +64,194 @@ class Patch(BaseModel):
         return logging.getLogger("Patch")
 
     @staticmethod
-    def load(path: Path) -> Patch:
+    def load(
+        path: Path, use_cache: bool = True, lazy: bool = False, workers: int = 0
+    ) -> Patch:
         """
         Loads a patch and all its files from the specified path.
 
         Args:
             path (Path): The path to the patch's root folder.
+            use_cache (bool, optional):
+                Whether to use and update the compiled patch cache next to the
+                patch's Patch folder. Defaults to True.
+            lazy (bool, optional):
+                Whether to defer unpickling the patch data of cached files until it's
+                accessed. Defaults to False.
+            workers (int, optional):
+                Maximum number of worker processes for parsing the patch files. 0
+                uses the number of CPUs and 1 loads the files serially. Defaults to 0.
 
         Returns:
             Patch: The loaded patch.
         """
 
-        file_paths: list[Path] = [
-            f for suffix in PatchType for f in glob(path / "Patch", "*" + suffix)
-        ]
+        file_paths: list[Path] = glob(
+            path / "Patch", ["*" + suffix for suffix in PatchType]
+        )
+        cache: Optional[PatchCache] = PatchCache(path) if use_cache else None
 
-        files: list[PatchFile] = []
-        for file_path in file_paths:
-            try:
-                files.append(PatchFile.load(file_path, path / "Patch"))
-            except Exception as ex:
-                Patch.get_logger().error(
-                    f"Failed to load patch file '{file_path}': {ex}", exc_info=ex
-                )
+        workers = workers or os.cpu_count() or 1
+        json_files: int = sum(f.suffix.lower() == ".json" for f in file_paths)
+
+        files: list[PatchFile]
+        if workers > 1 and json_files >= Patch.PARALLEL_THRESHOLD:
+            files = Patch.__load_files_parallel(
+                file_paths, path / "Patch", cache, lazy, workers
+            )
+        else:
+            files = []
+            for file_path in file_paths:
+                try:
+                    if cache is not None:
+                        files.append(cache.load_file(file_path, path / "Patch", lazy))
+                    else:
+                        files.append(PatchFile.load(file_path, path / "Patch"))
+                except Exception as ex:
+                    Patch.__log_load_error(file_path, ex)
+
+        if cache is not None:
+            cache.save()
 
         Patch.get_logger().info(f"Loaded {len(files)} patch file(s) from '{path}'.")
 
         return Patch(path=path, files=files)
+
+    @staticmethod
+    def __load_files_parallel(
+        file_paths: list[Path],
+        patch_folder_path: Path,
+        cache: Optional[PatchCache],
+        lazy: bool,
+        workers: int,
+    ) -> list[PatchFile]:
+        """
+        Reads the JSON patch files with a thread pool and parses the ones that aren't
+        cached with a process pool. Files that fail to load are logged and skipped.
+
+        Args:
+            file_paths (list[Path]): The paths to the patch files.
+            patch_folder_path (Path): The path to the patch's "Patch" folder.
+            cache (Optional[PatchCache]): The patch cache, if enabled.
+            lazy (bool): Whether to defer unpickling the patch data of cached files.
+            workers (int): Maximum number of worker processes.
+
+        Returns:
+            list[PatchFile]: The loaded patch files, in the order of their paths
+        """
+
+        loaded_files: dict[Path, PatchFile] = {}
+        contents: dict[Path, bytes] = {}
+
+        # 1. Read JSON files and look them up in the cache
+        json_paths: list[Path] = [f for f in file_paths if f.suffix.lower() == ".json"]
+        with ThreadPoolExecutor() as executor:
+            read_futures: dict[Path, Future[PatchFile | bytes]] = {
+                file_path: executor.submit(
+                    Patch.__read_file, file_path, patch_folder_path, cache, lazy
+                )
+                for file_path in json_paths
+            }
+
+            for file_path, read_future in read_futures.items():
+                try:
+                    result: PatchFile | bytes = read_future.result()
+                except Exception as ex:
+                    Patch.__log_load_error(file_path, ex)
+                    continue
+
+                if isinstance(result, PatchFile):
+                    loaded_files[file_path] = result
+                else:
+                    contents[file_path] = result
+
+        # 2. Parse the remaining JSON files
+        if len(contents) >= Patch.PARALLEL_THRESHOLD:
+            Patch.get_logger().debug(
+                f"Parsing {len(contents)} patch file(s) with {workers} process(es)..."
+            )
+            with ProcessPoolExecutor(max_workers=workers) as process_executor:
+                parse_futures: dict[Path, Future[PatchFile]] = {
+                    file_path: process_executor.submit(
+                        PatchFile.parse_json, content, file_path, patch_folder_path
+                    )
+                    for file_path, content in contents.items()
+                }
+
+                for file_path, parse_future in parse_futures.items():
+                    try:
+                        loaded_files[file_path] = parse_future.result()
+                    except BrokenExecutor as ex:
+                        Patch.get_logger().warning(
+                            f"Process pool failed, parsing '{file_path}' serially: {ex}"
+                        )
+                    except Exception as ex:
+                        Patch.__log_load_error(file_path, ex)
+
+        for file_path, content in contents.items():
+            try:
+                if file_path not in loaded_files:
+                    loaded_files[file_path] = PatchFile.parse_json(
+                        content, file_path, patch_folder_path
+                    )
+
+                if cache is not None:
+                    cache.add_file(
+                        file_path, patch_folder_path, content, loaded_files[file_path]
+                    )
+            except Exception as ex:
+                Patch.__log_load_error(file_path, ex)
+
+        # 3. Load binary patch files, which only consist of their path
+        for file_path in file_paths:
+            if file_path.suffix.lower() != ".json":
+                try:
+                    loaded_files[file_path] = PatchFile.load(
+                        file_path, patch_folder_path
+                    )
+                except Exception as ex:
+                    Patch.__log_load_error(file_path, ex)
+
+        return [loaded_files[f] for f in file_paths if f in loaded_files]
+
+    @staticmethod
+    def __read_file(
+        file_path: Path,
+        patch_folder_path: Path,
+        cache: Optional[PatchCache],
+        lazy: bool,
+    ) -> PatchFile | bytes:
+        """
+        Returns the cached patch file or the content of the file if it's not cached.
+
+        Args:
+            file_path (Path): The path to the patch file.
+            patch_folder_path (Path): The path to the patch's "Patch" folder.
+            cache (Optional[PatchCache]): The patch cache, if enabled.
+            lazy (bool): Whether to defer unpickling the patch data of cached files.
+
+        Returns:
+            PatchFile | bytes: The cached patch file or the content of the file
+        """
+
+        if cache is not None:
+            patch_file: Optional[PatchFile] = cache.get_file(
+                file_path, patch_folder_path, lazy=lazy
+            )
+            if patch_file is not None:
+                return patch_file
+
+        content: bytes = file_path.read_bytes()
+
+        if cache is not None:
+            patch_file = cache.get_file(file_path, patch_folder_path, content, lazy)
+            if patch_file is not None:
+                return patch_file
+
+        return content
+
+    @staticmethod
+    def __log_load_error(file_path: Path, ex: Exception) -> None:
+        Patch.get_logger().error(
+            f"Failed to load patch file '{file_path}': {ex}", exc_info=ex
+        )
@@ -0,0 +1,427 @@
+"""
+Copyright (c) Cutleast
+"""
+
+from __future__ import annotations
+
+import hashlib
+import hmac
+import logging
+import os
+import pickle
+import secrets
+import sys
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+from .patch_file import PatchFile
+
+
+def get_user_cache_path() -> Path:
+    """
+    Returns the private cache folder of the current user, `%LOCALAPPDATA%/DIP` on
+    Windows and `$XDG_CACHE_HOME/DIP` or `~/.cache/DIP` elsewhere.
+
+    Returns:
+        Path: The path to the folder
+    """
+
+    base_path: str
+    if sys.platform == "win32":
+        base_path = os.environ.get("LOCALAPPDATA") or str(
+            Path.home() / "AppData" / "Local"
+        )
+    else:
+        base_path = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+
+    return Path(base_path) / "DIP"
+
+
+class CacheEntry(NamedTuple):
+    """
+    A single compiled patch file with the metadata of its source file.
+    """
+
+    mtime_ns: int
+    """Modification time of the source file in nanoseconds."""
+
+    size: int
+    """Size of the source file in bytes."""
+
+    digest: str
+    """SHA-256 hex digest of the source file."""
+
+    file: PatchFile
+    """
+    The compiled patch file. Its patch data is kept pickled until it's accessed.
+    """
+
+
+class PatchCache:
+    """
+    Binary cache of compiled patch files, stored next to a patch's "Patch" folder.
+
+    The cache is signed with a key that is private to the current user, so that cache
+    files shipped with a downloaded patch or planted by another user are never
+    deserialized.
+    """
+
+    FILE_NAME: str = ".dipcache"
+    """The file name of the cache file in a patch's root folder."""
+
+    MAGIC: bytes = b"DIPC"
+    VERSION: int = 3
+    """Version of the cache format. Bump this when `PatchFile` changes."""
+
+    KEY_PATH: Path = get_user_cache_path() / "cache.key"
+    """Path to the key used for signing the cache files of the current user."""
+
+    log: logging.Logger = logging.getLogger("PatchCache")
+
+    __key: Optional[bytes] = None
+
+    path: Path
+    """The path to the cache file."""
+
+    patch_folder_path: Path
+    """The path to the patch's "Patch" folder."""
+
+    __entries: dict[str, CacheEntry]
+    __changed: bool = False
+
+    def __init__(self, patch_path: Path) -> None:
+        """
+        Args:
+            patch_path (Path): The path to the patch's root folder.
+        """
+
+        self.path = patch_path / PatchCache.FILE_NAME
+        self.patch_folder_path = patch_path / "Patch"
+        self.__entries = self.__read()
+
+    def load_file(
+        self, file_path: Path, patch_folder_path: Path, lazy: bool = False
+    ) -> PatchFile:
+        """
+        Returns the compiled patch file for the specified source file from the cache or
+        loads and caches it if it is missing or outdated.
+
+        Args:
+            file_path (Path): The path to the patch file.
+            patch_folder_path (Path): The path to the patch's "Patch" folder.
+            lazy (bool, optional):
+                Whether to defer unpickling the patch data of a cached file until it's
+                accessed. Defaults to False.
+
+        Returns:
+            PatchFile: The loaded patch file
+        """
+
+        # binary patches don't need to be compiled
+        if file_path.suffix.lower() != ".json":
+            return PatchFile.load(file_path, patch_folder_path)
+
+        patch_file: Optional[PatchFile] = self.get_file(
+            file_path, patch_folder_path, lazy=lazy
+        )
+        if patch_file is not None:
+            return patch_file
+
+        try:
+            content: bytes = file_path.read_bytes()
+        except OSError:
+            return PatchFile.load(file_path, patch_folder_path)
+
+        patch_file = self.get_file(file_path, patch_folder_path, content, lazy)
+        if patch_file is not None:
+            return patch_file
+
+        patch_file = PatchFile.parse_json(content, file_path, patch_folder_path)
+        self.add_file(file_path, patch_folder_path, content, patch_file)
+
+        return patch_file
+
+    def get_file(
+        self,
+        file_path: Path,
+        patch_folder_path: Path,
+        content: Optional[bytes] = None,
+        lazy: bool = False,
+    ) -> Optional[PatchFile]:
+        """
+        Returns the compiled patch file for the specified source file if it's cached
+        and up to date. Without the file's content only its size and modification time
+        are compared.
+
+        Args:
+            file_path (Path): The path to the patch file.
+            patch_folder_path (Path): The path to the patch's "Patch" folder.
+            content (Optional[bytes], optional):
+                The content of the patch file for comparing its digest. Defaults to
+                None.
+            lazy (bool, optional):
+                Whether to defer unpickling the patch data until it's accessed.
+                Defaults to False.
+
+        Returns:
+            Optional[PatchFile]: The cached patch file or None
+        """
+
+        key: str = file_path.relative_to(patch_folder_path).as_posix()
+        entry: Optional[CacheEntry] = self.__entries.get(key)
+        if entry is None:
+            return None
+
+        try:
+            stat: os.stat_result = os.stat(file_path)
+        except OSError:
+            return None
+
+        if entry.size != stat.st_size:
+            return None
+
+        if entry.mtime_ns == stat.st_mtime_ns:
+            return PatchCache.__get_file(entry, lazy)
+
+        if content is not None and hashlib.sha256(content).hexdigest() == entry.digest:
+            # only the modification time changed, for example after a reinstall
+            self.__entries[key] = entry._replace(mtime_ns=stat.st_mtime_ns)
+            self.__changed = True
+            return PatchCache.__get_file(entry, lazy)
+
+        return None
+
+    def add_file(
+        self,
+        file_path: Path,
+        patch_folder_path: Path,
+        content: bytes,
+        patch_file: PatchFile,
+    ) -> None:
+        """
+        Adds a compiled patch file to the cache or replaces its outdated entry.
+
+        Args:
+            file_path (Path): The path to the patch file.
+            patch_folder_path (Path): The path to the patch's "Patch" folder.
+            content (bytes): The content the patch file was compiled from.
+            patch_file (PatchFile): The fully loaded patch file.
+        """
+
+        try:
+            stat: os.stat_result = os.stat(file_path)
+        except OSError:
+            return
+
+        cached_file: PatchFile = patch_file.model_copy()
+        cached_file.unload_data(
+            pickle.dumps(patch_file.data, protocol=pickle.HIGHEST_PROTOCOL),
+            patch_file.has_data,
+        )
+        key: str = file_path.relative_to(patch_folder_path).as_posix()
+        self.__entries[key] = CacheEntry(
+            stat.st_mtime_ns,
+            stat.st_size,
+            hashlib.sha256(content).hexdigest(),
+            cached_file,
+        )
+        self.__changed = True
+
+    def save(self) -> None:
+        """
+        Writes the cache file if any of its entries changed. Entries whose source files
+        were deleted or renamed are dropped. Failures are logged and otherwise ignored
+        since the cache is optional.
+        """
+
+        for key in list(self.__entries):
+            if not (self.patch_folder_path / key).is_file():
+                self.__entries.pop(key)
+                self.__changed = True
+
+        if not self.__changed:
+            return
+
+        try:
+            payload: bytes = pickle.dumps(
+                self.__entries, protocol=pickle.HIGHEST_PROTOCOL
+            )
+            self.path.write_bytes(
+                PatchCache.MAGIC
+                + bytes([PatchCache.VERSION])
+                + PatchCache.__sign(payload)
+                + payload
+            )
+            self.__changed = False
+            self.log.debug(f"Wrote {len(self.__entries)} entries to '{self.path}'.")
+        except Exception as ex:
+            self.log.warning(f"Failed to write patch cache '{self.path}': {ex}")
+
+    def __read(self) -> dict[str, CacheEntry]:
+        """
+        Reads the cache file if it exists and is valid.
+
+        Returns:
+            dict[str, CacheEntry]: Cache entries by their posix path, relative to the
+                patch's "Patch" folder
+        """
+
+        try:
+            data: bytes = self.path.read_bytes()
+        except OSError:
+            return {}
+
+        header_size: int = len(PatchCache.MAGIC) + 1
+        signature: bytes = data[
+            header_size : header_size + hashlib.sha256().digest_size
+        ]
+        payload: bytes = data[header_size + len(signature) :]
+
+        try:
+            if (
+                not data.startswith(PatchCache.MAGIC)
+                or data[len(PatchCache.MAGIC)] != PatchCache.VERSION
+                or not hmac.compare_digest(signature, PatchCache.__sign(payload))
+            ):
+                self.log.debug(
+                    f"Ignored outdated or foreign patch cache '{self.path}'."
+                )
+                return {}
+
+            entries: dict[str, CacheEntry] = pickle.loads(payload)
+        except Exception as ex:
+            self.log.warning(f"Failed to read patch cache '{self.path}': {ex}")
+            return {}
+
+        self.log.debug(f"Read {len(entries)} entries from '{self.path}'.")
+
+        return entries
+
+    @staticmethod
+    def __get_file(entry: CacheEntry, lazy: bool) -> PatchFile:
+        """
+        Returns a copy of the compiled patch file of a cache entry so that loading its
+        data doesn't change the entry.
+
+        Args:
+            entry (CacheEntry): The cache entry.
+            lazy (bool): Whether to defer unpickling the patch data.
+
+        Returns:
+            PatchFile: The patch file
+        """
+
+        patch_file: PatchFile = entry.file.model_copy()
+        if not lazy:
+            patch_file.load_data()
+
+        return patch_file
+
+    @staticmethod
+    def __sign(payload: bytes) -> bytes:
+        """
+        Signs a payload with the key of the current user.
+
+        Args:
+            payload (bytes): The payload to sign.
+
+        Returns:
+            bytes: HMAC-SHA256 of the payload
+        """
+
+        return hmac.digest(PatchCache.__get_key(), payload, hashlib.sha256)
+
+    @staticmethod
+    def __get_key() -> bytes:
+        """
+        Returns the key of the current user and creates it if it doesn't exist or isn't
+        private to the current user. If the key can't be written, a key that is only
+        valid for the current process is used.
+
+        Returns:
+            bytes: The key
+        """
+
+        if PatchCache.__key is not None:
+            return PatchCache.__key
+
+        try:
+            key: bytes = PatchCache.__read_key()
+        except OSError:
+            key = b""
+
+        if len(key) != 32:
+            key = secrets.token_bytes(32)
+
+            try:
+                PatchCache.__write_key(key)
+            except OSError as ex:
+                PatchCache.log.warning(
+                    f"Failed to write patch cache key '{PatchCache.KEY_PATH}': {ex}"
+                )
+
+        PatchCache.__key = key
+
+        return key
+
+    @staticmethod
+    def __read_key() -> bytes:
+        """
+        Reads the key of the current user. A key file that is a symlink, isn't owned by
+        the current user or is accessible by other users is not trusted.
+
+        Raises:
+            OSError: When the key file can't be read.
+
+        Returns:
+            bytes: The key or an empty bytes object if the key file isn't trusted
+        """
+
+        fd: int = os.open(
+            PatchCache.KEY_PATH,
+            os.O_RDONLY | getattr(os, "O_NOFOLLOW", 0) | getattr(os, "O_BINARY", 0),
+        )
+        with os.fdopen(fd, "rb") as file:
+            # the user's local app data folder is private on Windows
+            if hasattr(os, "getuid"):
+                stat: os.stat_result = os.fstat(file.fileno())
+                if stat.st_uid != os.getuid() or stat.st_mode & 0o077:
+                    PatchCache.log.warning(
+                        f"Ignored patch cache key '{PatchCache.KEY_PATH}' since it "
+                        "isn't private to the current user."
+                    )
+                    return b""
+
+            return file.read()
+
+    @staticmethod
+    def __write_key(key: bytes) -> None:
+        """
+        Writes the key of the current user, replacing an existing key file.
+
+        Args:
+            key (bytes): The key.
+
+        Raises:
+            OSError: When the key file can't be written.
+        """
+
+        PatchCache.KEY_PATH.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+
+        # the key must only be readable by the current user
+        temp_path: Path = PatchCache.KEY_PATH.with_name(
+            f"{PatchCache.KEY_PATH.name}.{secrets.token_hex(4)}"
+        )
+        fd: int = os.open(
+            temp_path,
+            os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0),
+            0o600,
+        )
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(key)
+
+            os.replace(temp_path, PatchCache.KEY_PATH)
+        except OSError:
+            temp_path.unlink(missing_ok=True)
+            raise
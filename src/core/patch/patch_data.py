@@ -0,0 +1,205 @@
+"""
+Copyright (c) Cutleast
+"""
+
+from __future__ import annotations
+
+import sys
+from collections.abc import Iterable, Iterator
+from typing import Any, Optional, overload, override
+
+from .patch_item import PatchItem
+
+
+class FilterNode:
+    """
+    A single segment of a filter (XPath) in the prefix tree of a `PatchData` object.
+    """
+
+    __slots__ = ("children", "parent", "segment")
+
+    segment: str
+    """The interned segment of this node, for example `item[@spriteId='12']`."""
+
+    parent: Optional[FilterNode]
+    """The parent node or None if this is the root node."""
+
+    children: Optional[dict[str, FilterNode]]
+    """The child nodes by their segments or None if this node has no children."""
+
+    def __init__(self, segment: str, parent: Optional[FilterNode]) -> None:
+        self.segment = segment
+        self.parent = parent
+        self.children = None
+
+    def get_child(self, segment: str) -> FilterNode:
+        """
+        Returns the child node with the specified segment and creates it if it doesn't
+        exist.
+
+        Args:
+            segment (str): The segment of the child node.
+
+        Returns:
+            FilterNode: The child node
+        """
+
+        if self.children is None:
+            self.children = {}
+
+        child: Optional[FilterNode] = self.children.get(segment)
+        if child is None:
+            segment = sys.intern(segment)
+            child = FilterNode(segment, self)
+            self.children[segment] = child
+
+        return child
+
+    @property
+    def filter(self) -> str:
+        """
+        The full filter of this node, built from the segments of its ancestors.
+        """
+
+        segments: list[str] = []
+        node: Optional[FilterNode] = self
+        while node is not None and node.parent is not None:
+            segments.append(node.segment)
+            node = node.parent
+
+        return "/".join(reversed(segments))
+
+
+class PatchData:
+    """
+    Compact representation of the patch items of a patch file.
+
+    The filters of the items are split into their segments and stored in a prefix
+    tree, so that common prefixes are only stored once. Filters are split at every
+    slash and joined again, so that they are restored exactly as they were added.
+    The changes are stored as tuples of values, with the tuples of their attribute
+    names being shared by all items of the same instance with the same attributes.
+
+    This is a read-only sequence of `PatchItem` objects for compatibility. The
+    `PatchItem` objects are created on access, so `items()` should be preferred.
+    """
+
+    __slots__ = ("__items", "__keys", "__root")
+
+    __root: FilterNode
+    """The root node of the prefix tree."""
+
+    __items: list[tuple[FilterNode, tuple[str, ...], tuple[str, ...]]]
+    """
+    The nodes, attribute names and attribute values of the items in the order they
+    were added.
+    """
+
+    __keys: dict[tuple[str, ...], tuple[str, ...]]
+    """
+    The tuples of attribute names of this instance, so that they are only stored once.
+    Not shared between instances, so that they are freed with the patch data.
+    """
+
+    def __init__(self, items: Iterable[tuple[str, dict[str, str]]] = ()) -> None:
+        """
+        Args:
+            items (Iterable[tuple[str, dict[str, str]]], optional):
+                Filters and changes of the items to add. Defaults to no items.
+        """
+
+        self.__root = FilterNode("", None)
+        self.__items = []
+        self.__keys = {}
+
+        for filter, changes in items:
+            self.add(filter, changes)
+
+    @staticmethod
+    def from_patch_items(patch_items: Iterable[PatchItem]) -> PatchData:
+        """
+        Creates patch data from a list of `PatchItem` objects.
+
+        Args:
+            patch_items (Iterable[PatchItem]): The patch items.
+
+        Returns:
+            PatchData: The patch data
+        """
+
+        return PatchData((item.filter, item.changes) for item in patch_items)
+
+    def add(self, filter: str, changes: dict[str, str]) -> None:
+        """
+        Adds an item without validating it.
+
+        Args:
+            filter (str): The filter/path to the item to be patched.
+            changes (dict[str, str]): The attributes and values to set.
+        """
+
+        node: FilterNode = self.__root
+        for segment in filter.split("/"):
+            node = node.get_child(segment)
+
+        keys: tuple[str, ...] = tuple(changes.keys())
+        keys = self.__keys.setdefault(keys, tuple(map(sys.intern, keys)))
+
+        self.__items.append((node, keys, tuple(changes.values())))
+
+    def items(self) -> Iterator[tuple[str, dict[str, str]]]:
+        """
+        Iterates over the filters and changes of the items without creating
+        `PatchItem` objects. The changes are new dicts that may be modified.
+
+        Yields:
+            tuple[str, dict[str, str]]: The filter and changes of an item
+        """
+
+        for node, keys, values in self.__items:
+            yield node.filter, dict(zip(keys, values))
+
+    def __len__(self) -> int:
+        return len(self.__items)
+
+    def __bool__(self) -> bool:
+        return bool(self.__items)
+
+    @overload
+    def __getitem__(self, index: int) -> PatchItem: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[PatchItem]: ...
+
+    def __getitem__(self, index: int | slice) -> PatchItem | list[PatchItem]:
+        if isinstance(index, slice):
+            return [
+                PatchItem(filter=node.filter, changes=dict(zip(keys, values)))
+                for node, keys, values in self.__items[index]
+            ]
+
+        node, keys, values = self.__items[index]
+        return PatchItem(filter=node.filter, changes=dict(zip(keys, values)))
+
+    def __iter__(self) -> Iterator[PatchItem]:
+        for filter, changes in self.items():
+            yield PatchItem(filter=filter, changes=changes)
+
+    @override
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, PatchData):
+            return list(self.items()) == list(other.items())
+
+        if isinstance(other, list):
+            return list(self) == other
+
+        return NotImplemented
+
+    @override
+    def __repr__(self) -> str:
+        return f"PatchData({list(self.items())!r})"
+
+    @override
+    def __reduce__(self) -> tuple[Any, ...]:
+        # pickle the items flat instead of the recursive prefix tree
+        return (PatchData, (list(self.items()),))
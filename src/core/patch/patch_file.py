@@ -4,15 +4,17 @@ Copyright (c) Cutleast
 
 from __future__ import annotations
 
+import pickle
 from dataclasses import field
 from pathlib import Path
 from typing import Any, Optional
 
-import jstyleson as json
-from pydantic import BaseModel
+from pydantic import BaseModel, PrivateAttr
 
+from core.utilities import json_utils
 from core.utilities.xml_utils import parse_xpath_part
 
+from .patch_data import PatchData
 from .patch_item import PatchItem
 from .patch_type import PatchType
 
@@ -31,15 +33,66 @@ class PatchFile(BaseModel):
     optional: bool
     """Whether the patch file is optional for the entire patch to succeed."""
 
-    data: list[PatchItem] = field(default_factory=list)
-    """The data of the patch file. Empty if it's a binary patch."""
-
     shapes: dict[Path, list[int]] = field(default_factory=dict)
     """
     The shapes and their ids to replace for this patch. Empty if it's a binary patch.
     The shapes' paths are **relative to the patch's shapes folder - not this file**.
     """
 
+    _data: Optional[PatchData] = PrivateAttr(default=None)
+    """The loaded patch data or None if it's not loaded yet."""
+
+    _data_source: Optional[bytes] = PrivateAttr(default=None)
+    """
+    The pickled patch data from the patch cache if the patch data is not loaded yet.
+    """
+
+    _has_data: bool = PrivateAttr(default=False)
+    """Whether the patch data, that is not loaded yet, is not empty."""
+
+    def __init__(
+        self, data: Optional[PatchData | list[PatchItem]] = None, **kwargs: Any
+    ) -> None:
+        """
+        Args:
+            data (Optional[PatchData | list[PatchItem]], optional):
+                The data of the patch file. Defaults to no data.
+            **kwargs: The fields of the patch file.
+        """
+
+        super().__init__(**kwargs)
+
+        self.data = data if data is not None else PatchData()
+
+    @property
+    def data(self) -> PatchData:
+        """
+        The data of the patch file. Empty if it's a binary patch.
+        Unpickled on first access if the file was loaded lazily from the patch cache.
+        """
+
+        return self.load_data()
+
+    @data.setter
+    def data(self, data: PatchData | list[PatchItem]) -> None:
+        if not isinstance(data, PatchData):
+            data = PatchData.from_patch_items(data)
+
+        self._data = data
+        self._data_source = None
+
+    @property
+    def has_data(self) -> bool:
+        """
+        Whether the patch file has any patch data. Doesn't load the data if the file
+        was loaded lazily.
+        """
+
+        if self._data is not None:
+            return bool(self._data)
+
+        return self._has_data
+
     @property
     def original_file_path(self) -> Path:
         """
@@ -70,15 +123,7 @@ class PatchFile(BaseModel):
 
         match path.suffix.lower():
             case ".json":
-                json_data: dict = json.loads(path.read_text(encoding="utf-8"))
-
-                return PatchFile(
-                    path=path.relative_to(patch_path),
-                    type=PatchType.Json,
-                    optional=json_data.get("optional", False),
-                    data=PatchFile.__process_patch_data(json_data.get("swf", {})),
-                    shapes=PatchFile.__process_shapes(json_data.get("shapes", [])),
-                )
+                return PatchFile.parse_json(path.read_bytes(), path, patch_path)
 
             case ".bin":
                 return PatchFile(
@@ -90,6 +135,70 @@ class PatchFile(BaseModel):
             case _:
                 raise NotImplementedError(f"Unsupported patch file type: {path.suffix}")
 
+    @staticmethod
+    def parse_json(content: bytes, path: Path, patch_path: Path) -> PatchFile:
+        """
+        Parses the already read content of a JSON patch file.
+
+        This is a plain static method, so that it can be run in a worker process.
+
+        Args:
+            content (bytes): Content of the file
+            path (Path): Path to file
+            patch_path (Path): Path to the patch, for making the file path relative
+
+        Returns:
+            PatchFile: PatchFile object
+        """
+
+        json_data: dict = json_utils.loads(content.decode("utf-8"))
+
+        return PatchFile(
+            path=path.relative_to(patch_path),
+            type=PatchType.Json,
+            optional=json_data.get("optional", False),
+            data=PatchFile.__process_patch_data(json_data.get("swf", {})),
+            shapes=PatchFile.__process_shapes(json_data.get("shapes", [])),
+        )
+
+    def load_data(self) -> PatchData:
+        """
+        Loads the patch data if it's not loaded yet. The loaded data is kept.
+
+        Returns:
+            PatchData: The patch data
+        """
+
+        if self._data is not None:
+            return self._data
+
+        data: PatchData
+        if self._data_source is not None:
+            # the pickled data comes from a signed patch cache
+            data = pickle.loads(self._data_source)
+        else:
+            data = PatchData()
+
+        self._data = data
+        self._data_source = None
+        self._has_data = False
+
+        return data
+
+    def unload_data(self, source: bytes, has_data: bool) -> None:
+        """
+        Drops the loaded patch data and sets the source it's loaded from on next
+        access.
+
+        Args:
+            source (bytes): The pickled patch data.
+            has_data (bool): Whether the patch data is not empty.
+        """
+
+        self._data = None
+        self._data_source = source
+        self._has_data = has_data
+
     @staticmethod
     def __process_shapes(shapes_data: list[dict[str, str]]) -> dict[Path, list[int]]:
         """
@@ -128,29 +237,29 @@ class PatchFile(BaseModel):
         return shapes
 
     @staticmethod
-    def __process_patch_data(patch_data: dict) -> list[PatchItem]:
+    def __process_patch_data(patch_data: dict) -> PatchData:
         """
-        Processes patch data and returns a list of patch items.
+        Processes patch data and returns its patch items.
 
         Args:
             patch_data (dict): Raw JSON data to process.
 
         Returns:
-            list[PatchItem]: Processed patch items.
+            PatchData: Processed patch items.
         """
 
-        result: list[PatchItem] = []
+        result = PatchData()
 
         def process_data_helper(
             data: dict[str, Any] | list, cur_filter: str = ""
-        ) -> Optional[PatchItem]:
-            cur_result: Optional[PatchItem] = None
+        ) -> Optional[tuple[str, dict[str, str]]]:
+            cur_result: Optional[tuple[str, dict[str, str]]] = None
             cur_changes: dict[str, str] = {}
 
             if isinstance(data, list):
                 for item in data:
                     if child_result := process_data_helper(item, cur_filter + "/item"):
-                        result.append(child_result)
+                        result.add(*child_result)
 
             else:
                 for key, value in data.items():
@@ -167,19 +276,17 @@ class PatchFile(BaseModel):
                             cur_changes[attribute] = value
 
                         if cur_filter and cur_changes:
-                            cur_result = PatchItem(
-                                filter=cur_filter, changes=cur_changes
-                            )
+                            cur_result = (cur_filter, cur_changes)
                     else:
                         if child_result := process_data_helper(
                             value, cur_filter + f"/{key}"
                         ):
-                            result.append(child_result)
+                            result.add(*child_result)
 
             return cur_result
 
         if cur_result := process_data_helper(patch_data):
-            result.append(cur_result)
+            result.add(*cur_result)
 
         return result
 
@@ -235,8 +342,12 @@ class PatchFile(BaseModel):
 
         result: dict[str, Any] = {}
 
-        for patch_item in self.data:
-            xpath: str = patch_item.filter
+        # Maps the ids of the list sections to an index of their items by filter,
+        # so that finding the item with a filter doesn't require a linear scan.
+        # Only the first item with a filter is indexed, like a scan would return it.
+        list_indexes: dict[int, dict[frozenset[tuple[str, str]], dict[str, Any]]] = {}
+
+        for xpath, changes in self.data.items():
             xpath_parts: list[str] = xpath.split("/")
 
             cur_section: dict[str, Any] | list[dict[str, Any]] = result
@@ -251,56 +362,35 @@ class PatchFile(BaseModel):
                 filter_dict: dict[str, str] = {
                     f"#{key}": value for key, value in attr_filters.items()
                 }
+                filter_key = frozenset(filter_dict.items())
 
                 if isinstance(cur_section, dict):
                     cur_section = cur_section.setdefault(
                         tag, [] if tag in list_tags else {}
                     )
+                    if filter_dict:
+                        if isinstance(cur_section, dict):
+                            cur_section.update(filter_dict)
+                        else:
+                            cur_section.append(filter_dict)
+                            list_indexes.setdefault(id(cur_section), {}).setdefault(
+                                filter_key, filter_dict
+                            )
                 else:
-                    matching_item: Optional[dict[str, Any]] = (
-                        PatchFile.__get_item_with_filter(filter_dict, cur_section)
+                    index: dict[frozenset[tuple[str, str]], dict[str, Any]] = (
+                        list_indexes.setdefault(id(cur_section), {})
                     )
+                    matching_item: Optional[dict[str, Any]] = index.get(filter_key)
                     if not matching_item:
-                        cur_section.append({})
-                        cur_section = cur_section[-1]
+                        cur_section.append(filter_dict)
+                        index.setdefault(filter_key, filter_dict)
+                        cur_section = filter_dict
                     else:
                         cur_section = matching_item
 
-                if filter_dict:
-                    if isinstance(cur_section, dict):
-                        cur_section.update(filter_dict)
-                    else:
-                        cur_section.append(filter_dict)
-
             if isinstance(cur_section, list):
                 cur_section = cur_section[-1]  # type: ignore
 
-            cur_section.update(
-                {f"~{key}": value for key, value in patch_item.changes.items()}
-            )
+            cur_section.update({f"~{key}": value for key, value in changes.items()})
 
         return result
-
-    @staticmethod
-    def __get_item_with_filter(
-        filter: dict[str, str], items: list[dict[str, Any]]
-    ) -> Optional[dict[str, Any]]:
-        """
-        Checks if one of the specified items matches the specified filter.
-
-        Args:
-            filter (dict[str, str]): Filter to check.
-            items (list[dict[str, Any]]): Items to check.
-
-        Returns:
-            Optional[dict[str, Any]]:
-                The item that matches the filter, or None if no match is found.
-        """
-
-        for item in items:
-            item_filter: dict[str, str] = {
-                key: value for key, value in item.items() if key.startswith("#")
-            }
-
-            if item_filter == filter:
-                return item
@@ -3,12 +3,54 @@ Copyright (c) Cutleast
 """
 
 import logging
+import os
+import stat
+import tempfile
+from collections.abc import Generator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from pathlib import Path
+from typing import Optional
 
+from pydantic import BaseModel, Field, ValidationError
+
+from core.patch.patch_type import PatchType
 from core.utilities.filesystem import is_dir
 from core.utilities.glob import glob
 
 
+class IndexedFolder(BaseModel):
+    """
+    Model representing a scanned folder in the patch index.
+    """
+
+    mtime_ns: int
+    """Modification time of the folder in nanoseconds."""
+
+    patch_mtime_ns: Optional[int] = None
+    """
+    Newest modification time of the folder's "Patch" folder and its subfolders in
+    nanoseconds or None if it has none or isn't named like a patch.
+    """
+
+    folders: Optional[list[str]] = None
+    """
+    The names of the folder's subfolders or None if they weren't listed, since the
+    folder was at the maximum depth of the scan.
+    """
+
+    is_patch: bool = False
+    """Whether the folder contains a valid patch."""
+
+
+class PatchIndex(BaseModel):
+    """
+    Model representing the persistent index of scanned folders.
+    """
+
+    folders: dict[str, IndexedFolder] = Field(default_factory=dict)
+    """The scanned folders by their paths."""
+
+
 class PatchProvider:
     """
     Class for scanning and checking of potential patches.
@@ -18,6 +60,13 @@ class PatchProvider:
 
     cwd_path: Path = Path.cwd()
 
+    INDEX_PATH: Path = Path(tempfile.gettempdir()) / "DIP_patch_index.json"
+    """
+    Path to the index of the folders scanned by the last scan. A folder is only listed
+    and checked again if its modification time or the one of its "Patch" folder or
+    one of the subfolders of its "Patch" folder changed.
+    """
+
     @staticmethod
     def check_patch(folder: Path) -> bool:
         """
@@ -35,11 +84,22 @@ class PatchProvider:
         if not is_dir(patch_path):
             return False
 
-        if not list(glob(patch_path, "*.json")) and not list(glob(patch_path, "*.bin")):
+        if not glob(patch_path, ["*" + suffix for suffix in PatchType]):
             return False
 
         return True
 
+    @staticmethod
+    def get_default_roots() -> list[Path]:
+        """
+        Returns the folders that are scanned for patches by default.
+
+        Returns:
+            list[Path]: The current working directory and its parent folder.
+        """
+
+        return [PatchProvider.cwd_path, PatchProvider.cwd_path.parent]
+
     @staticmethod
     def get_patches() -> list[str]:
         """
@@ -49,25 +109,239 @@ class PatchProvider:
             list[str]: List of possible paths to patches.
         """
 
-        PatchProvider.log.debug("Scanning for patches...")
+        return [str(patch) for patch in PatchProvider.scan()]
+
+    @staticmethod
+    def scan(
+        roots: Optional[list[Path]] = None,
+        max_depth: int = 1,
+        workers: Optional[int] = None,
+        index_path: Optional[Path] = INDEX_PATH,
+    ) -> Generator[Path, None, None]:
+        """
+        Scans the specified folders and their subfolders for patches with a thread
+        pool and yields the patches while the scan is running. Only folders with "DIP"
+        in their names are checked for patches and the subfolders of patches are not
+        scanned.
+
+        Args:
+            roots (Optional[list[Path]], optional):
+                The folders to scan. Defaults to `get_default_roots()`.
+            max_depth (int, optional):
+                How many levels of subfolders below the roots are scanned. Defaults to
+                1, which only scans the direct subfolders.
+            workers (Optional[int], optional):
+                Maximum number of threads. Defaults to the default of
+                `ThreadPoolExecutor`.
+            index_path (Optional[Path], optional):
+                Path to the persistent index of scanned folders. Defaults to
+                `INDEX_PATH`. None disables the index.
+
+        Yields:
+            Path: The found patches, in the order they are found.
+        """
+
+        if roots is None:
+            roots = PatchProvider.get_default_roots()
+
+        PatchProvider.log.debug(
+            f"Scanning {len(roots)} folder(s) for patches up to depth {max_depth}..."
+        )
+
+        index: PatchIndex = PatchProvider.__load_index(index_path)
+        scanned: dict[str, IndexedFolder] = {}
+        found: int = 0
+        reused: int = 0
+
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures: dict[Future[Optional[IndexedFolder]], tuple[Path, int]] = {}
+                submitted: set[Path] = set()
+
+                def submit(folder: Path, depth: int) -> None:
+                    if folder in submitted:
+                        return
+
+                    submitted.add(folder)
+                    futures[
+                        executor.submit(
+                            PatchProvider.__scan_folder,
+                            folder,
+                            index.folders.get(str(folder)),
+                            depth < max_depth,
+                        )
+                    ] = (folder, depth)
+
+                for root in roots:
+                    submit(root, 0)
+
+                while futures:
+                    done, _ = wait(futures, return_when=FIRST_COMPLETED)
+
+                    for future in done:
+                        folder, depth = futures.pop(future)
+
+                        try:
+                            entry: Optional[IndexedFolder] = future.result()
+                        except OSError as ex:
+                            PatchProvider.log.debug(f"Failed to scan '{folder}': {ex}")
+                            continue
 
-        paths_to_scan: list[Path] = [
-            PatchProvider.cwd_path,
-            PatchProvider.cwd_path.parent,
-        ]
-        patches: list[str] = []
+                        if entry is None:
+                            continue
 
-        for path in paths_to_scan:
-            PatchProvider.log.debug(f"Searching in '{path}'...")
+                        scanned[str(folder)] = entry
+                        if entry is index.folders.get(str(folder)):
+                            reused += 1
 
-            for item in path.iterdir():
-                PatchProvider.log.debug(f"Checking item {str(item)!r}...")
-                if not is_dir(item):
-                    continue
+                        if entry.is_patch:
+                            found += 1
+                            yield folder
 
-                if item.match("*DIP*") and is_dir(item / "Patch"):
-                    patches.append(str(item))
+                        elif depth < max_depth:
+                            for name in entry.folders or []:
+                                submit(folder / name, depth + 1)
+
+        finally:
+            PatchProvider.log.debug(
+                f"Found {found} patch(es) in {len(scanned)} folder(s), {reused} of "
+                "which were unchanged."
+            )
+            PatchProvider.__save_index(index_path, PatchIndex(folders=scanned))
+
+    @staticmethod
+    def __scan_folder(
+        folder: Path, entry: Optional[IndexedFolder], list_folders: bool
+    ) -> Optional[IndexedFolder]:
+        """
+        Checks if a folder contains a patch and lists its subfolders if required,
+        unless it did not change since it was indexed.
+
+        Args:
+            folder (Path): The folder to scan.
+            entry (Optional[IndexedFolder]): The indexed entry of the folder, if any.
+            list_folders (bool):
+                Whether to list the subfolders, which isn't required at the maximum
+                depth of the scan.
+
+        Returns:
+            Optional[IndexedFolder]:
+                The indexed entry if the folder did not change, a new entry if it did
+                or None if it's not a folder.
+        """
+
+        try:
+            folder_stat: os.stat_result = os.stat(folder)
+        except FileNotFoundError:
+            return None
+
+        if not stat.S_ISDIR(folder_stat.st_mode):
+            return None
+
+        mtime_ns: int = folder_stat.st_mtime_ns
+
+        # only folders with "DIP" in their names are checked for patches
+        is_patch_name: bool = folder.match("*DIP*")
+        patch_mtime_ns: Optional[int] = (
+            PatchProvider.__get_patch_mtime_ns(folder) if is_patch_name else None
+        )
+
+        if (
+            entry is None
+            or entry.mtime_ns != mtime_ns
+            or entry.patch_mtime_ns != patch_mtime_ns
+        ):
+            entry = IndexedFolder(
+                mtime_ns=mtime_ns,
+                patch_mtime_ns=patch_mtime_ns,
+                is_patch=(
+                    patch_mtime_ns is not None and PatchProvider.check_patch(folder)
+                ),
+            )
+
+        # the subfolders of patches are not scanned
+        if list_folders and entry.folders is None and not entry.is_patch:
+            with os.scandir(folder) as it:
+                entry = entry.model_copy(
+                    update={
+                        "folders": [
+                            item.name
+                            for item in it
+                            if item.is_dir(follow_symlinks=True)
+                        ]
+                    }
+                )
+
+        return entry
+
+    @staticmethod
+    def __get_patch_mtime_ns(folder: Path) -> Optional[int]:
+        """
+        Returns the newest modification time of the "Patch" folder of a folder and its
+        subfolders, since adding or removing a patch file only changes the modification
+        time of the folder it is in.
+
+        Args:
+            folder (Path): The folder.
+
+        Returns:
+            Optional[int]:
+                The modification time in nanoseconds or None if the folder has no
+                "Patch" folder.
+        """
+
+        try:
+            mtime_ns: int = os.stat(folder / "Patch").st_mtime_ns
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+
+        for path, _, _ in os.walk(folder / "Patch"):
+            try:
+                mtime_ns = max(mtime_ns, os.stat(path).st_mtime_ns)
+            except OSError:
+                pass
+
+        return mtime_ns
+
+    @staticmethod
+    def __load_index(index_path: Optional[Path]) -> PatchIndex:
+        """
+        Loads the index of scanned folders.
+
+        Args:
+            index_path (Optional[Path]): Path to the index or None if it's disabled.
+
+        Returns:
+            PatchIndex: The loaded index or an empty one if it doesn't exist or is
+                invalid.
+        """
+
+        if index_path is None:
+            return PatchIndex()
+
+        try:
+            return PatchIndex.model_validate_json(index_path.read_bytes())
+        except FileNotFoundError:
+            pass
+        except (OSError, ValidationError) as ex:
+            PatchProvider.log.warning(f"Failed to load patch index: {ex}")
+
+        return PatchIndex()
+
+    @staticmethod
+    def __save_index(index_path: Optional[Path], index: PatchIndex) -> None:
+        """
+        Saves the index of scanned folders.
+
+        Args:
+            index_path (Optional[Path]): Path to the index or None if it's disabled.
+            index (PatchIndex): The index to save.
+        """
 
-        PatchProvider.log.debug(f"Found {len(patches)} patches.")
+        if index_path is None:
+            return
 
-        return patches
+        try:
+            index_path.write_text(index.model_dump_json(), encoding="utf8")
+        except OSError as ex:
+            PatchProvider.log.warning(f"Failed to save patch index: {ex}")
@@ -2,13 +2,16 @@
 Copyright (c) Cutleast
 """
 
+import hashlib
 import json
 import logging
+import os
 import shutil
 import tempfile
 import time
 import xml.etree.ElementTree as ET
 from pathlib import Path
+from threading import Event
 from typing import Optional
 
 from sse_bsa import BSAArchive
@@ -22,8 +25,19 @@ from core.patch.patch_file import PatchFile
 from core.patch.patch_item import PatchItem
 from core.patch.patch_type import PatchType
 from core.patcher.patcher import Patcher
-from core.utilities.filesystem import is_dir, is_file, mkdir
+from core.utilities import trace, vcdiff
+from core.utilities.file_watcher import FileWatcher
+from core.utilities.filesystem import (
+    cached_stats,
+    forget_folders,
+    invalidate,
+    is_dir,
+    is_file,
+    mkdir,
+)
 from core.utilities.glob import glob
+from core.utilities.progress import ProgressReporter
+from core.utilities.staging import move_file, stage_file
 from core.utilities.xml_utils import split_frames
 
 
@@ -42,6 +56,40 @@ class PatchCreator:
     xdelta_interface: XDeltaInterface
     tmp_path: Optional[Path] = None
 
+    progress: ProgressReporter
+    """Reports the progress of the stages and files of each patch creation."""
+
+    # Names of the stages of a patch creation in the progress events
+    STAGE_JRE: str = "Setting up Java Runtime"
+    STAGE_PREPARE: str = "Preparing files"
+    STAGE_DELTAS: str = "Creating binary deltas"
+    STAGE_PATCHED2XML: str = "Converting patched files to XMLs"
+    STAGE_ORIGINAL2XML: str = "Converting original files to XMLs"
+    STAGE_SHAPES: str = "Extracting different shapes"
+    STAGE_REPLACE_SHAPES: str = "Replacing shapes of original files"
+    STAGE_RECONVERT: str = "Reconverting original files to XMLs"
+    STAGE_PATCH_DATA: str = "Creating patch data"
+    STAGE_OUTPUT: str = "Creating output"
+
+    WATCH_INTERVAL: float = 0.5
+    """Interval in seconds in which the patched SWF files are polled in watch mode."""
+
+    __watch_stop: Event
+    __watching: bool = False
+
+    __pristine_xmls: dict[Path, ET.ElementTree[ET.Element[str]]]
+    """
+    Parsed original XMLs before their shapes got replaced, only kept in watch mode.
+    """
+
+    __original_xmls: dict[Path, ET.Element]
+    """
+    Parsed and frame-split original XMLs with replaced shapes, only kept in watch mode.
+    """
+
+    __shape_digests: dict[Path, str]
+    """Digests of the exported shapes per patch file, only kept in watch mode."""
+
     def __init__(
         self, config: Config, patch_creator_config: PatchCreatorConfig
     ) -> None:
@@ -50,6 +98,12 @@ class PatchCreator:
 
         self.ffdec_interface = FFDecInterface()
         self.xdelta_interface = XDeltaInterface()
+        self.progress = ProgressReporter()
+
+        self.__watch_stop = Event()
+        self.__pristine_xmls = {}
+        self.__original_xmls = {}
+        self.__shape_digests = {}
 
     def load_raw_patch(self, patched_mod_path: Path) -> Patch:
         """
@@ -126,8 +180,9 @@ class PatchCreator:
             dst_path: Path = temp_folder / "Patch" / file.original_file_path
 
             mkdir(dst_path.parent)
-            shutil.copyfile(src_path, dst_path)
-            self.log.debug(f"Copied '{src_path}' -> '{dst_path}'.")
+            # the patched files are only read, so they may be hardlinked
+            stage_file(src_path, dst_path, read_only=True)
+            invalidate(dst_path)
 
     def __prepare_original_files(
         self, patch: Patch, original_mod_path: Path, temp_folder: Path
@@ -143,32 +198,78 @@ class PatchCreator:
         """
 
         for file in patch.files:
-            src_path: Path = original_mod_path / file.original_file_path
-            dst_path: Path = temp_folder / "Original" / file.original_file_path
+            self.__prepare_original_file(file, original_mod_path, temp_folder)
 
-            mkdir(dst_path.parent)
-            if is_file(src_path):
-                shutil.copyfile(src_path, dst_path)
-                self.log.debug(f"Copied '{src_path}' -> '{dst_path}'.")
-            else:
-                for bsa_file in original_mod_path.glob("*.bsa"):
-                    bsa_archive = BSAArchive(bsa_file)
-                    if file.original_file_path in list(map(Path, bsa_archive.files)):
-                        break
+    def __prepare_original_file(
+        self, file: PatchFile, original_mod_path: Path, temp_folder: Path
+    ) -> None:
+        """
+        Prepares the original file of a single patch file by copying it to the
+        specified temp folder. Extracts the file from a BSA if necessary.
 
-                else:
-                    raise FileNotFoundError(
-                        f"File '{file.original_file_path}' not found in original mod."
-                    )
+        Args:
+            file (PatchFile): Patch file to prepare the original file for.
+            original_mod_path (Path): Path to original mod.
+            temp_folder (Path): Path to temp folder.
+        """
+
+        src_path: Path = original_mod_path / file.original_file_path
+        dst_path: Path = temp_folder / "Original" / file.original_file_path
 
+        mkdir(dst_path.parent)
+        if is_file(src_path):
+            stage_file(src_path, dst_path)
+            invalidate(dst_path)
+        else:
+            for bsa_file in original_mod_path.glob("*.bsa"):
+                bsa_archive = BSAArchive(bsa_file)
+                if file.original_file_path in list(map(Path, bsa_archive.files)):
+                    break
+
+            else:
+                raise FileNotFoundError(
+                    f"File '{file.original_file_path}' not found in original mod."
+                )
+
+            with trace.span("bsa_extract_file", "io", file=file.original_file_path):
                 bsa_archive.extract_file(
                     filename=file.original_file_path,
                     dest_folder=temp_folder / "Original",
                 )
-                self.log.debug(
-                    f"Extracted '{file.original_file_path}' -> "
-                    f"'{temp_folder / 'Original' / file.original_file_path}'."
+            invalidate(dst_path)
+            self.log.debug(
+                f"Extracted '{file.original_file_path}' -> "
+                f"'{temp_folder / 'Original' / file.original_file_path}'."
+            )
+
+    def create_binary_deltas(self, patch: Patch, temp_folder: Path) -> None:
+        """
+        Encodes the patched files at the temp folder as VCDIFF deltas of the original
+        files, so that they can be compared with the JSON patches later. Does nothing if
+        binary patches are disabled or in watch mode.
+
+        Args:
+            patch (Patch): Blank patch.
+            temp_folder (Path): Path to temp folder with patched and original files.
+        """
+
+        if self.patch_creator_config.binary_patch_threshold <= 0 or self.__watching:
+            return
+
+        self.log.info("Creating binary deltas...")
+
+        for file in patch.files:
+            delta_file: Path = (
+                temp_folder / "Binary" / file.original_file_path.with_suffix(".bin")
+            )
+            mkdir(delta_file.parent)
+            with trace.span("vcdiff_encode", "io", file=file.original_file_path):
+                vcdiff.encode(
+                    temp_folder / "Original" / file.original_file_path,
+                    temp_folder / "Patch" / file.original_file_path,
+                    delta_file,
                 )
+            invalidate(delta_file)
 
     def convert_patched_files_to_xmls(self, patch: Patch, temp_folder: Path) -> None:
         """
@@ -184,7 +285,8 @@ class PatchCreator:
 
         for file in patch.files:
             swf_file: Path = temp_folder / "Patch" / file.original_file_path
-            self.ffdec_interface.swf2xml(swf_file)
+            with self.progress.file(swf_file):
+                self.ffdec_interface.swf2xml(swf_file)
 
     def convert_original_files_to_xmls(self, patch: Patch, temp_folder: Path) -> None:
         """
@@ -200,7 +302,8 @@ class PatchCreator:
 
         for file in patch.files:
             swf_file: Path = temp_folder / "Original" / file.original_file_path
-            self.ffdec_interface.swf2xml(swf_file)
+            with self.progress.file(swf_file):
+                self.ffdec_interface.swf2xml(swf_file)
 
     def extract_different_shapes(self, patch: Patch, temp_folder: Path) -> None:
         """
@@ -224,12 +327,16 @@ class PatchCreator:
                 temp_folder / "Original" / file.original_file_path.with_suffix(".xml")
             )
 
-            original_xml: ET.ElementTree[ET.Element[str]] = ET.parse(
-                str(original_xml_file)
-            )
-            patched_xml: ET.ElementTree[ET.Element[str]] = ET.parse(
-                str(patched_xml_file)
-            )
+            with trace.span("xml_parse", "io", file=file.original_file_path):
+                original_xml: ET.ElementTree[ET.Element[str]] = ET.parse(
+                    str(original_xml_file)
+                )
+                patched_xml: ET.ElementTree[ET.Element[str]] = ET.parse(
+                    str(patched_xml_file)
+                )
+
+            if self.__watching:
+                self.__pristine_xmls[file.path] = original_xml
 
             different_shapes: list[int] = self.get_different_shapes(
                 original_xml,  # type: ignore
@@ -239,21 +346,43 @@ class PatchCreator:
             if not different_shapes:
                 continue
 
-            outpath: Path = shapes_folder / patched_swf_file.stem
-            mkdir(outpath)
-
-            self.ffdec_interface.export_shapes(
-                swf_file=patched_swf_file,
-                shape_ids=different_shapes,
-                outpath=outpath,
-                format=self.patch_creator_config.export_format,
+            self.__export_file_shapes(
+                file, patched_swf_file, different_shapes, shapes_folder
             )
 
-            for shape in glob(outpath, "*", recursive=False):
-                shape_id: str = shape.stem
-                file.shapes.setdefault(
-                    patched_swf_file.stem / shape.relative_to(outpath), []
-                ).append(int(shape_id))
+    def __export_file_shapes(
+        self,
+        file: PatchFile,
+        patched_swf_file: Path,
+        shape_ids: list[int],
+        shapes_folder: Path,
+    ) -> None:
+        """
+        Exports the specified shapes of a single patched SWF file and adds them to the
+        patch file's shapes.
+
+        Args:
+            file (PatchFile): Patch file to add the shapes to.
+            patched_swf_file (Path): Path to the patched SWF file.
+            shape_ids (list[int]): Ids of the shapes to export.
+            shapes_folder (Path): Path to the Shapes folder of the output.
+        """
+
+        outpath: Path = shapes_folder / patched_swf_file.stem
+        mkdir(outpath)
+
+        self.ffdec_interface.export_shapes(
+            swf_file=patched_swf_file,
+            shape_ids=shape_ids,
+            outpath=outpath,
+            format=self.patch_creator_config.export_format,
+        )
+
+        for shape in glob(outpath, "*", recursive=False):
+            shape_id: str = shape.stem
+            file.shapes.setdefault(
+                patched_swf_file.stem / shape.relative_to(outpath), []
+            ).append(int(shape_id))
 
     def get_different_shapes(
         self, original_xml: ET.ElementTree, patched_xml: ET.ElementTree
@@ -339,23 +468,44 @@ class PatchCreator:
                 temp_folder / "Original" / file.original_file_path.with_suffix(".xml")
             )
 
-            original_xml: ET.Element[str] = ET.parse(str(original_xml_file)).getroot()
-            patched_xml: ET.Element[str] = ET.parse(str(patched_xml_file)).getroot()
+            with trace.span("xml_parse", "io", file=file.original_file_path):
+                original_xml: ET.Element[str] = ET.parse(
+                    str(original_xml_file)
+                ).getroot()
+                patched_xml: ET.Element[str] = ET.parse(str(patched_xml_file)).getroot()
 
             # prepare xmls by splitting the unindexed frame tags
             # similar to what the patcher does before applying the patch
             original_xml = split_frames(original_xml)
             patched_xml = split_frames(patched_xml)
 
-            patch_items: list[PatchItem] = self.create_patch_items(
-                original_xml, patched_xml, ".", "swf"
-            )
-            file.data = patch_items
+            if self.__watching:
+                self.__original_xmls[file.path] = original_xml
 
-            self.log.info(
-                f"Created {len(patch_items)} patch item(s) from XML differences in "
-                f"'{file.original_file_path}'."
-            )
+            self.__create_file_patch_data(file, original_xml, patched_xml)
+
+    def __create_file_patch_data(
+        self, file: PatchFile, original_xml: ET.Element, patched_xml: ET.Element
+    ) -> None:
+        """
+        Creates the patch data of a single patch file by comparing its frame-split
+        patched XML with its frame-split original XML.
+
+        Args:
+            file (PatchFile): Patch file to create the data for.
+            original_xml (ET.Element): Frame-split root of the original XML.
+            patched_xml (ET.Element): Frame-split root of the patched XML.
+        """
+
+        patch_items: list[PatchItem] = self.create_patch_items(
+            original_xml, patched_xml, ".", "swf"
+        )
+        file.data = patch_items
+
+        self.log.info(
+            f"Created {len(patch_items)} patch item(s) from XML differences in "
+            f"'{file.original_file_path}'."
+        )
 
     def create_patch_items(
         self,
@@ -448,7 +598,8 @@ class PatchCreator:
     def create_output(self, patch: Patch, temp_folder: Path) -> Path:
         """
         Creates the finished output folder at the specified temp folder with all
-        required patch files and shapes.
+        required patch files and shapes. Binary deltas created by
+        `create_binary_deltas()` replace JSON patches that are not much smaller.
 
         Args:
             patch (Patch): Patch to create.
@@ -463,22 +614,115 @@ class PatchCreator:
 
         self.log.info(f"Creating output at '{output_folder}'...")
 
-        for file in patch.files:
-            patch_folder: Path = output_folder / "Patch"
-            mkdir(patch_folder)
-            dest_file: Path = patch_folder / file.original_file_path.with_suffix(
-                ".json"
+        for index, file in enumerate(patch.files):
+            json_file: Path = self.__write_patch_file(file, output_folder)
+            delta_file: Path = (
+                temp_folder / "Binary" / file.original_file_path.with_suffix(".bin")
             )
-            mkdir(dest_file.parent)
+
+            if is_file(delta_file) and self.__is_binary_patch_cheaper(
+                json_file, delta_file
+            ):
+                patch.files[index] = self.__replace_with_binary_patch(
+                    patch, file, json_file, delta_file
+                )
+
+        return output_folder
+
+    def __is_binary_patch_cheaper(self, json_file: Path, delta_file: Path) -> bool:
+        """
+        Checks whether a binary patch should be used instead of a JSON patch according
+        to the configured threshold.
+
+        Args:
+            json_file (Path): Path to the JSON patch.
+            delta_file (Path): Path to the binary delta of the same SWF file.
+
+        Returns:
+            bool: Whether the binary patch should be used
+        """
+
+        json_size: int = os.path.getsize(json_file)
+        delta_size: int = os.path.getsize(delta_file)
+        threshold: float = self.patch_creator_config.binary_patch_threshold
+
+        self.log.debug(
+            f"'{json_file.name}': JSON patch has {json_size} byte(s), binary patch has "
+            f"{delta_size} byte(s)."
+        )
+
+        return delta_size <= json_size * threshold
+
+    def __replace_with_binary_patch(
+        self, patch: Patch, file: PatchFile, json_file: Path, delta_file: Path
+    ) -> PatchFile:
+        """
+        Replaces a written JSON patch with a binary patch and removes the shapes that
+        are only used by the JSON patch.
+
+        Args:
+            patch (Patch): Patch to create.
+            file (PatchFile): Patch file of the JSON patch.
+            json_file (Path): Path to the written JSON patch.
+            delta_file (Path): Path to the binary delta.
+
+        Returns:
+            PatchFile: The patch file of the binary patch
+        """
+
+        bin_file: Path = json_file.with_suffix(PatchType.Binary)
+        move_file(delta_file, bin_file)
+        os.remove(json_file)
+        invalidate(delta_file)
+        invalidate(bin_file)
+        invalidate(json_file)
+
+        shapes_folder: Path = patch.shapes_folder_path / file.original_file_path.stem
+        shapes_used: bool = any(
+            other is not file
+            and other.shapes
+            and other.original_file_path.stem == file.original_file_path.stem
+            for other in patch.files
+        )
+        if file.shapes and not shapes_used and is_dir(shapes_folder):
+            shutil.rmtree(shapes_folder)
+            forget_folders(shapes_folder)
+
+        self.log.info(f"Using binary patch for '{file.original_file_path}'.")
+
+        return PatchFile(
+            path=file.path.with_suffix(PatchType.Binary),
+            type=PatchType.Binary,
+            optional=file.optional,
+        )
+
+    def __write_patch_file(self, file: PatchFile, output_folder: Path) -> Path:
+        """
+        Dumps a single patch file to its JSON file in the specified output folder.
+
+        Args:
+            file (PatchFile): Patch file to dump.
+            output_folder (Path): Path to the output folder.
+
+        Returns:
+            Path: Path to the written JSON file
+        """
+
+        patch_folder: Path = output_folder / "Patch"
+        mkdir(patch_folder)
+        dest_file: Path = patch_folder / file.original_file_path.with_suffix(".json")
+        mkdir(dest_file.parent)
+        with trace.span("json_write", "io", file=file.original_file_path):
             dest_file.write_text(
                 json.dumps(
                     file.dump(self.patch_creator_config.list_tags),
                     indent=4,
                 )
             )
-            self.log.debug(f"Dumped '{file.original_file_path}' to '{dest_file}'.")
+        invalidate(dest_file)
+        self.log.debug(f"Dumped '{file.original_file_path}' to '{dest_file}'.")
 
-        return output_folder
+        return dest_file
 
     def get_tmp_dir(self) -> Path:
         """
@@ -503,6 +747,7 @@ class PatchCreator:
         1. Load patched mod and create a blank DIP patch at the output folder.
         2. Copy patched mod and original mod to a temp folder.
            Extract original mod files from BSAs if required and possible.
+           Encode binary deltas of the patched files if enabled.
         3. Convert patched and original SWFs to XMLs.
         4. Compare patched and original XMLs and export different shapes via ffdec
            commandline.
@@ -517,7 +762,8 @@ class PatchCreator:
 
         And then to finish the patch:
 
-        8. Create output folder with JSON files for each modified SWF.
+        8. Create output folder with JSON files (or binary patches if they're
+           cheaper) for each modified SWF.
         9. Copy finished patch data to the configured output folder or
         `<current directory>/Output`.
 
@@ -536,38 +782,105 @@ class PatchCreator:
 
         start_time: float = time.time()
 
+        self.progress.start_run()
+        try:
+            with trace.span("create_patch", "run"), cached_stats():
+                self.__create_patch(patched_mod_path, original_mod_path)
+        finally:
+            self.progress.finish_run()
+
+        duration: float = time.time() - start_time
+        self.log.info(f"Patch created in {duration:.3f} second(s).")
+
+        return duration
+
+    def __create_patch(self, patched_mod_path: Path, original_mod_path: Path) -> Patch:
+        """
+        Runs the steps described in `create_patch()`.
+
+        Args:
+            patched_mod_path (Path): Path to the patched mod.
+            original_mod_path (Path): Path to the original mod.
+
+        Returns:
+            Patch: The created patch
+        """
+
         if self.config.debug_mode:
             self.patch_creator_config.print_settings_to_log()
 
+        # folders may have been deleted since the last run
+        forget_folders()
+
         # 0. Create temp folder and setup JRE
         temp_folder: Path = self.get_tmp_dir()
-        self.ffdec_interface.setup_jre(temp_folder)
+        with self.progress.stage(PatchCreator.STAGE_JRE, items=1):
+            self.ffdec_interface.setup_jre(temp_folder)
 
         # 1. Load patched mod
         patch: Patch = self.load_raw_patch(patched_mod_path)
+        for stage in [
+            PatchCreator.STAGE_PREPARE,
+            PatchCreator.STAGE_DELTAS,
+            PatchCreator.STAGE_PATCHED2XML,
+            PatchCreator.STAGE_ORIGINAL2XML,
+            PatchCreator.STAGE_SHAPES,
+            PatchCreator.STAGE_REPLACE_SHAPES,
+            PatchCreator.STAGE_RECONVERT,
+            PatchCreator.STAGE_PATCH_DATA,
+            PatchCreator.STAGE_OUTPUT,
+        ]:
+            self.progress.plan(stage, len(patch.files))
 
         # 2. Copy patched mod and original mod to temp folder
-        self.prepare_files(patch, patched_mod_path, original_mod_path, temp_folder)
+        with self.progress.stage(PatchCreator.STAGE_PREPARE, items=len(patch.files)):
+            self.prepare_files(patch, patched_mod_path, original_mod_path, temp_folder)
+        # before the shapes of the original files get replaced
+        with self.progress.stage(PatchCreator.STAGE_DELTAS, items=len(patch.files)):
+            self.create_binary_deltas(patch, temp_folder)
 
         # 3. Convert patched and original SWFs to XMLs
-        self.convert_patched_files_to_xmls(patch, temp_folder)
-        self.convert_original_files_to_xmls(patch, temp_folder)
+        with self.progress.stage(
+            PatchCreator.STAGE_PATCHED2XML,
+            [temp_folder / "Patch" / file.original_file_path for file in patch.files],
+        ):
+            self.convert_patched_files_to_xmls(patch, temp_folder)
+        original_files: list[Path] = [
+            temp_folder / "Original" / file.original_file_path for file in patch.files
+        ]
+        with self.progress.stage(PatchCreator.STAGE_ORIGINAL2XML, original_files):
+            self.convert_original_files_to_xmls(patch, temp_folder)
 
         # 4. Export different shapes
-        self.extract_different_shapes(patch, temp_folder)
+        with self.progress.stage(PatchCreator.STAGE_SHAPES, items=len(patch.files)):
+            self.extract_different_shapes(patch, temp_folder)
 
         # 5. Replace shapes of the original files
         patch.path = temp_folder / "Output"
-        Patcher.patch_shapes(patch, temp_folder / "Original", self.ffdec_interface)
+        with self.progress.stage(
+            PatchCreator.STAGE_REPLACE_SHAPES,
+            [
+                temp_folder / "Original" / file.original_file_path
+                for file in patch.files
+                if file.shapes
+            ],
+        ):
+            Patcher.patch_shapes(
+                patch, temp_folder / "Original", self.ffdec_interface, self.progress
+            )
 
         # 6. Reconvert original files with replaced shapes to XMLs
-        self.convert_original_files_to_xmls(patch, temp_folder)
+        with self.progress.stage(PatchCreator.STAGE_RECONVERT, original_files):
+            self.convert_original_files_to_xmls(patch, temp_folder)
 
         # 7. Compare original and patched files
-        self.create_patch_data(patch, temp_folder)
+        with self.progress.stage(PatchCreator.STAGE_PATCH_DATA, items=len(patch.files)):
+            self.create_patch_data(patch, temp_folder)
 
-        # 8. Create output folder with JSON files for each modified SWF
-        temp_output_folder: Path = self.create_output(patch, temp_folder)
+        # 8. Create output folder with JSON files (or binary patches) for each
+        # modified SWF
+        with self.progress.stage(PatchCreator.STAGE_OUTPUT, items=len(patch.files)):
+            temp_output_folder: Path = self.create_output(patch, temp_folder)
 
         # 9. Copy finished patch data to the configured output folder or
         # `<current directory>/Output`
@@ -575,16 +888,243 @@ class PatchCreator:
             self.config.output_folder or self.cwd_path / "Output"
         )
         mkdir(final_output_folder)
-        shutil.copytree(temp_output_folder, final_output_folder, dirs_exist_ok=True)
+        shutil.copytree(
+            temp_output_folder,
+            final_output_folder,
+            copy_function=lambda src, dst: stage_file(Path(src), Path(dst)),
+            dirs_exist_ok=True,
+        )
+        invalidate(final_output_folder, recursive=True)
         self.log.debug(f"Copied '{temp_output_folder}' -> '{final_output_folder}'.")
 
+        return patch
+
+    def watch_patch(self, patched_mod_path: Path, original_mod_path: Path) -> float:
+        """
+        Creates a patch like `create_patch()` and then watches the patched SWF files for
+        changes until `stop_watching()` is called.
+
+        The original XMLs are kept parsed in memory, so that a changed SWF file is the
+        only file that gets converted and compared again. Its JSON file (and shapes)
+        in the output folder are updated afterwards.
+
+        Args:
+            patched_mod_path (Path): Path to the patched mod.
+            original_mod_path (Path): Path to the original mod.
+
+        Returns:
+            float: Duration in seconds
+        """
+
+        self.log.info(
+            f"Creating DIP patch from '{patched_mod_path}' with original mod at "
+            f"'{original_mod_path}' in watch mode..."
+        )
+
+        start_time: float = time.time()
+        self.__watch_stop.clear()
+        self.__watching = True
+
+        try:
+            with cached_stats():
+                patch: Patch = self.__create_patch(patched_mod_path, original_mod_path)
+            shapes_folder: Path = self.get_tmp_dir() / "Output" / "Shapes"
+            for file in patch.files:
+                self.__shape_digests[file.path] = PatchCreator.__get_folder_digest(
+                    shapes_folder / file.original_file_path.stem
+                )
+
+            self.log.info(
+                f"Patch created in {time.time() - start_time:.3f} second(s). "
+                f"Watching {len(patch.files)} SWF file(s) for changes..."
+            )
+
+            files: dict[Path, PatchFile] = {file.path: file for file in patch.files}
+            watcher = FileWatcher(
+                {
+                    file.path: patched_mod_path / file.original_file_path
+                    for file in patch.files
+                }
+            )
+
+            def update(file_path: Path) -> None:
+                file: PatchFile = files[file_path]
+
+                try:
+                    with cached_stats():
+                        self.update_patch_file(
+                            patch, file, patched_mod_path, original_mod_path
+                        )
+                except Exception as ex:
+                    self.log.error(
+                        f"Failed to update patch file for "
+                        f"'{file.original_file_path}': {ex}",
+                        exc_info=ex,
+                    )
+
+            watcher.watch(self.__watch_stop, PatchCreator.WATCH_INTERVAL, update)
+
+        finally:
+            self.__watching = False
+            self.__pristine_xmls.clear()
+            self.__original_xmls.clear()
+            self.__shape_digests.clear()
+
         duration: float = time.time() - start_time
-        self.log.info(f"Patch created in {duration:.3f} second(s).")
+        self.log.info(f"Stopped watching after {duration:.3f} second(s).")
 
         return duration
 
+    def stop_watching(self) -> None:
+        """
+        Stops a running `watch_patch()` after its current iteration.
+        """
+
+        self.__watch_stop.set()
+
+    def is_watching(self) -> bool:
+        """
+        Returns:
+            bool: Whether `watch_patch()` is currently running.
+        """
+
+        return self.__watching
+
+    def update_patch_file(
+        self,
+        patch: Patch,
+        file: PatchFile,
+        patched_mod_path: Path,
+        original_mod_path: Path,
+    ) -> None:
+        """
+        Re-creates the patch data of a single patch file after its patched SWF file
+        changed and updates its JSON file and shapes in the output folder.
+
+        The original file is only prepared and converted again if the replaced shapes
+        changed.
+
+        Args:
+            patch (Patch): Patch the file belongs to.
+            file (PatchFile): Patch file to update.
+            patched_mod_path (Path): Path to the patched mod.
+            original_mod_path (Path): Path to the original mod.
+        """
+
+        self.log.info(f"Updating patch file for '{file.original_file_path}'...")
+        start_time: float = time.time()
+
+        temp_folder: Path = self.get_tmp_dir()
+        src_path: Path = patched_mod_path / file.original_file_path
+        patched_swf_file: Path = temp_folder / "Patch" / file.original_file_path
+        stage_file(src_path, patched_swf_file, read_only=True)
+        invalidate(patched_swf_file)
+
+        patched_xml_file: Path = self.ffdec_interface.swf2xml(patched_swf_file)
+        patched_xml: ET.ElementTree[ET.Element[str]] = ET.parse(str(patched_xml_file))
+
+        # re-export the shapes that differ from the pristine original
+        shapes_folder: Path = temp_folder / "Output" / "Shapes"
+        shapes_outpath: Path = shapes_folder / patched_swf_file.stem
+        if is_dir(shapes_outpath):
+            shutil.rmtree(shapes_outpath)
+            forget_folders(shapes_outpath)
+
+        old_shapes: dict[Path, list[int]] = dict(file.shapes)
+        file.shapes.clear()
+
+        different_shapes: list[int] = self.get_different_shapes(
+            self.__pristine_xmls[file.path],  # type: ignore
+            patched_xml,  # type: ignore
+        )
+        if different_shapes:
+            self.__export_file_shapes(
+                file, patched_swf_file, different_shapes, shapes_folder
+            )
+
+        shape_digest: str = PatchCreator.__get_folder_digest(shapes_outpath)
+        if file.shapes != old_shapes or shape_digest != self.__shape_digests.get(
+            file.path
+        ):
+            self.log.info("Replaced shapes changed. Reconverting original file...")
+
+            self.__prepare_original_file(file, original_mod_path, temp_folder)
+            original_swf_file: Path = temp_folder / "Original" / file.original_file_path
+            if file.shapes:
+                self.ffdec_interface.replace_shapes(
+                    original_swf_file,
+                    {
+                        patch.shapes_folder_path / shape_path: ids
+                        for shape_path, ids in file.shapes.items()
+                    },
+                )
+            original_xml_file: Path = self.ffdec_interface.swf2xml(original_swf_file)
+            self.__original_xmls[file.path] = split_frames(
+                ET.parse(str(original_xml_file)).getroot()
+            )
+
+        self.__shape_digests[file.path] = shape_digest
+
+        self.__create_file_patch_data(
+            file, self.__original_xmls[file.path], split_frames(patched_xml.getroot())
+        )
+
+        # update JSON file and shapes at the final output folder
+        temp_output_folder: Path = temp_folder / "Output"
+        json_file: Path = self.__write_patch_file(file, temp_output_folder)
+        final_output_folder: Path = (
+            self.config.output_folder or self.cwd_path / "Output"
+        )
+        final_json_file: Path = final_output_folder / json_file.relative_to(
+            temp_output_folder
+        )
+        mkdir(final_json_file.parent)
+        stage_file(json_file, final_json_file)
+        invalidate(final_json_file)
+
+        final_shapes_folder: Path = final_output_folder / shapes_outpath.relative_to(
+            temp_output_folder
+        )
+        if is_dir(final_shapes_folder):
+            shutil.rmtree(final_shapes_folder)
+            forget_folders(final_shapes_folder)
+        if is_dir(shapes_outpath):
+            shutil.copytree(
+                shapes_outpath,
+                final_shapes_folder,
+                copy_function=lambda src, dst: stage_file(Path(src), Path(dst)),
+            )
+            invalidate(final_shapes_folder, recursive=True)
+
+        self.log.info(
+            f"Updated '{final_json_file}' in {time.time() - start_time:.3f} second(s)."
+        )
+
+    @staticmethod
+    def __get_folder_digest(folder: Path) -> str:
+        """
+        Calculates a digest over the names and contents of all files in a folder.
+
+        Args:
+            folder (Path): Path to the folder. May not exist.
+
+        Returns:
+            str: Hex digest, empty if the folder does not exist
+        """
+
+        if not is_dir(folder):
+            return ""
+
+        digest = hashlib.sha256()
+        for file in sorted(glob(folder, "*", recursive=False)):
+            digest.update(file.name.encode())
+            digest.update(file.read_bytes())
+
+        return digest.hexdigest()
+
     def clean(self) -> None:
         if self.tmp_path is not None and is_dir(self.tmp_path):
             shutil.rmtree(self.tmp_path, ignore_errors=True)
+            forget_folders(self.tmp_path)
             self.tmp_path = None
             self.log.info("Removed temporary folder.")
@@ -0,0 +1,193 @@
+"""
+Copyright (c) Cutleast
+
+Headless entry point of the patcher that runs a patch without loading Qt:
+
+    python -m core.patcher <patchpath> <originalpath> [-d] [-b] [-o OUTPUT_PATH]
+    python -m core.patcher --batch <manifest or folder> [--batch-original PATH] [...]
+
+The config is loaded from the same folder as the GUI's config and the arguments are
+applied to it in the same way.
+"""
+
+import logging
+import sys
+from argparse import ArgumentParser, Namespace
+from pathlib import Path
+from typing import Optional
+
+from cutleast_core_lib.core.utilities.exe_info import get_current_path
+
+from core.cli_interface import tool_backend
+from core.config.config import Config
+from core.patcher.batch import Batch, BatchItem, BatchResult
+from core.patcher.patcher import Patcher
+from core.utilities import glob, trace
+from core.utilities.progress import (
+    ProgressEvent,
+    StageFinished,
+    StageStarted,
+    format_duration,
+)
+
+log: logging.Logger = logging.getLogger("Headless")
+
+
+def get_default_config_path() -> Path:
+    """
+    Returns the path to the folder with the GUI's config.
+
+    Returns:
+        Path: The path to the config folder.
+    """
+
+    return get_current_path() / "data" / "config"
+
+
+def log_progress(event: ProgressEvent) -> None:
+    """
+    Logs the started and finished stages of a run with the estimated remaining time.
+
+    Args:
+        event (ProgressEvent): The progress event.
+    """
+
+    eta: str = f" ({format_duration(event.eta)} remaining)" if event.eta else ""
+
+    if isinstance(event, StageStarted):
+        log.info(f"{event.stage}...{eta}")
+    elif isinstance(event, StageFinished):
+        log.debug(f"{event.stage} done in {event.duration:.3f} second(s).{eta}")
+
+
+def __init_argparser() -> ArgumentParser:
+    """
+    Initializes commandline argument parser.
+    """
+
+    parser = ArgumentParser(
+        prog="python -m core.patcher",
+        description="Runs a DIP patch without GUI.",
+    )
+    parser.add_argument(
+        "-d",
+        "--debug",
+        help="Enables debug mode so that debug files get outputted.",
+        action="store_true",
+    )
+    parser.add_argument(
+        "patchpath",
+        nargs="?",
+        default="",
+        help="Path to patch that gets run. Not used with --batch.",
+    )
+    parser.add_argument(
+        "originalpath",
+        nargs="?",
+        default="",
+        help="Path to original mod that gets patched. Not used with --batch.",
+    )
+    parser.add_argument(
+        "-b",
+        "--repack-bsa",
+        help="Enables experimental repacking of original BSA file(s).",
+        action="store_true",
+    )
+    parser.add_argument(
+        "-o",
+        "--output-path",
+        help="Specifies output path for patched files.",
+    )
+    parser.add_argument(
+        "-c",
+        "--config-path",
+        help="Specifies the folder with the config. Defaults to the GUI's config.",
+        default=str(get_default_config_path()),
+    )
+    parser.add_argument(
+        "--batch",
+        help="Runs the patches of a JSON manifest with 'patch' and 'original' paths or "
+        "all DIP patches in a folder in one session.",
+    )
+    parser.add_argument(
+        "--batch-original",
+        help="Path to original mod that gets patched by the patches of a folder.",
+    )
+    parser.add_argument(
+        "--trace",
+        help="Writes the time spent in each stage and external process to the "
+        "specified JSON file in Chrome trace event format.",
+    )
+
+    return parser
+
+
+def main(args: Namespace) -> int:
+    """
+    Runs the patch or the batch specified by the commandline arguments. Also used by
+    the GUI's entry point for running batches.
+
+    Args:
+        args (Namespace): Commandline arguments.
+
+    Returns:
+        int: Exit code
+    """
+
+    logging.basicConfig(
+        level=logging.DEBUG if args.debug else logging.INFO,
+        format="[%(asctime)s.%(msecs)03d][%(levelname)s][%(name)s.%(funcName)s]: "
+        "%(message)s",
+        datefmt="%H:%M:%S",
+    )
+
+    config_path: Path = (
+        Path(args.config_path)
+        if getattr(args, "config_path", None)
+        else get_default_config_path()
+    )
+    config: Config = Config.load(config_path, log_settings=False)
+    config.apply_from_namespace(args)
+    config.print_settings_to_log()
+    glob.set_backend(config.glob_backend)
+    tool_backend.set_backend(config.tool_backend)
+
+    trace_path: Optional[str] = getattr(args, "trace", None)
+    if trace_path:
+        trace.start_tracing()
+
+    patcher = Patcher(config)
+    patcher.progress.add_listener(log_progress)
+    try:
+        if args.batch:
+            original_path: Optional[Path] = (
+                Path(args.batch_original) if args.batch_original else None
+            )
+            items: list[BatchItem] = Batch.load(Path(args.batch), original_path)
+            results: list[BatchResult] = patcher.patch_batch(items)
+
+            if not all(result.success for result in results):
+                return 1
+
+        elif args.patchpath and args.originalpath:
+            patcher.patch(
+                Path(args.patchpath).resolve(), Path(args.originalpath).resolve()
+            )
+
+        else:
+            log.error("A patch path and an original mod path must be specified!")
+            return 2
+
+    except Exception as ex:
+        log.error(f"Failed to patch: {ex}", exc_info=ex)
+        return 1
+    finally:
+        patcher.clean()
+        trace.stop_tracing(Path(trace_path) if trace_path else None)
+
+    return 0
+
+
+if __name__ == "__main__":
+    parser: ArgumentParser = __init_argparser()
+    sys.exit(main(parser.parse_args()))
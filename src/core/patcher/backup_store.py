@@ -0,0 +1,230 @@
+"""
+Copyright (c) Cutleast
+"""
+
+import hashlib
+import logging
+import os
+from datetime import datetime
+from pathlib import Path
+
+from pydantic import BaseModel, Field, ValidationError
+
+from core.utilities.staging import move_file
+
+
+class BackupEntry(BaseModel):
+    """
+    Model representing a single backup of an output file.
+    """
+
+    digest: str
+    """SHA-256 hex digest of the backed up content."""
+
+    created: datetime
+    """When the backup was created."""
+
+
+class BackupIndex(BaseModel):
+    """
+    Model representing the index of a backup store.
+    """
+
+    files: dict[str, list[BackupEntry]] = Field(default_factory=dict)
+    """
+    The backups of each output file by its posix path, relative to the output folder.
+    The newest backup is the last one.
+    """
+
+    kept: list[str] = Field(default_factory=list)
+    """
+    Digests of contents that were in the store when its index couldn't be read. They
+    may belong to any file, so they're never deleted automatically.
+    """
+
+
+class BackupStore:
+    """
+    Content-addressed store for backups of output files that are overwritten by the
+    patcher. Every distinct content is only stored once and only the newest backups
+    of each file are kept.
+
+    Callers are responsible for invalidating the paths of backed up files in the stat
+    cache of `core.utilities.filesystem`.
+    """
+
+    FOLDER_NAME: str = ".dip_backups"
+    """The name of the store's folder in the output folder."""
+
+    INDEX_FILE_NAME: str = "index.json"
+
+    log: logging.Logger = logging.getLogger("BackupStore")
+
+    output_folder: Path
+    """The output folder whose files are backed up."""
+
+    retention: int
+    """The number of backups that are kept for each file."""
+
+    index: BackupIndex
+    """The index of the store."""
+
+    def __init__(self, output_folder: Path, retention: int) -> None:
+        """
+        Args:
+            output_folder (Path): The output folder whose files are backed up.
+            retention (int):
+                The number of backups that are kept for each file. 0 disables backups.
+        """
+
+        self.output_folder = output_folder
+        self.retention = retention
+        self.index = self.__read_index()
+
+    @property
+    def path(self) -> Path:
+        """
+        The path to the store's folder.
+        """
+
+        return self.output_folder / BackupStore.FOLDER_NAME
+
+    @property
+    def objects_path(self) -> Path:
+        """
+        The path to the folder with the backed up contents, named by their digests.
+        """
+
+        return self.path / "objects"
+
+    def backup(self, file: Path) -> None:
+        """
+        Moves an output file into the store.
+
+        Args:
+            file (Path): The path to the file in the output folder.
+        """
+
+        if self.retention <= 0:
+            os.remove(file)
+            return
+
+        digest: str = BackupStore.get_digest(file)
+        object_path: Path = self.objects_path / digest
+
+        os.makedirs(self.objects_path, exist_ok=True)
+        if object_path.is_file():
+            os.remove(file)
+        else:
+            move_file(file, object_path)
+
+        key: str = file.relative_to(self.output_folder).as_posix()
+        entries: list[BackupEntry] = self.index.files.setdefault(key, [])
+        entries[:] = [entry for entry in entries if entry.digest != digest]
+        entries.append(BackupEntry(digest=digest, created=datetime.now()))
+
+        self.log.info(f"Backed up '{file}' as {digest[:12]}.")
+
+    def save(self) -> None:
+        """
+        Applies the retention, deletes contents that are no longer referenced and
+        writes the index. The previous index is replaced atomically, so that it's
+        never left incomplete.
+        """
+
+        for entries in self.index.files.values():
+            del entries[: max(len(entries) - self.retention, 0)]
+
+        self.index.files = {
+            key: entries for key, entries in self.index.files.items() if entries
+        }
+        referenced: set[str] = {
+            entry.digest for entries in self.index.files.values() for entry in entries
+        }
+        referenced.update(self.index.kept)
+
+        if self.objects_path.is_dir():
+            for object_path in self.objects_path.iterdir():
+                if object_path.name not in referenced:
+                    os.remove(object_path)
+                    self.log.debug(f"Deleted outdated backup {object_path.name[:12]}.")
+
+        index_file: Path = self.path / BackupStore.INDEX_FILE_NAME
+        if not self.index.files and not self.index.kept and not index_file.is_file():
+            return
+
+        os.makedirs(self.path, exist_ok=True)
+        tmp_path: Path = index_file.with_suffix(".tmp")
+        tmp_path.write_text(self.index.model_dump_json(indent=4), encoding="utf-8")
+        os.replace(tmp_path, index_file)
+
+    @staticmethod
+    def get_digest(file: Path) -> str:
+        """
+        Calculates the SHA-256 hex digest of a file.
+
+        Args:
+            file (Path): The path to the file.
+
+        Returns:
+            str: The hex digest
+        """
+
+        with open(file, "rb") as f:
+            return hashlib.file_digest(f, "sha256").hexdigest()
+
+    @staticmethod
+    def is_identical(file: Path, other_file: Path) -> bool:
+        """
+        Checks whether two files have the same content. The sizes are compared before
+        the digests.
+
+        Args:
+            file (Path): The path to the first file.
+            other_file (Path): The path to the second file.
+
+        Returns:
+            bool: True if both files have the same content, False otherwise
+        """
+
+        if os.path.getsize(file) != os.path.getsize(other_file):
+            return False
+
+        return BackupStore.get_digest(file) == BackupStore.get_digest(other_file)
+
+    def __read_index(self) -> BackupIndex:
+        """
+        Reads the index of the store if it exists. If the index is missing or can't be
+        read while there are backed up contents, the contents are kept and a corrupt
+        index is renamed, so that a broken index doesn't delete all backups.
+
+        Returns:
+            BackupIndex: The index
+        """
+
+        index_file: Path = self.path / BackupStore.INDEX_FILE_NAME
+        try:
+            return BackupIndex.model_validate_json(index_file.read_bytes())
+        except FileNotFoundError:
+            if not self.objects_path.is_dir():
+                return BackupIndex()
+
+            self.log.warning(f"Backup index '{index_file}' is missing.")
+        except (OSError, ValidationError) as ex:
+            self.log.warning(f"Failed to read backup index '{index_file}': {ex}")
+
+            try:
+                os.replace(index_file, index_file.with_suffix(".corrupt"))
+            except OSError:
+                pass
+
+        kept: list[str] = (
+            sorted(p.name for p in self.objects_path.iterdir())
+            if self.objects_path.is_dir()
+            else []
+        )
+        self.log.warning(
+            f"Keeping {len(kept)} existing backup(s) in '{self.objects_path}'."
+        )
+
+        return BackupIndex(kept=kept)
@@ -0,0 +1,205 @@
+"""
+Copyright (c) Cutleast
+"""
+
+from pathlib import Path
+from typing import Optional
+
+from pydantic import BaseModel, TypeAdapter
+
+from core.patch.patch_provider import PatchProvider
+from core.patch.patch_type import PatchType
+from core.utilities.filesystem import is_dir
+from core.utilities.glob import glob
+
+
+class BatchItem(BaseModel):
+    """
+    Model representing a single patch of a batch.
+    """
+
+    patch: Path
+    """The path to the patch's root folder."""
+
+    original: Path
+    """The path to the original mod that gets patched."""
+
+
+class BatchResult(BaseModel):
+    """
+    Model representing the result of a single patch of a batch.
+    """
+
+    item: BatchItem
+    """The patch that was run."""
+
+    duration: float
+    """The time in seconds spent running the patch."""
+
+    error: Optional[str] = None
+    """The error message if the patch failed."""
+
+    @property
+    def success(self) -> bool:
+        """
+        Whether the patch was run successfully.
+        """
+
+        return self.error is None
+
+
+class Batch:
+    """
+    Class for loading batches of patches and summarizing their results.
+    """
+
+    @staticmethod
+    def load(path: Path, original_path: Optional[Path] = None) -> list[BatchItem]:
+        """
+        Loads a batch from a manifest file or a folder with DIP patches.
+
+        A manifest is a JSON file with a list of objects with a `patch` and an
+        `original` path. Relative paths are relative to the manifest's folder.
+
+        Each subfolder of a folder whose name contains "DIP" and which contains a valid
+        patch is run against the specified original mod, in alphabetical order.
+
+        Args:
+            path (Path): The path to the manifest file or the folder with patches.
+            original_path (Optional[Path], optional):
+                The path to the original mod for the patches of a folder. Defaults to
+                None.
+
+        Raises:
+            ValueError: When a folder is specified without an original mod path.
+
+        Returns:
+            list[BatchItem]: The patches of the batch in the order they are run.
+        """
+
+        if not is_dir(path):
+            items: list[BatchItem] = TypeAdapter(list[BatchItem]).validate_json(
+                path.read_bytes()
+            )
+
+            return [
+                BatchItem(
+                    patch=(path.parent / item.patch).resolve(),
+                    original=(path.parent / item.original).resolve(),
+                )
+                for item in items
+            ]
+
+        if original_path is None:
+            raise ValueError(
+                "An original mod path must be specified for a folder with patches."
+            )
+
+        return [
+            BatchItem(patch=folder.resolve(), original=original_path.resolve())
+            for folder in sorted(path.iterdir(), key=lambda p: p.name.lower())
+            if folder.match("*DIP*")
+            and is_dir(folder)
+            and PatchProvider.check_patch(folder)
+        ]
+
+    @staticmethod
+    def group(items: list[BatchItem]) -> list[list[BatchItem]]:
+        """
+        Groups the patches of a batch that patch the same files of the same original
+        mod, so that they can be run together. Patches are grouped transitively, for
+        example if A and B patch the same file and B and C patch another file.
+
+        Args:
+            items (list[BatchItem]): The patches of the batch, in load order.
+
+        Returns:
+            list[list[BatchItem]]:
+                The groups, ordered by their first patch, with the patches in load
+                order.
+        """
+
+        # the original files are determined from the file names only, so that the
+        # patches don't have to be loaded
+        first_patches: dict[tuple[Path, Path], int] = {}
+        """Maps the original mods and files to the index of the first patch for them."""
+
+        roots: list[int] = list(range(len(items)))
+        """The index of the patch each patch is grouped with, the first one is a root."""
+
+        for i, item in enumerate(items):
+            patch_folder: Path = item.patch / "Patch"
+
+            # invalid patches fail on their own when they are run
+            if not is_dir(patch_folder):
+                continue
+
+            for file in glob(patch_folder, ["*" + suffix for suffix in PatchType]):
+                original_file: tuple[Path, Path] = (
+                    item.original,
+                    file.relative_to(patch_folder).with_suffix(".swf"),
+                )
+                root: int = Batch.__get_root(
+                    roots, first_patches.setdefault(original_file, i)
+                )
+                own_root: int = Batch.__get_root(roots, i)
+                roots[max(root, own_root)] = min(root, own_root)
+
+        groups: dict[int, list[BatchItem]] = {}
+        for i, item in enumerate(items):
+            groups.setdefault(Batch.__get_root(roots, i), []).append(item)
+
+        return list(groups.values())
+
+    @staticmethod
+    def __get_root(roots: list[int], index: int) -> int:
+        """
+        Returns the index of the first patch of the group of a patch.
+
+        Args:
+            roots (list[int]): The index of the patch each patch is grouped with.
+            index (int): The index of the patch.
+
+        Returns:
+            int: The index of the first patch of the group.
+        """
+
+        while roots[index] != index:
+            index = roots[index]
+
+        return index
+
+    @staticmethod
+    def get_summary(
+        results: list[BatchResult], duration: Optional[float] = None
+    ) -> str:
+        """
+        Creates a summary with the result of each patch of a batch.
+
+        Args:
+            results (list[BatchResult]): The results of the batch.
+            duration (Optional[float], optional):
+                The duration of the batch in seconds. Defaults to the sum of the
+                durations of the results.
+
+        Returns:
+            str: The summary
+        """
+
+        succeeded: int = len([result for result in results if result.success])
+        if duration is None:
+            duration = sum(result.duration for result in results)
+        lines: list[str] = [
+            f"{succeeded}/{len(results)} patch(es) succeeded in {duration:.3f} "
+            "second(s)."
+        ]
+
+        for result in results:
+            if result.success:
+                lines.append(
+                    f"[OK]     '{result.item.patch}' ({result.duration:.3f} second(s))"
+                )
+            else:
+                lines.append(f"[FAILED] '{result.item.patch}': {result.error}")
+
+        return "\n".join(lines)
@@ -0,0 +1,343 @@
+"""
+Copyright (c) Cutleast
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import time
+from collections.abc import Generator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional
+
+from pydantic import BaseModel, Field, ValidationError
+
+
+class FileCheckpoint(BaseModel):
+    """
+    Model representing the progress of a single file in a checkpoint.
+    """
+
+    inputs: str
+    """Digest of the files the file is created from."""
+
+    completed: list[str] = Field(default_factory=list)
+    """The stages that were completed for the file."""
+
+    running: Optional[str] = None
+    """The stage that was started but not completed for the file, if any."""
+
+
+class CheckpointManifest(BaseModel):
+    """
+    Model representing the manifest of a checkpoint.
+    """
+
+    files: dict[str, FileCheckpoint] = Field(default_factory=dict)
+    """The progress of each file by its posix path, relative to the work folder."""
+
+
+class Checkpoint:
+    """
+    Records which stages were completed for each file in a persistent work folder, so
+    that an interrupted run can be resumed from the last completed stage of each file.
+
+    A file whose inputs changed or that was interrupted in the middle of a stage is
+    started from scratch, since its intermediate files may be incomplete.
+    """
+
+    FILE_NAME: str = "checkpoint.json"
+    """The name of the manifest in the work folder."""
+
+    MAX_AGE: float = 7 * 24 * 60 * 60
+    """
+    Time in seconds after which the work folder of a run that was never completed is
+    removed.
+    """
+
+    log: logging.Logger = logging.getLogger("Checkpoint")
+
+    folder: Path
+    """The work folder with the intermediate files."""
+
+    manifest: CheckpointManifest
+    """The manifest of the checkpoint."""
+
+    def __init__(self, folder: Path) -> None:
+        """
+        Loads the checkpoint of the specified work folder. The folder is emptied if it
+        has no valid manifest, since its files can't be trusted then.
+
+        Args:
+            folder (Path): The work folder.
+        """
+
+        self.folder = folder
+        self.manifest = CheckpointManifest()
+
+        try:
+            self.manifest = CheckpointManifest.model_validate_json(
+                self.path.read_bytes()
+            )
+        except FileNotFoundError:
+            shutil.rmtree(self.folder, ignore_errors=True)
+        except (OSError, ValidationError) as ex:
+            self.log.warning(f"Failed to load checkpoint: {ex}")
+            shutil.rmtree(self.folder, ignore_errors=True)
+
+        os.makedirs(self.folder, exist_ok=True)
+
+    @property
+    def path(self) -> Path:
+        """
+        The path to the manifest.
+        """
+
+        return self.folder / Checkpoint.FILE_NAME
+
+    @staticmethod
+    def get_key(*parts: object) -> str:
+        """
+        Creates a key for a work folder from the specified parts, for example the paths
+        of the patches and the original mod.
+
+        Args:
+            *parts (object): The parts that identify the run.
+
+        Returns:
+            str: The key
+        """
+
+        return hashlib.sha256("\0".join(map(str, parts)).encode()).hexdigest()[:16]
+
+    @staticmethod
+    def get_inputs_digest(
+        files: list[Path], hashed_files: Optional[list[Path]] = None
+    ) -> str:
+        """
+        Creates a digest of the inputs of a file. The specified files are included by
+        their paths, modification times and sizes and the hashed files by their paths
+        and contents. Missing files are included as such.
+
+        Comparing modification times and sizes is cheap, but misses files that are
+        rewritten with the same size and modification time, for example by tools that
+        keep the modification time. So it should only be used for large files, like the
+        original SWF files and BSAs, and small files, like patch files and shapes,
+        should be hashed.
+
+        Args:
+            files (list[Path]): The files that are compared by their stamps.
+            hashed_files (Optional[list[Path]], optional):
+                The files that are compared by their contents. Defaults to None.
+
+        Returns:
+            str: SHA-256 hex digest
+        """
+
+        stamps: list[tuple[str, Optional[int], Optional[int]]] = []
+        for file in files:
+            try:
+                stat: os.stat_result = os.stat(file)
+                stamps.append((str(file), stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                stamps.append((str(file), None, None))
+
+        contents: list[tuple[str, Optional[str]]] = []
+        for file in hashed_files or []:
+            try:
+                contents.append(
+                    (str(file), hashlib.sha256(file.read_bytes()).hexdigest())
+                )
+            except OSError:
+                contents.append((str(file), None))
+
+        return hashlib.sha256(json.dumps([stamps, contents]).encode()).hexdigest()
+
+    @staticmethod
+    def prune(
+        work_path: Path,
+        keep: Optional[Path] = None,
+        max_age: float = MAX_AGE,
+    ) -> None:
+        """
+        Removes the work folders of runs that failed or were cancelled and weren't run
+        again, since they are only removed when their run is completed. A folder is
+        only removed if it wasn't modified for the specified time, so that the folders
+        of runs in other processes that are running at the same time are kept.
+
+        Args:
+            work_path (Path): The folder with the work folders.
+            keep (Optional[Path], optional):
+                The work folder of the current run, which is never removed. Defaults
+                to None.
+            max_age (float, optional):
+                Time in seconds after which a work folder is removed. Defaults to
+                `MAX_AGE`.
+        """
+
+        try:
+            entries: list[os.DirEntry[str]] = list(os.scandir(work_path))
+        except OSError:
+            return
+
+        # the manifest is written after every stage, so it's modified more recently
+        # than the folder itself
+        now: float = time.time()
+        removed: int = 0
+        for entry in entries:
+            folder = Path(entry.path)
+            if not entry.is_dir(follow_symlinks=False) or folder == keep:
+                continue
+
+            try:
+                modified: float = os.stat(folder / Checkpoint.FILE_NAME).st_mtime
+            except OSError:
+                try:
+                    modified = entry.stat(follow_symlinks=False).st_mtime
+                except OSError:
+                    continue
+
+            if now - modified > max_age:
+                shutil.rmtree(folder, ignore_errors=True)
+                removed += 1
+
+        if removed:
+            Checkpoint.log.info(f"Removed {removed} outdated work folder(s).")
+
+    def resume(self, inputs: dict[str, str]) -> list[str]:
+        """
+        Compares the checkpoint with the inputs of the files of the current run and
+        resets the progress of files whose inputs changed or that were interrupted in
+        the middle of a stage. Files that are not part of the run are forgotten.
+
+        Args:
+            inputs (dict[str, str]):
+                Maps the posix paths of the files, relative to the work folder, to the
+                digests of their inputs.
+
+        Returns:
+            list[str]:
+                The files that were reset and whose intermediate files have to be
+                removed by the caller.
+        """
+
+        files: dict[str, FileCheckpoint] = {}
+        reset: list[str] = []
+        resumed: int = 0
+
+        for file, digest in inputs.items():
+            checkpoint: Optional[FileCheckpoint] = self.manifest.files.get(file)
+
+            if (
+                checkpoint is not None
+                and checkpoint.inputs == digest
+                and checkpoint.running is None
+            ):
+                files[file] = checkpoint
+                if checkpoint.completed:
+                    resumed += 1
+                continue
+
+            if checkpoint is not None:
+                reset.append(file)
+            files[file] = FileCheckpoint(inputs=digest)
+
+        self.manifest.files = files
+        self.__save()
+
+        if resumed or reset:
+            self.log.info(
+                f"Resuming {resumed} file(s) from checkpoint, {len(reset)} file(s) "
+                "start from scratch."
+            )
+
+        return reset
+
+    def is_done(self, file: str, stage: str) -> bool:
+        """
+        Checks if the specified stage was completed for a file.
+
+        Args:
+            file (str): The posix path of the file, relative to the work folder.
+            stage (str): The name of the stage.
+
+        Returns:
+            bool: Whether the stage was completed.
+        """
+
+        checkpoint: Optional[FileCheckpoint] = self.manifest.files.get(file)
+
+        return checkpoint is not None and stage in checkpoint.completed
+
+    def start(self, file: str, stage: str) -> None:
+        """
+        Records that a stage was started for a file.
+
+        Args:
+            file (str): The posix path of the file, relative to the work folder.
+            stage (str): The name of the stage.
+        """
+
+        self.manifest.files.setdefault(file, FileCheckpoint(inputs="")).running = stage
+        self.__save()
+
+    def complete(self, file: str, stage: str) -> None:
+        """
+        Records that a stage was completed for a file.
+
+        Args:
+            file (str): The posix path of the file, relative to the work folder.
+            stage (str): The name of the stage.
+        """
+
+        checkpoint: FileCheckpoint = self.manifest.files.setdefault(
+            file, FileCheckpoint(inputs="")
+        )
+        checkpoint.running = None
+        if stage not in checkpoint.completed:
+            checkpoint.completed.append(stage)
+        self.__save()
+
+    @contextmanager
+    def step(self, file: str, stage: str) -> Generator[None, None, None]:
+        """
+        Context manager for a stage of a file. The stage is only recorded as completed
+        if no exception is raised.
+
+        Args:
+            file (str): The posix path of the file, relative to the work folder.
+            stage (str): The name of the stage.
+        """
+
+        self.start(file, stage)
+        yield
+        self.complete(file, stage)
+
+    def finish(self, keep_files: bool = False) -> None:
+        """
+        Removes the checkpoint after a completed run, so that the next run starts from
+        scratch.
+
+        Args:
+            keep_files (bool, optional):
+                Whether to keep the intermediate files, for example for debugging.
+                Defaults to False.
+        """
+
+        if keep_files:
+            self.path.unlink(missing_ok=True)
+        else:
+            shutil.rmtree(self.folder, ignore_errors=True)
+
+    def __save(self) -> None:
+        """
+        Writes the manifest. The previous manifest is replaced atomically, so that it's
+        never left incomplete when the run is interrupted.
+        """
+
+        tmp_path: Path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(self.manifest.model_dump_json(), encoding="utf8")
+        os.replace(tmp_path, self.path)
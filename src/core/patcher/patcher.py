@@ -6,23 +6,45 @@ import logging
 import os
 import shutil
 import tempfile
+import threading
 import time
 import xml.etree.ElementTree as ET
+from collections.abc import Container, Generator
+from concurrent.futures import (
+    BrokenExecutor,
+    Future,
+    ProcessPoolExecutor,
+    as_completed,
+)
+from contextlib import AbstractContextManager, contextmanager, nullcontext
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 from pydantic import TypeAdapter
-from sse_bsa import BSAArchive
 
 from core.cli_interface.ffdec import FFDecInterface
 from core.cli_interface.xdelta import XDeltaInterface
 from core.config.config import Config
 from core.patch.patch import Patch
+from core.patch.patch_data import PatchData
 from core.patch.patch_file import PatchFile
 from core.patch.patch_item import PatchItem
 from core.patch.patch_type import PatchType
-from core.utilities.filesystem import is_dir, is_file, mkdir
+from core.patcher.backup_store import BackupStore
+from core.patcher.batch import Batch, BatchItem, BatchResult
+from core.patcher.checkpoint import Checkpoint
+from core.utilities import trace, vcdiff
+from core.utilities.filesystem import (
+    cached_stats,
+    forget_folders,
+    invalidate,
+    is_dir,
+    is_file,
+    mkdir,
+)
 from core.utilities.path_splitter import split_path_with_bsa
+from core.utilities.progress import ProgressReporter
+from core.utilities.staging import move_file, stage_file
 from core.utilities.xml_utils import (
     beautify_xml,
     parse_xpath_part,
@@ -30,6 +52,15 @@ from core.utilities.xml_utils import (
     unsplit_frames,
 )
 
+if TYPE_CHECKING:
+    from sse_bsa import BSAArchive
+
+
+class PatchCancelledError(Exception):
+    """
+    Raised when a run is cancelled with `Patcher.cancel()`.
+    """
+
 
 class Patcher:
     """
@@ -38,6 +69,25 @@ class Patcher:
 
     log: logging.Logger = logging.getLogger("Patcher")
 
+    PARALLEL_BINARY_PATCH_SIZE: int = 8 * 1024 * 1024
+    """
+    Minimum total size of the files to patch for applying binary patches in parallel.
+    """
+
+    BINARY_PATCH_MEMORY: int = 1024 * 1024 * 1024
+    """Memory that may be used for applying binary patches in parallel."""
+
+    # Names of the stages of a run in the progress events, the ETA is estimated from
+    # the throughput of previous runs per stage name
+    STAGE_JRE: str = "Setting up Java Runtime"
+    STAGE_PREPARE: str = "Preparing mod files"
+    STAGE_SHAPES: str = "Patching shapes"
+    STAGE_SWF2XML: str = "Converting SWFs to XMLs"
+    STAGE_PATCH_XMLS: str = "Patching XMLs"
+    STAGE_XML2SWF: str = "Converting XMLs to SWFs"
+    STAGE_BINARY: str = "Applying binary patches"
+    STAGE_FINALIZE: str = "Finalizing files"
+
     config: Config
     cwd_path: Path = Path.cwd()
 
@@ -45,15 +95,49 @@ class Patcher:
     xdelta_interface: XDeltaInterface
     tmp_path: Optional[Path] = None
 
+    WORK_PATH: Path = Path(tempfile.gettempdir()) / "DIP_work"
+    """
+    Path to the persistent work folders of the runs. Each combination of patches,
+    original mod and output gets its own folder with a checkpoint, so that an
+    interrupted run is resumed from the last completed stage of each file. The folder
+    is removed when the run is completed and the folders of old runs that were never
+    completed are removed when a run starts (see `Checkpoint.prune()`).
+    """
+
+    progress: ProgressReporter
+    """Reports the progress of the stages and files of each run."""
+
+    __bsa_archives: dict[Path, tuple[tuple[int, int], "BSAArchive"]]
+    """
+    Opened BSAs with the modification time and size of their files when they were
+    opened, so that their indices are only read once per session.
+    """
+
+    __checkpoint: Optional[Checkpoint] = None
+    """The checkpoint of the current run."""
+
+    __cancel_event: threading.Event
+    """Set to cancel the current run before its next stage."""
+
+    __xml_cache: Optional[dict[str, Path]] = None
+    """
+    Maps the SHA-256 digests of converted SWF files to copies of their XML files while
+    a batch is running.
+    """
+
     def __init__(self, config: Config) -> None:
         self.config = config
 
         self.ffdec_interface = FFDecInterface()
         self.xdelta_interface = XDeltaInterface()
+        self.progress = ProgressReporter()
+        self.__cancel_event = threading.Event()
+        self.__bsa_archives = {}
 
     def load_patch(self, path: Path) -> Patch:
         """
-        Loads the patch from the specified path.
+        Loads the patch from the specified path. The patch data of the files is only
+        loaded when it's accessed.
 
         Args:
             path (Path): The path to the patch file.
@@ -62,11 +146,15 @@ class Patcher:
             Patch: The loaded patch.
         """
 
-        return Patch.load(path)
+        return Patch.load(path, lazy=True, workers=self.config.patch_load_workers)
 
     @staticmethod
     def patch_shapes(
-        patch: Patch, temp_folder: Path, ffdec_interface: FFDecInterface
+        patch: Patch,
+        temp_folder: Path,
+        ffdec_interface: FFDecInterface,
+        progress: Optional[ProgressReporter] = None,
+        skip: Container[Path] = (),
     ) -> None:
         """
         Patches the shapes of the specified patch to the files at the specified path.
@@ -75,6 +163,11 @@ class Patcher:
             patch (Patch): The patch to run.
             temp_folder (Path): The path to the temp folder with the original files.
             ffdec_interface (FFDecInterface): The FFDecInterface to use.
+            progress (Optional[ProgressReporter], optional):
+                Reporter for the patched files. Defaults to None.
+            skip (Container[Path], optional):
+                Files in the temp folder whose shapes were already patched. Defaults to
+                no files.
         """
 
         for patch_file in patch.files:
@@ -82,11 +175,19 @@ class Patcher:
                 continue
 
             swf_file: Path = temp_folder / patch_file.original_file_path
+            if swf_file in skip:
+                if progress is not None:
+                    progress.advance(swf_file, skipped=True)
+                continue
             shapes: dict[Path, list[int]] = {
                 patch.shapes_folder_path / shape_path: ids
                 for shape_path, ids in patch_file.shapes.items()
             }
-            ffdec_interface.replace_shapes(swf_file, shapes)
+            file_progress: AbstractContextManager[None] = (
+                progress.file(swf_file) if progress is not None else nullcontext()
+            )
+            with file_progress:
+                ffdec_interface.replace_shapes(swf_file, shapes)
 
     def prepare_files(
         self, patch: Patch, original_mod_path: Path, temp_folder: Path
@@ -106,141 +207,320 @@ class Patcher:
         bsa_file: Optional[Path]
         mod_file: Optional[Path]
         for file in patch.files:
-            bsa_file, mod_file = split_path_with_bsa(file.original_file_path)
+            with self.progress.file(temp_folder / file.original_file_path):
+                # Skip files that were already prepared for a previous patch of the run
+                if is_file(temp_folder / file.original_file_path):
+                    self.progress.skip_file()
+                    continue
+
+                with self.__step(
+                    temp_folder / file.original_file_path, Patcher.STAGE_PREPARE
+                ):
+                    bsa_file, mod_file = split_path_with_bsa(file.original_file_path)
+
+                    if mod_file is None:
+                        self.log.error(
+                            "An error occured while splitting "
+                            f"'{file.original_file_path}'."
+                        )
+                        self.log.debug(f"BSA file: {bsa_file}")
+                        self.log.debug(f"Mod file: {mod_file}")
+                        continue
+
+                    if bsa_file is not None:
+                        bsa_file = original_mod_path / bsa_file.name
+                    else:
+                        mod_file = mod_file.relative_to(patch.path)
+
+                    required: bool = not file.optional
+                    origin_path: Path = original_mod_path / mod_file
+                    dest_path: Path = temp_folder / mod_file
+
+                    if bsa_file is None:
+                        if is_file(origin_path):
+                            mkdir(dest_path.parent)
+                            stage_file(origin_path, dest_path)
+                            invalidate(dest_path)
+
+                        elif required:
+                            raise FileNotFoundError(
+                                f"'{origin_path}' is required but does not exist!"
+                            )
+
+                        # Skip missing but optional SWF files
+                        else:
+                            self.log.warning(
+                                f"'{origin_path}' does not exist! Skipped patch file."
+                            )
+
+                    elif is_file(bsa_file):
+                        bsa_archive: BSAArchive = self.get_bsa_archive(bsa_file)
+                        with trace.span("bsa_extract_file", "io", file=mod_file):
+                            bsa_archive.extract_file(
+                                mod_file, temp_folder / bsa_file.name
+                            )
+                        invalidate(temp_folder / bsa_file.name / mod_file)
+                        self.log.debug(
+                            f"Extracted '{bsa_file / mod_file}' -> "
+                            f"'{temp_folder / bsa_file.name / mod_file}'."
+                        )
+
+                    elif required:
+                        raise FileNotFoundError(
+                            f"'{bsa_file}' is required but does not exist!"
+                        )
+
+                    # Skip missing but optional BSA files
+                    else:
+                        self.log.warning(
+                            f"'{bsa_file}' does not exist! Skipped patch file."
+                        )
 
-            if mod_file is None:
-                self.log.error(
-                    f"An error occured while splitting '{file.original_file_path}'."
-                )
-                self.log.debug(f"BSA file: {bsa_file}")
-                self.log.debug(f"Mod file: {mod_file}")
-                continue
+        self.log.info("Mod files ready to patch.")
 
-            if bsa_file is not None:
-                bsa_file = original_mod_path / bsa_file.name
-            else:
-                mod_file = mod_file.relative_to(patch.path)
+    def get_bsa_archive(self, bsa_file: Path) -> "BSAArchive":
+        """
+        Opens the specified BSA or returns it from the BSAs opened in this session if
+        the file wasn't modified since.
 
-            required: bool = not file.optional
-            origin_path: Path = original_mod_path / mod_file
-            dest_path: Path = temp_folder / mod_file
+        Args:
+            bsa_file (Path): The path to the BSA.
 
-            if bsa_file is None:
-                if is_file(origin_path):
-                    mkdir(dest_path.parent)
-                    shutil.copyfile(origin_path, dest_path)
-                    self.log.debug(f"Copied '{origin_path}' -> '{dest_path}'.")
+        Returns:
+            BSAArchive: The opened BSA.
+        """
 
-                elif required:
-                    raise FileNotFoundError(
-                        f"'{origin_path}' is required but does not exist!"
-                    )
+        # only imported if needed to speed up the startup
+        from sse_bsa import BSAArchive
 
-                # Skip missing but optional SWF files
-                else:
-                    self.log.warning(
-                        f"'{origin_path}' does not exist! Skipped patch file."
+        stat: os.stat_result = os.stat(bsa_file)
+        file_id: tuple[int, int] = (stat.st_mtime_ns, stat.st_size)
+
+        cached: Optional[tuple[tuple[int, int], BSAArchive]] = self.__bsa_archives.get(
+            bsa_file
+        )
+        if cached is not None and cached[0] == file_id:
+            return cached[1]
+
+        with trace.span("bsa_open", "io", file=bsa_file):
+            bsa_archive = BSAArchive(bsa_file)
+        self.__bsa_archives[bsa_file] = (file_id, bsa_archive)
+
+        return bsa_archive
+
+    @staticmethod
+    def group_json_files(patches: list[Patch]) -> dict[Path, dict[Path, PatchFile]]:
+        """
+        Groups the JSON patch files with patch data of the specified patches by the
+        original files they patch.
+
+        Args:
+            patches (list[Patch]): The patches, in load order.
+
+        Returns:
+            dict[Path, dict[Path, PatchFile]]:
+                Maps the paths of the original files to the paths of the patches and
+                their patch files for the original file, in load order.
+        """
+
+        groups: dict[Path, dict[Path, PatchFile]] = {}
+        for patch in patches:
+            for patch_file in patch.files:
+                if patch_file.type == PatchType.Json and patch_file.has_data:
+                    groups.setdefault(patch_file.original_file_path, {})[patch.path] = (
+                        patch_file
                     )
 
-            elif is_file(bsa_file):
-                bsa_archive = BSAArchive(bsa_file)
-                bsa_archive.extract_file(mod_file, temp_folder / bsa_file.name)
-                self.log.debug(
-                    f"Extracted '{bsa_file / mod_file}' -> "
-                    f"'{temp_folder / bsa_file.name / mod_file}'."
-                )
+        return groups
 
-            elif required:
-                raise FileNotFoundError(f"'{bsa_file}' is required but does not exist!")
+    @staticmethod
+    def check_binary_patches(patches: list[Patch]) -> None:
+        """
+        Checks that the files patched by binary patches are not patched by any other
+        patch, since binary patches only apply to the unmodified original files.
 
-            # Skip missing but optional BSA files
-            else:
-                self.log.warning(f"'{bsa_file}' does not exist! Skipped patch file.")
+        Args:
+            patches (list[Patch]): The patches, in load order.
 
-        self.log.info("Mod files ready to patch.")
+        Raises:
+            ValueError: When a file is patched by a binary patch and another patch.
+        """
 
-    def convert_swfs2xmls(self, patch: Patch, temp_folder: Path) -> None:
+        patched_files: dict[Path, Patch] = {}
+        for patch in patches:
+            for patch_file in patch.files:
+                other_patch: Optional[Patch] = patched_files.get(
+                    patch_file.original_file_path
+                )
+
+                if other_patch is not None and (
+                    patch_file.type == PatchType.Binary
+                    or any(
+                        file.type == PatchType.Binary
+                        and file.original_file_path == patch_file.original_file_path
+                        for file in other_patch.files
+                    )
+                ):
+                    raise ValueError(
+                        f"'{patch_file.original_file_path}' is patched by "
+                        f"'{other_patch.path.name}' and '{patch.path.name}' but one of "
+                        "them is a binary patch!"
+                    )
+
+                patched_files.setdefault(patch_file.original_file_path, patch)
+
+    def convert_swfs2xmls(self, patches: list[Patch], temp_folder: Path) -> None:
         """
         Converts the SWF files within the specified temp folder to XML files if they have
-        a JSON patch file in the specified patch.
+        a JSON patch file in any of the specified patches. Each file is only converted
+        once.
 
         Args:
-            patch (Patch): Patch to run.
+            patches (list[Patch]): Patches to run.
             temp_folder (Path): Temp folder with SWF files.
         """
 
-        for patch_file in patch.files:
-            swf_file: Path = temp_folder / patch_file.original_file_path
+        for original_file_path in Patcher.group_json_files(patches):
+            swf_file: Path = temp_folder / original_file_path
+
+            with self.progress.file(swf_file):
+                if self.__is_done(swf_file, Patcher.STAGE_SWF2XML):
+                    self.progress.skip_file()
+                    continue
 
-            if patch_file.type == PatchType.Json and patch_file.data:
                 if is_file(swf_file):
-                    self.ffdec_interface.swf2xml(swf_file)
+                    with self.__step(swf_file, Patcher.STAGE_SWF2XML):
+                        self.convert_swf2xml(swf_file)
                 else:
                     self.log.error(
                         f"Failed to convert '{swf_file}' to XML file: File does not "
                         "exist."
                     )
 
-    def convert_xmls2swfs(self, patch: Patch, temp_folder: Path) -> None:
+    def convert_swf2xml(self, swf_file: Path) -> Path:
+        """
+        Converts an SWF file to an XML file. While a batch is running, the XML file is
+        copied from the conversion of an identical SWF file by a previous patch, if any.
+
+        Args:
+            swf_file (Path): SWF file to convert to XML.
+
+        Returns:
+            Path: to converted XML file.
+        """
+
+        if self.__xml_cache is None:
+            return self.ffdec_interface.swf2xml(swf_file)
+
+        digest: str = BackupStore.get_digest(swf_file)
+        xml_file: Path = swf_file.with_suffix(".xml")
+        cached_xml: Optional[Path] = self.__xml_cache.get(digest)
+
+        if cached_xml is not None and is_file(cached_xml):
+            stage_file(cached_xml, xml_file)
+            invalidate(xml_file)
+            self.log.info(f"Reused XML of {swf_file.name!r} from previous conversion.")
+
+            return xml_file
+
+        self.ffdec_interface.swf2xml(swf_file)
+
+        cached_xml = self.get_tmp_dir() / "xml_cache" / f"{digest}.xml"
+        mkdir(cached_xml.parent)
+        stage_file(xml_file, cached_xml)
+        invalidate(cached_xml)
+        self.__xml_cache[digest] = cached_xml
+
+        return xml_file
+
+    def convert_xmls2swfs(self, patches: list[Patch], temp_folder: Path) -> None:
         """
         Converts the XML files within the specified temp folder back to SWF files if they
-        have a JSON patch file in the specified patch.
+        have a JSON patch file in any of the specified patches. Each file is only
+        converted once.
 
         Args:
-            patch (Patch): Patch to run.
+            patches (list[Patch]): Patches to run.
             temp_folder (Path): Temp folder with XML files.
         """
 
-        for patch_file in patch.files:
-            xml_file: Path = temp_folder / patch_file.original_file_path.with_suffix(
-                ".xml"
-            )
+        for original_file_path in Patcher.group_json_files(patches):
+            xml_file: Path = temp_folder / original_file_path.with_suffix(".xml")
+
+            with self.progress.file(xml_file):
+                if self.__is_done(xml_file, Patcher.STAGE_XML2SWF):
+                    self.progress.skip_file()
+                    continue
 
-            if patch_file.type == PatchType.Json and patch_file.data:
                 if is_file(xml_file):
-                    self.ffdec_interface.xml2swf(xml_file)
+                    with self.__step(xml_file, Patcher.STAGE_XML2SWF):
+                        self.ffdec_interface.xml2swf(xml_file)
                 else:
                     self.log.error(
                         f"Failed to convert '{xml_file}' back to SWF file: File does "
                         "not exist."
                     )
 
-    def patch_xmls(self, patch: Patch, temp_folder: Path) -> None:
+    def patch_xmls(self, patches: list[Patch], temp_folder: Path) -> None:
         """
-        Patches the XML files in the temp folder according to the patch's JSON files.
+        Patches the XML files in the temp folder according to the JSON files of the
+        patches. XML files that are patched by multiple patches are only parsed and
+        written once.
 
         Args:
-            patch (Patch): Patch to run.
+            patches (list[Patch]): Patches to run, in load order.
             temp_folder (Path): Temp folder with XML files.
         """
 
-        for patch_file in patch.files:
-            xml_file: Path = temp_folder / patch_file.original_file_path.with_suffix(
-                ".xml"
-            )
+        for original_file_path, patch_files in Patcher.group_json_files(
+            patches
+        ).items():
+            xml_file: Path = temp_folder / original_file_path.with_suffix(".xml")
+
+            with self.progress.file(xml_file):
+                if self.__is_done(xml_file, Patcher.STAGE_PATCH_XMLS):
+                    self.progress.skip_file()
+                    continue
 
-            if patch_file.type == PatchType.Json and patch_file.data:
                 if is_file(xml_file):
-                    self.patch_xml_file(xml_file, patch_file.data)
+                    with self.__step(xml_file, Patcher.STAGE_PATCH_XMLS):
+                        self.patch_xml_file(
+                            xml_file,
+                            {
+                                patch_path: patch_file.data
+                                for patch_path, patch_file in patch_files.items()
+                            },
+                        )
                 else:
                     self.log.error(
                         f"Failed to patch '{xml_file}': File does not exist."
                     )
 
-    def patch_xml_file(self, xml_file: Path, patch_data: list[PatchItem]) -> None:
+    def patch_xml_file(self, xml_file: Path, patch_data: dict[Path, PatchData]) -> int:
         """
-        Patches the specified XML file with the specified patch data.
+        Patches the specified XML file with the patch data of one or more patches.
+        The patch data is applied in the specified order and attributes that are set to
+        different values by multiple patches are reported as conflicts, of which the
+        last patch wins.
 
         Args:
             xml_file (Path): XML file to patch.
-            patch_data (list[PatchItem]): Patch data to apply.
+            patch_data (dict[Path, PatchData]):
+                Maps the paths of the patches to their patch data to apply, in load
+                order.
+
+        Returns:
+            int: The number of conflicting attribute writes.
         """
 
         self.log.info(
-            f"Patching '{xml_file.name}' with {len(patch_data)} patch item(s)..."
+            f"Patching '{xml_file.name}' with "
+            f"{sum(len(data) for data in patch_data.values())} patch item(s) from "
+            f"{len(patch_data)} patch(es)..."
         )
 
-        xml_data: ET.ElementTree[ET.Element[str]] = ET.parse(str(xml_file))
+        with trace.span("xml_parse", "io", file=xml_file):
+            xml_data: ET.ElementTree[ET.Element[str]] = ET.parse(str(xml_file))
         xml_root: ET.Element[str] = xml_data.getroot()
 
         if self.config.debug_mode:
@@ -248,38 +528,75 @@ class Patcher:
             mkdir(output_folder)
             _debug_json = (output_folder / f"{xml_file.stem}.json").resolve()
             _debug_json.write_bytes(
-                TypeAdapter(list[PatchItem]).dump_json(patch_data, indent=4)
+                TypeAdapter(list[PatchItem]).dump_json(
+                    [item for data in patch_data.values() for item in data], indent=4
+                )
             )
 
         # split frames as they aren't indexed or whatsoever in the XML
         xml_root = split_frames(xml_root)
 
-        for item in patch_data:
-            filter: str = item.filter
-            changes: dict[str, str] = item.changes
-            filter = f".{filter}"
-            elements = xml_root.findall(filter)
-            if not elements:
-                parent_filter, last_part = filter.rsplit("/", 1)
-                new_element_tag, _ = parse_xpath_part(last_part)
-                self.log.debug(
-                    f"Creating new '{new_element_tag}' element at '{parent_filter}'..."
-                )
-                new_element = ET.Element(new_element_tag)
-                new_element.attrib = changes
-                parents = xml_root.findall(parent_filter)
-                for parent in parents:
-                    parent.append(new_element)
-
-            for element in elements:
-                for key, value in changes.items():
-                    element.attrib[key] = str(value)
+        # Maps the ids of the elements and their attributes to the patch that last set
+        # them and the value, for detecting conflicts between multiple patches
+        written: dict[tuple[int, str], tuple[Path, str]] = {}
+        conflicts: int = 0
+
+        for patch_path, data in patch_data.items():
+            for filter, changes in data.items():
+                filter = f".{filter}"
+                elements = xml_root.findall(filter)
+                if not elements:
+                    parent_filter, last_part = filter.rsplit("/", 1)
+                    new_element_tag, _ = parse_xpath_part(last_part)
+                    self.log.debug(
+                        f"Creating new '{new_element_tag}' element at "
+                        f"'{parent_filter}'..."
+                    )
+                    new_element = ET.Element(new_element_tag)
+                    new_element.attrib = changes
+                    parents = xml_root.findall(parent_filter)
+                    for parent in parents:
+                        parent.append(new_element)
+
+                    if len(patch_data) > 1:
+                        for key, value in changes.items():
+                            written[(id(new_element), key)] = (patch_path, str(value))
+
+                for element in elements:
+                    for key, value in changes.items():
+                        value = str(value)
+
+                        if len(patch_data) > 1:
+                            previous: Optional[tuple[Path, str]] = written.get(
+                                (id(element), key)
+                            )
+                            if (
+                                previous is not None
+                                and previous[0] != patch_path
+                                and previous[1] != value
+                            ):
+                                conflicts += 1
+                                self.log.warning(
+                                    f"Conflict in '{xml_file.name}': "
+                                    f"'{patch_path.name}' overwrites {key!r} of "
+                                    f"'{filter}' set by '{previous[0].name}' "
+                                    f"({previous[1]!r} -> {value!r})."
+                                )
+                            written[(id(element), key)] = (patch_path, value)
+
+                        element.attrib[key] = value
+
+        if conflicts:
+            self.log.warning(
+                f"Found {conflicts} conflicting attribute write(s) in "
+                f"'{xml_file.name}'. The patch loaded last wins."
+            )
 
         # unsplit frames again
         xml_root = unsplit_frames(xml_root)
 
         self.log.info("Writing XML file...")
-        with open(xml_file, "wb") as file:
+        with trace.span("xml_write", "io", file=xml_file), open(xml_file, "wb") as file:
             xml_data.write(file, encoding="utf8")
 
         # Optional debug XML file
@@ -293,9 +610,11 @@ class Patcher:
                 )
             self.log.debug(f"Debug written to '{_debug_xml}'.")
 
+        return conflicts
+
     def finalize_files(
         self,
-        patch: Patch,
+        patches: list[Patch],
         temp_folder: Path,
         original_mod_path: Path,
         output_folder: Path,
@@ -303,10 +622,12 @@ class Patcher:
     ) -> None:
         """
         Copies patched files to the output folder and repacks BSAs with patched files if
-        enabled.
+        enabled. Output files that are identical to existing ones are left untouched and
+        existing files that are overwritten are moved to the backup store of the output
+        folder.
 
         Args:
-            patch (Patch): Patch to run.
+            patches (list[Patch]): Patches to run.
             temp_folder (Path): Temp folder with patched files.
             original_mod_path (Path): Path to original mod (for original BSAs).
             output_folder (Path): Output folder for repacked BSAs.
@@ -319,55 +640,76 @@ class Patcher:
         """
 
         mkdir(output_folder)
+        backup_store = BackupStore(output_folder, self.config.backup_retention)
 
         bsa_file: Optional[Path]
         mod_file: Optional[Path]
-        for file in patch.files:
-            bsa_file, mod_file = split_path_with_bsa(file.original_file_path)
-
-            if mod_file is None:
-                self.log.error(
-                    f"An error occured while splitting '{file.original_file_path}'."
-                )
-                self.log.debug(f"BSA file: {bsa_file}")
-                self.log.debug(f"Mod file: {mod_file}")
-                continue
-
-            patched_file: Path = temp_folder / file.original_file_path
-
-            # Skip missing SWF files
-            if not is_file(patched_file):
-                self.log.warning(f"Skipped missing patched file '{patched_file}'.")
-                continue
+        for original_file_path in Patcher.get_original_file_paths(patches):
+            with self.progress.file(temp_folder / original_file_path):
+                # Skip files that were already finalized by an interrupted run
+                if self.__is_done(
+                    temp_folder / original_file_path, Patcher.STAGE_FINALIZE
+                ):
+                    self.progress.skip_file()
+                    continue
+
+                bsa_file, mod_file = split_path_with_bsa(original_file_path)
+
+                if mod_file is None:
+                    self.log.error(
+                        f"An error occured while splitting '{original_file_path}'."
+                    )
+                    self.log.debug(f"BSA file: {bsa_file}")
+                    self.log.debug(f"Mod file: {mod_file}")
+                    continue
 
-            if bsa_file is not None and repack_bsas:
-                bsa_file = original_mod_path / bsa_file
-                bsa_archives.setdefault(bsa_file, []).append(mod_file)
+                patched_file: Path = temp_folder / original_file_path
 
-            else:
-                src: Path = patched_file
-                dst: Path = output_folder / mod_file
+                # Skip missing SWF files
+                if not is_file(patched_file):
+                    self.log.warning(f"Skipped missing patched file '{patched_file}'.")
+                    continue
 
-                # Backup original file
-                if is_file(dst):
-                    os.rename(
-                        dst,
-                        dst.with_suffix(
-                            dst.suffix + time.strftime(".%d-%m-%Y-%H-%M-%S")
-                        ),
-                    )
+                if bsa_file is not None and repack_bsas:
+                    bsa_file = original_mod_path / bsa_file
+                    bsa_archives.setdefault(bsa_file, []).append(mod_file)
+                    self.__start(patched_file, Patcher.STAGE_FINALIZE)
 
-                mkdir(dst.parent)
-                shutil.copyfile(src, dst)
+                else:
+                    with self.__step(patched_file, Patcher.STAGE_FINALIZE):
+                        src: Path = patched_file
+                        dst: Path = output_folder / mod_file
+
+                        if is_file(dst):
+                            # Leave identical output files untouched
+                            if BackupStore.is_identical(src, dst):
+                                self.log.info(f"Skipped unchanged file '{dst}'.")
+                                self.progress.skip_file()
+                                continue
+
+                            # Backup original file, the index is saved right away
+                            # so that the backup isn't lost if the run is interrupted
+                            backup_store.backup(dst)
+                            backup_store.save()
+                            invalidate(dst)
+
+                        mkdir(dst.parent)
+                        move_file(src, dst)
+                        invalidate(src)
+                        invalidate(dst)
 
         for bsa_file, files in bsa_archives.items():
             self.log.info(f"Repacking {bsa_file.name!r} with patched files...")
 
             # 1. Extract BSA to a new temp folder
-            bsa_archive = BSAArchive(bsa_file)
+            from sse_bsa import BSAArchive
+
+            bsa_archive: BSAArchive = self.get_bsa_archive(bsa_file)
             bsa_content_path: Path = temp_folder / ("out_" + bsa_file.name)
             mkdir(bsa_content_path)
-            bsa_archive.extract(bsa_content_path)
+            with trace.span("bsa_extract", "io", file=bsa_file):
+                bsa_archive.extract(bsa_content_path)
+            invalidate(bsa_content_path, recursive=True)
 
             # 2. Copy patched files over original files
             for file in files:
@@ -378,22 +720,44 @@ class Patcher:
                 if is_file(dst):
                     os.remove(dst)
 
-                shutil.copyfile(src, dst)
+                move_file(src, dst)
+                invalidate(src)
+                invalidate(dst)
+
+            # 3. Repack BSA in temp folder
+            repacked_bsa: Path = temp_folder / ("repacked_" + bsa_file.name)
+            with trace.span("bsa_repack", "io", file=bsa_file, files=len(files)):
+                BSAArchive.create_archive(bsa_content_path, repacked_bsa)
+            invalidate(repacked_bsa)
 
-            # 3. Repack BSA at output folder
+            # 4. Move repacked BSA to output folder
             dst: Path = output_folder / bsa_file.name
 
-            # Backup original BSA
-            if is_file(dst):
-                os.rename(
-                    dst,
-                    dst.with_suffix(dst.suffix + time.strftime(".%d-%m-%Y-%H-%M-%S")),
+            # Leave identical BSA untouched
+            if is_file(dst) and BackupStore.is_identical(repacked_bsa, dst):
+                self.log.info(f"Skipped unchanged BSA '{dst}'.")
+
+            else:
+                if is_file(dst):
+                    # Backup original BSA
+                    backup_store.backup(dst)
+                    backup_store.save()
+                    invalidate(dst)
+
+                move_file(repacked_bsa, dst)
+                invalidate(repacked_bsa)
+                invalidate(dst)
+
+            # the files of a BSA are only finalized together with the BSA
+            for file in files:
+                self.__complete(
+                    temp_folder / bsa_file.name / file, Patcher.STAGE_FINALIZE
                 )
 
-            BSAArchive.create_archive(bsa_content_path, output_folder / bsa_file.name)
+        backup_store.save()
 
     def finish_patching(
-        self, patch: Patch, temp_folder: Path, original_mod_path: Path
+        self, patches: list[Patch], temp_folder: Path, original_mod_path: Path
     ) -> None:
         output_folder: Path
         if self.config.output_folder is not None:
@@ -402,7 +766,7 @@ class Patcher:
             output_folder = self.cwd_path.parent
 
         self.finalize_files(
-            patch,
+            patches,
             temp_folder,
             original_mod_path,
             output_folder,
@@ -429,31 +793,360 @@ class Patcher:
     def apply_binary_patches(self, patch: Patch, temp_folder: Path) -> None:
         """
         Applies binary patches to the original files in the specified temp folder.
+        The patches are decoded in worker processes if there are enough of them.
 
         Args:
             patch (Patch): The patch to run.
             temp_folder (Path): The temp folder containing copies of the original files.
+
+        Raises:
+            ExceptionGroup: When one or more binary patches could not be applied.
         """
 
-        binary_patches: list[PatchFile] = [
-            file for file in patch.files if file.type == PatchType.Binary
-        ]
+        binary_patches: dict[Path, Path] = {}
+        for file in patch.files:
+            if file.type != PatchType.Binary:
+                continue
+
+            swf_file: Path = temp_folder / file.original_file_path
+            # Skip files that were already patched by an interrupted run
+            if self.__is_done(swf_file, Patcher.STAGE_BINARY):
+                self.progress.advance(swf_file, skipped=True)
+                continue
+
+            binary_patches[swf_file] = patch.patch_folder_path / file.path
 
         if not binary_patches:
             return
 
-        self.log.info(f"Applying {len(binary_patches)} binary patch(es)...")
+        workers: int = self.__get_binary_patch_workers(list(binary_patches))
+        self.log.info(
+            f"Applying {len(binary_patches)} binary patch(es) with {workers} "
+            "process(es)..."
+        )
 
-        for patch_file in binary_patches:
-            swf_file: Path = temp_folder / patch_file.original_file_path
-            bin_file: Path = patch.patch_folder_path / patch_file.path
-            self.xdelta_interface.patch_file(swf_file, bin_file)
+        errors: dict[Path, Exception] = {}
+        if workers > 1:
+            for swf_file in binary_patches:
+                self.__start(swf_file, Patcher.STAGE_BINARY)
+
+            with (
+                trace.span("vcdiff_decode_pool", "process", workers=workers),
+                ProcessPoolExecutor(max_workers=workers) as executor,
+            ):
+                futures: dict[Future[None], Path] = {
+                    executor.submit(
+                        vcdiff.decode,
+                        bin_file,
+                        swf_file,
+                        XDeltaInterface.get_output_path(swf_file),
+                    ): swf_file
+                    for swf_file, bin_file in binary_patches.items()
+                }
+
+                start_time: float = time.time()
+                for done, future in enumerate(as_completed(futures), start=1):
+                    swf_file: Path = futures[future]
+                    bin_file: Path = binary_patches[swf_file]
+                    try:
+                        try:
+                            future.result()
+                        except NotImplementedError as ex:
+                            self.log.debug(f"Falling back to xdelta: {ex}")
+                            self.xdelta_interface.run_xdelta(swf_file, bin_file)
+                        except BrokenExecutor as ex:
+                            self.log.warning(
+                                f"Process pool failed, patching '{swf_file}' "
+                                f"serially: {ex}"
+                            )
+                            self.xdelta_interface.patch_file(swf_file, bin_file)
+                            self.__complete(swf_file, Patcher.STAGE_BINARY)
+                            continue
+
+                        self.xdelta_interface.replace_original(swf_file)
+                        self.__complete(swf_file, Patcher.STAGE_BINARY)
+                    except Exception as ex:
+                        errors[swf_file] = ex
+                    finally:
+                        self.log.debug(
+                            f"Binary patches done: {done}/{len(binary_patches)}"
+                        )
+                        # the files are decoded concurrently, so only the time since
+                        # the start of the pool is known
+                        self.progress.advance(
+                            swf_file, duration=time.time() - start_time
+                        )
+        else:
+            for swf_file, bin_file in binary_patches.items():
+                try:
+                    with (
+                        self.progress.file(swf_file),
+                        self.__step(swf_file, Patcher.STAGE_BINARY),
+                    ):
+                        self.xdelta_interface.patch_file(swf_file, bin_file)
+                except Exception as ex:
+                    errors[swf_file] = ex
+
+        if errors:
+            for swf_file, error in errors.items():
+                self.log.error(f"Failed to apply binary patch to '{swf_file}': {error}")
+
+            raise ExceptionGroup(
+                f"Failed to apply {len(errors)} binary patch(es).",
+                list(errors.values()),
+            )
 
         self.log.info("Binary patches applied.")
 
+    def __get_binary_patch_workers(self, swf_files: list[Path]) -> int:
+        """
+        Determines the number of processes for applying binary patches from the
+        config, the number of CPUs and the size of the files to patch.
+
+        Args:
+            swf_files (list[Path]): The files to patch.
+
+        Returns:
+            int: The number of processes, 1 if the patches should be applied serially
+        """
+
+        if self.config.binary_patch_workers > 0:
+            return min(self.config.binary_patch_workers, len(swf_files))
+
+        sizes: list[int] = [
+            os.path.getsize(swf_file) for swf_file in swf_files if is_file(swf_file)
+        ]
+
+        # starting the processes takes longer than decoding small files
+        if len(sizes) < 2 or sum(sizes) < Patcher.PARALLEL_BINARY_PATCH_SIZE:
+            return 1
+
+        # each process holds about two copies of the file it patches
+        memory_limit: int = Patcher.BINARY_PATCH_MEMORY // (2 * max(sizes))
+
+        return max(1, min(os.cpu_count() or 1, len(sizes), memory_limit))
+
+    @staticmethod
+    def get_original_file_paths(
+        patches: list[Patch], folder: Optional[Path] = None
+    ) -> list[Path]:
+        """
+        Returns the paths of the original files patched by the specified patches. Files
+        patched by multiple patches are only returned once.
+
+        Args:
+            patches (list[Patch]): The patches, in load order.
+            folder (Optional[Path], optional):
+                Folder the paths are made absolute to. Defaults to None.
+
+        Returns:
+            list[Path]: The paths of the original files, in load order.
+        """
+
+        original_file_paths: list[Path] = list(
+            dict.fromkeys(
+                file.original_file_path for patch in patches for file in patch.files
+            )
+        )
+
+        if folder is not None:
+            return [folder / path for path in original_file_paths]
+
+        return original_file_paths
+
+    def __plan_stages(self, patches: list[Patch]) -> None:
+        """
+        Announces the stages of a run with their numbers of files to the progress
+        reporter, so that they are included in the ETA from the start.
+
+        Args:
+            patches (list[Patch]): The patches of the run.
+        """
+
+        json_files: int = len(Patcher.group_json_files(patches))
+        stages: dict[str, int] = {
+            Patcher.STAGE_JRE: 1 if json_files else 0,
+            Patcher.STAGE_PREPARE: sum(len(patch.files) for patch in patches),
+            Patcher.STAGE_SHAPES: len(
+                [file for patch in patches for file in patch.files if file.shapes]
+            ),
+            Patcher.STAGE_SWF2XML: json_files,
+            Patcher.STAGE_PATCH_XMLS: json_files,
+            Patcher.STAGE_XML2SWF: json_files,
+            Patcher.STAGE_BINARY: len(
+                [
+                    file
+                    for patch in patches
+                    for file in patch.files
+                    if file.type == PatchType.Binary
+                ]
+            ),
+            Patcher.STAGE_FINALIZE: len(Patcher.get_original_file_paths(patches)),
+        }
+
+        for stage, items in stages.items():
+            self.progress.plan(stage, items)
+
+    def cancel(self) -> None:
+        """
+        Cancels the current run before its next stage. The run raises a
+        `PatchCancelledError` and is resumed from its checkpoint when it's run again.
+        """
+
+        self.log.info("Cancelling after the current stage...")
+        self.__cancel_event.set()
+
+    def __check_cancelled(self) -> None:
+        """
+        Raises a `PatchCancelledError` if the current run was cancelled.
+        """
+
+        if self.__cancel_event.is_set():
+            self.__cancel_event.clear()
+            raise PatchCancelledError("Patching was cancelled.")
+
+    def __get_checkpoint_key(self, file: Path) -> Optional[str]:
+        """
+        Returns the key of a file in the work folder in the checkpoint of the current
+        run. An XML file shares the key of its SWF file.
+
+        Args:
+            file (Path): The file in the work folder.
+
+        Returns:
+            Optional[str]: The key or None if there is no checkpoint.
+        """
+
+        if self.__checkpoint is None:
+            return None
+
+        return file.relative_to(self.__checkpoint.folder).with_suffix(".swf").as_posix()
+
+    def __is_done(self, file: Path, stage: str) -> bool:
+        """
+        Checks if a stage was already completed for a file by an interrupted run.
+
+        Args:
+            file (Path): The file in the work folder.
+            stage (str): The name of the stage.
+
+        Returns:
+            bool: Whether the stage can be skipped for the file.
+        """
+
+        key: Optional[str] = self.__get_checkpoint_key(file)
+
+        return (
+            key is not None
+            and self.__checkpoint is not None
+            and self.__checkpoint.is_done(key, stage)
+        )
+
+    def __start(self, file: Path, stage: str) -> None:
+        """
+        Records that a stage was started for a file in the checkpoint, if any.
+
+        Args:
+            file (Path): The file in the work folder.
+            stage (str): The name of the stage.
+        """
+
+        key: Optional[str] = self.__get_checkpoint_key(file)
+
+        if key is not None and self.__checkpoint is not None:
+            self.__checkpoint.start(key, stage)
+
+    def __complete(self, file: Path, stage: str) -> None:
+        """
+        Records that a stage was completed for a file in the checkpoint, if any.
+
+        Args:
+            file (Path): The file in the work folder.
+            stage (str): The name of the stage.
+        """
+
+        key: Optional[str] = self.__get_checkpoint_key(file)
+
+        if key is not None and self.__checkpoint is not None:
+            self.__checkpoint.complete(key, stage)
+
+    @contextmanager
+    def __step(self, file: Path, stage: str) -> Generator[None, None, None]:
+        """
+        Context manager that records a stage of a file in the checkpoint of the current
+        run, if any.
+
+        Args:
+            file (Path): The file in the work folder.
+            stage (str): The name of the stage.
+        """
+
+        self.__start(file, stage)
+        yield
+        self.__complete(file, stage)
+
+    def __resume(
+        self, patches: list[Patch], original_mod_path: Path, work_folder: Path
+    ) -> None:
+        """
+        Compares the checkpoint of the current run with the inputs of each original
+        file and removes the intermediate files of files that have to start from
+        scratch.
+
+        Args:
+            patches (list[Patch]): The patches of the run.
+            original_mod_path (Path): The path to the original mod.
+            work_folder (Path): The work folder of the run.
+        """
+
+        if self.__checkpoint is None:
+            return
+
+        inputs: dict[str, str] = {}
+        for original_file_path in Patcher.get_original_file_paths(patches):
+            bsa_file, mod_file = split_path_with_bsa(original_file_path)
+            original_file: Path = original_mod_path / (
+                bsa_file.name if bsa_file else mod_file or ""
+            )
+
+            # the patch files and shapes are small, so they're compared by content
+            patch_files: list[Path] = []
+            for patch in patches:
+                for file in patch.files:
+                    if file.original_file_path == original_file_path:
+                        patch_files.append(patch.patch_folder_path / file.path)
+                        patch_files.extend(
+                            patch.shapes_folder_path / shape for shape in file.shapes
+                        )
+
+            inputs[original_file_path.as_posix()] = Checkpoint.get_inputs_digest(
+                [original_file], patch_files
+            )
+
+        for file in self.__checkpoint.resume(inputs):
+            for path in [work_folder / file, (work_folder / file).with_suffix(".xml")]:
+                path.unlink(missing_ok=True)
+                invalidate(path)
+
     def patch(self, patch_path: Path, original_mod_path: Path) -> float:
         """
-        Patches mod through following process:
+        Patches mod with a single patch. See `patch_all()` for the process.
+
+        Args:
+            patch_path: Path to the patch file.
+            original_mod_path: Path to the original mod file.
+
+        Returns:
+            float: duration in seconds
+        """
+
+        self.__cancel_event.clear()
+
+        return self.patch_all([patch_path], original_mod_path)
+
+    def patch_all(self, patch_paths: list[Path], original_mod_path: Path) -> float:
+        """
+        Patches mod with one or more patches through following process:
 
         0. Load patch data
         1. Setup JRE if required
@@ -465,54 +1158,239 @@ class Patcher:
         7. Apply binary patches with xdelta
         8. Copy patched files back to current directory and repack BSAs if enabled
 
+        SWF files that are patched by multiple patches are converted to XML and back
+        only once and the patches are applied in the specified order.
+
+        The completed stages of each file are recorded in a checkpoint in a persistent
+        work folder, so that a run that is cancelled or interrupted is resumed from
+        there when it's run again with unchanged inputs. A cancelled run stops before
+        its next stage.
+
         Args:
-            patch_path: Path to the patch file.
+            patch_paths: Paths to the patch files, in load order.
             original_mod_path: Path to the original mod file.
 
+        Raises:
+            ValueError: When a file is patched by a binary patch and another patch.
+            PatchCancelledError: When the run was cancelled.
+
         Returns:
             float: duration in seconds
         """
 
-        self.log.info("Patching mod...")
+        self.log.info(
+            "Patching mod..."
+            if len(patch_paths) == 1
+            else f"Patching mod with {len(patch_paths)} patches..."
+        )
 
         start_time: float = time.time()
-        temp_folder: Path = self.get_tmp_dir()
+        # folders may have been deleted since the last run
+        forget_folders()
 
-        # 0. Load patch data
-        patch: Patch = Patch.load(patch_path)
+        # every combination of patches, original mod and output gets its own work
+        # folder, that is kept until the run is completed
+        temp_folder: Path = Patcher.WORK_PATH / Checkpoint.get_key(
+            *patch_paths,
+            original_mod_path,
+            self.config.output_folder or self.cwd_path.parent,
+            self.config.repack_bsas,
+        )
+        Checkpoint.prune(Patcher.WORK_PATH, keep=temp_folder)
+        checkpoint = Checkpoint(temp_folder)
+        self.__checkpoint = checkpoint
+
+        self.progress.start_run()
+        try:
+            with (
+                trace.span("patch", "run", patches=len(patch_paths)),
+                cached_stats(),
+            ):
+                # 0. Load patch data
+                patches: list[Patch] = [
+                    Patch.load(
+                        patch_path, lazy=True, workers=self.config.patch_load_workers
+                    )
+                    for patch_path in patch_paths
+                ]
+                Patcher.check_binary_patches(patches)
+                self.__resume(patches, original_mod_path, temp_folder)
+                self.__plan_stages(patches)
+
+                json_files: list[Path] = list(Patcher.group_json_files(patches))
+                binary_files: list[Path] = [
+                    temp_folder / file.original_file_path
+                    for patch in patches
+                    for file in patch.files
+                    if file.type == PatchType.Binary
+                ]
+
+                # 1. Setup JRE if required
+                self.__check_cancelled()
+                if json_files:
+                    with self.progress.stage(Patcher.STAGE_JRE, items=1):
+                        self.ffdec_interface.setup_jre(self.get_tmp_dir() / "jre")
+
+                # 2. Copy original mod files to patch and extract BSAs if required
+                self.__check_cancelled()
+                with self.progress.stage(
+                    Patcher.STAGE_PREPARE,
+                    items=sum(len(patch.files) for patch in patches),
+                ):
+                    for patch in patches:
+                        self.prepare_files(patch, original_mod_path, temp_folder)
+
+                # 3. Patch shapes
+                self.__check_cancelled()
+                shape_files: list[Path] = list(
+                    dict.fromkeys(
+                        temp_folder / file.original_file_path
+                        for patch in patches
+                        for file in patch.files
+                        if file.shapes
+                    )
+                )
+                done_shape_files: set[Path] = {
+                    file
+                    for file in shape_files
+                    if self.__is_done(file, Patcher.STAGE_SHAPES)
+                }
+                with self.progress.stage(Patcher.STAGE_SHAPES, shape_files):
+                    # the shapes of a file may be patched by multiple patches, so
+                    # they're only recorded as completed once all patches are done
+                    for file in shape_files:
+                        if file not in done_shape_files:
+                            self.__start(file, Patcher.STAGE_SHAPES)
+
+                    for patch in patches:
+                        Patcher.patch_shapes(
+                            patch,
+                            temp_folder,
+                            self.ffdec_interface,
+                            self.progress,
+                            done_shape_files,
+                        )
+
+                    for file in shape_files:
+                        self.__complete(file, Patcher.STAGE_SHAPES)
+
+                # 4. Convert SWFs to XMLs
+                self.__check_cancelled()
+                with self.progress.stage(
+                    Patcher.STAGE_SWF2XML, [temp_folder / file for file in json_files]
+                ):
+                    self.convert_swfs2xmls(patches, temp_folder)
+
+                xml_files: list[Path] = [
+                    temp_folder / file.with_suffix(".xml") for file in json_files
+                ]
+
+                # 5. Patch XMLs
+                self.__check_cancelled()
+                with self.progress.stage(Patcher.STAGE_PATCH_XMLS, xml_files):
+                    self.patch_xmls(patches, temp_folder)
+
+                # 6. Convert XMLs back to SWFs
+                self.__check_cancelled()
+                with self.progress.stage(Patcher.STAGE_XML2SWF, xml_files):
+                    self.convert_xmls2swfs(patches, temp_folder)
+
+                # 7. Apply binary patches with xdelta
+                self.__check_cancelled()
+                with self.progress.stage(Patcher.STAGE_BINARY, binary_files):
+                    for patch in patches:
+                        self.apply_binary_patches(patch, temp_folder)
+
+                # 8. Copy patched files back to current directory and repack BSAs if
+                # enabled
+                self.__check_cancelled()
+                with self.progress.stage(
+                    Patcher.STAGE_FINALIZE,
+                    Patcher.get_original_file_paths(patches, temp_folder),
+                ):
+                    self.finish_patching(patches, temp_folder, original_mod_path)
+        finally:
+            self.progress.finish_run()
+            self.__checkpoint = None
+
+        checkpoint.finish(keep_files=self.config.debug_mode)
+        if not self.config.debug_mode:
+            forget_folders(temp_folder)
 
-        # 1. Setup JRE if required
-        if any(file for file in patch.files if file.type == PatchType.Json):
-            self.ffdec_interface.setup_jre(temp_folder)
+        duration: float = time.time() - start_time
+        self.log.info(f"Patching complete in {duration:.3f} second(s).")
 
-        # 2. Copy original mod files to patch and extract BSAs if required
-        self.prepare_files(patch, original_mod_path, temp_folder)
+        return duration
 
-        # 3. Patch shapes
-        Patcher.patch_shapes(patch, temp_folder, self.ffdec_interface)
+    def patch_batch(self, items: list[BatchItem]) -> list[BatchResult]:
+        """
+        Runs multiple patches in one session. The extracted Java Runtime, the indices of
+        opened BSAs and the XML conversions of identical SWF files are shared between
+        the patches. Patches for the same original mod that patch the same files are run
+        together with `patch_all()`, so that they don't overwrite each other's output.
+        A failed patch does not stop the batch but fails the patches it's run with.
+        Cancelling stops the whole batch.
 
-        # 4. Convert SWFs to XMLs
-        self.convert_swfs2xmls(patch, temp_folder)
+        Args:
+            items (list[BatchItem]): The patches to run, in load order.
 
-        # 5. Patch XMLs
-        self.patch_xmls(patch, temp_folder)
+        Raises:
+            PatchCancelledError: When the batch was cancelled.
 
-        # 6. Convert XMLs back to SWFs
-        self.convert_xmls2swfs(patch, temp_folder)
+        Returns:
+            list[BatchResult]: The result of each patch.
+        """
 
-        # 7. Apply binary patches with xdelta
-        self.apply_binary_patches(patch, temp_folder)
+        groups: list[list[BatchItem]] = Batch.group(items)
+        self.log.info(
+            f"Running batch of {len(items)} patch(es) in {len(groups)} run(s)..."
+        )
 
-        # 8. Copy patched files back to current directory and repack BSAs if enabled
-        self.finish_patching(patch, temp_folder, original_mod_path)
+        batch_start_time: float = time.time()
+        results: list[BatchResult] = []
+        self.__cancel_event.clear()
+        self.__xml_cache = {}
+        try:
+            for i, group in enumerate(groups, start=1):
+                self.log.info(
+                    f"Running {i}/{len(groups)}: "
+                    + ", ".join(f"'{item.patch}'" for item in group)
+                    + "..."
+                )
 
-        duration: float = time.time() - start_time
-        self.log.info(f"Patching complete in {duration:.3f} second(s).")
+                start_time: float = time.time()
+                try:
+                    duration: float = self.patch_all(
+                        [item.patch for item in group], group[0].original
+                    )
+                    results.extend(
+                        BatchResult(item=item, duration=duration) for item in group
+                    )
+                except PatchCancelledError:
+                    raise
+                except Exception as ex:
+                    self.log.error(f"Failed to patch: {ex}", exc_info=ex)
+                    results.extend(
+                        BatchResult(
+                            item=item, duration=time.time() - start_time, error=str(ex)
+                        )
+                        for item in group
+                    )
+        finally:
+            self.__xml_cache = None
 
-        return duration
+        # report the results in the order of the batch
+        results.sort(key=lambda result: items.index(result.item))
+        self.log.info(
+            "Batch complete:\n"
+            + Batch.get_summary(results, time.time() - batch_start_time)
+        )
+
+        return results
 
     def clean(self) -> None:
         if self.tmp_path is not None and is_dir(self.tmp_path):
             shutil.rmtree(self.tmp_path, ignore_errors=True)
+            forget_folders(self.tmp_path)
             self.tmp_path = None
             self.log.info("Removed temporary folder.")
@@ -0,0 +1,112 @@
+"""
+Copyright (c) Cutleast
+"""
+
+import os
+from collections.abc import Callable
+from pathlib import Path
+from threading import Event
+from typing import Optional
+
+type FileStamp = tuple[int, int]
+"""Modification time in nanoseconds and size of a file."""
+
+
+class FileWatcher:
+    """
+    Polls the modification times and sizes of files and reports the files that changed.
+
+    A changed file is only reported once its stamp didn't change for one poll, since
+    the program that saves it may still be writing it. Files that can't be accessed
+    are treated as unchanged until they can be accessed again.
+    """
+
+    files: dict[Path, Path]
+    """Maps the keys of the watched files to their paths."""
+
+    __stamps: dict[Path, Optional[FileStamp]]
+    """The stamps of the files when they were last reported or started watching."""
+
+    __pending: dict[Path, FileStamp]
+    """The stamps of the changed files that weren't stable for one poll yet."""
+
+    def __init__(self, files: dict[Path, Path]) -> None:
+        """
+        Args:
+            files (dict[Path, Path]):
+                Maps keys of the files, for example the paths of their patch files, to
+                the paths of the files to watch.
+        """
+
+        self.files = files
+        self.__stamps = {
+            key: FileWatcher.get_stamp(path) for key, path in files.items()
+        }
+        self.__pending = {}
+
+    def poll(self) -> list[Path]:
+        """
+        Checks the files for changes.
+
+        Returns:
+            list[Path]: The keys of the files that changed and are stable.
+        """
+
+        changed: list[Path] = []
+
+        for key, path in self.files.items():
+            stamp: Optional[FileStamp] = FileWatcher.get_stamp(path)
+
+            if stamp is None or stamp == self.__stamps[key]:
+                self.__pending.pop(key, None)
+                continue
+
+            # wait until the file didn't change for one poll since FFDec may still be
+            # writing it
+            if self.__pending.get(key) != stamp:
+                self.__pending[key] = stamp
+                continue
+
+            del self.__pending[key]
+            self.__stamps[key] = stamp
+            changed.append(key)
+
+        return changed
+
+    def watch(
+        self, stop: Event, interval: float, callback: Callable[[Path], None]
+    ) -> None:
+        """
+        Polls the files in the specified interval and calls the callback for each
+        changed file until the stop event is set.
+
+        Args:
+            stop (Event): Event that stops watching after the current poll.
+            interval (float): Interval in seconds.
+            callback (Callable[[Path], None]):
+                Called with the key of each changed file. Exceptions are propagated.
+        """
+
+        while not stop.wait(interval):
+            for key in self.poll():
+                callback(key)
+
+    @staticmethod
+    def get_stamp(path: Path) -> Optional[FileStamp]:
+        """
+        Returns the modification time and size of a file or None if the file could not
+        be accessed, for example because it is currently written.
+
+        Args:
+            path (Path): Path to the file.
+
+        Returns:
+            Optional[FileStamp]: Modification time in nanoseconds and size
+        """
+
+        try:
+            stat: os.stat_result = os.stat(path)
+        except OSError:
+            return None
+
+        return stat.st_mtime_ns, stat.st_size
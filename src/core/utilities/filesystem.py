@@ -8,16 +8,45 @@ See this issue for more information:
 Importing this module will also patch
 - `os.makedirs()`
 - `Path.is_file()`
+
+Qt is only used for checking paths if it's already imported by the GUI, so that the
+patcher can run headless without loading it.
 """
 
+import logging
 import os
+import stat
+import sys
+import threading
+from collections.abc import Generator
+from contextlib import contextmanager
 from pathlib import Path
+from typing import TYPE_CHECKING, Optional
+
+from .glob import cached_listings, invalidate_listings
+
+if TYPE_CHECKING:
+    from PySide6.QtCore import QDir, QFile
+
+log: logging.Logger = logging.getLogger("Filesystem")
 
-from cutleast_core_lib.core.utilities.process_runner import run_process
-from PySide6.QtCore import QDir, QFile
+__native_makedirs = os.makedirs
+"""The original `os.makedirs()` before it's patched by this module."""
 
+__use_mkdir_process: bool = False
+"""Whether folders are created with the `mkdir` command instead of natively."""
 
-def file_path_to_qpath(path: str | Path) -> QFile:
+__known_folders: set[Path] = set()
+"""Folders that were already created or found to exist."""
+
+__stat_cache = threading.local()
+"""
+Per-thread cache of path types, enabled by `cached_stats()`. Its `entries` map paths to
+True for folders, False for files and None for missing paths.
+"""
+
+
+def file_path_to_qpath(path: str | Path) -> "QFile":
     """
     Creates a `QFile` from a file path.
 
@@ -28,10 +57,12 @@ def file_path_to_qpath(path: str | Path) -> QFile:
         QFile: QFile object
     """
 
+    from PySide6.QtCore import QFile
+
     return QFile(str(path))
 
 
-def folder_path_to_qpath(path: str | Path) -> QDir:
+def folder_path_to_qpath(path: str | Path) -> "QDir":
     """
     Creates a `QDir` from a folder path.
 
@@ -42,6 +73,8 @@ def folder_path_to_qpath(path: str | Path) -> QDir:
         QDir: QDir object
     """
 
+    from PySide6.QtCore import QDir
+
     return QDir(str(path))
 
 
@@ -57,7 +90,7 @@ def is_dir(path: Path) -> bool:
         bool: True if the path exists, False otherwise
     """
 
-    return folder_path_to_qpath(path).exists()
+    return __get_path_type(path) is True
 
 
 def is_file(path: Path) -> bool:
@@ -72,17 +105,106 @@ def is_file(path: Path) -> bool:
         bool: True if the path exists, False otherwise
     """
 
-    qfile: QFile = file_path_to_qpath(path)
+    return __get_path_type(path) is False
+
+
+@contextmanager
+def cached_stats() -> Generator[None, None, None]:
+    """
+    Caches the results of `is_dir()` and `is_file()` and the directory listings of
+    `glob()` in the current thread until the outermost `cached_stats()` context is left.
+    Paths that are written, moved or deleted within the context must be passed to
+    `invalidate()`.
+    """
+
+    entries: Optional[dict[Path, Optional[bool]]] = getattr(
+        __stat_cache, "entries", None
+    )
+    if entries is not None:
+        yield
+        return
 
-    return not is_dir(path) and qfile.exists()
+    __stat_cache.entries = {}
+    try:
+        with cached_listings():
+            yield
+    finally:
+        __stat_cache.entries = None
+
+
+def invalidate(path: Path, recursive: bool = False) -> None:
+    """
+    Removes a path from the stat cache and the listing of its parent folder from the
+    listing cache of the current thread after it was written, moved or deleted.
+
+    Args:
+        path (Path): Path to remove
+        recursive (bool, optional):
+            Whether to also remove all paths in the specified folder. Defaults to False.
+    """
+
+    entries: Optional[dict[Path, Optional[bool]]] = getattr(
+        __stat_cache, "entries", None
+    )
+    if entries is None:
+        return
+
+    entries.pop(path, None)
+    invalidate_listings(path.parent)
+    invalidate_listings(path, recursive)
+
+    if recursive:
+        for cached_path in [p for p in entries if p.is_relative_to(path)]:
+            del entries[cached_path]
+
+
+def __get_path_type(path: Path) -> Optional[bool]:
+    """
+    Returns whether a path is a folder, a file or doesn't exist. Uses the stat cache
+    of the current thread, if enabled.
+
+    Args:
+        path (Path): Path to check
+
+    Returns:
+        Optional[bool]: True if it's a folder, False if it's a file, None otherwise
+    """
+
+    entries: Optional[dict[Path, Optional[bool]]] = getattr(
+        __stat_cache, "entries", None
+    )
+    if entries is not None and path in entries:
+        return entries[path]
+
+    path_type: Optional[bool]
+    try:
+        path_type = stat.S_ISDIR(os.stat(path).st_mode)
+    except OSError:
+        # os.stat() may not see paths in MO2's VFS, so they are checked with Qt,
+        # unless running headless
+        if "PySide6.QtCore" not in sys.modules:
+            path_type = None
+        elif folder_path_to_qpath(path).exists():
+            path_type = True
+        elif file_path_to_qpath(path).exists():
+            path_type = False
+        else:
+            path_type = None
+
+    if entries is not None:
+        entries[path] = path_type
+
+    return path_type
 
 
 def mkdir(path: Path) -> None:
     """
-    Creates a directory. Doesn't use `Path.mkdir()` since
-    its known to be broken with Win 11 24H2.
+    Creates a directory with `os.makedirs()` and falls back to the `mkdir` command if
+    the created folder isn't visible, which is the case with MO2 and Win 11 24H2.
+    Once the fallback was needed, the command is used for all further folders.
 
-    Does nothing if the specified path is already an existing folder.
+    Does nothing if the specified path is already an existing folder. Created and
+    existing folders are remembered until `forget_folders()` is called for them.
 
     Raises:
         FileExistsError: If the specified path is already a file
@@ -91,10 +213,58 @@ def mkdir(path: Path) -> None:
         path (Path): Path to create
     """
 
-    if not is_dir(path) and not is_file(path):
-        run_process(["mkdir", str(path).replace("/", "\\")])
-    elif is_file(path):
-        raise FileExistsError(f"{str(path)!r} already exists!")
+    global __use_mkdir_process
+
+    if path in __known_folders:
+        return
+
+    if not is_dir(path):
+        if is_file(path):
+            raise FileExistsError(f"{str(path)!r} already exists!")
+
+        if not __use_mkdir_process:
+            try:
+                __native_makedirs(path, exist_ok=True)
+            except OSError as ex:
+                log.debug(f"Failed to create folder {str(path)!r} natively: {ex}")
+
+        invalidate(path)
+        for parent in path.parents:
+            invalidate(parent)
+
+        if not is_dir(path):
+            if not __use_mkdir_process:
+                log.warning(
+                    "Creating folders natively failed, falling back to the mkdir "
+                    "command for all further folders."
+                )
+                __use_mkdir_process = True
+
+            from cutleast_core_lib.core.utilities.process_runner import run_process
+
+            run_process(["mkdir", str(path).replace("/", "\\")])
+            invalidate(path)
+
+    __known_folders.add(path)
+
+
+def forget_folders(path: Optional[Path] = None) -> None:
+    """
+    Forgets the specified folder and all remembered folders in it, for example after
+    it was deleted. The folder is also removed from the stat cache.
+
+    Args:
+        path (Optional[Path], optional):
+            Path to the folder. Forgets all folders if None. Defaults to None.
+    """
+
+    if path is None:
+        __known_folders.clear()
+    else:
+        __known_folders.difference_update(
+            [folder for folder in __known_folders if folder.is_relative_to(path)]
+        )
+        invalidate(path, recursive=True)
 
 
 def __makedirs(path, *args, **kwargs) -> None:  # pyright: ignore[reportMissingParameterType]
@@ -1,50 +1,254 @@
 """
 Copyright (c) Cutleast
 
-This module contains a workaround function for MO2 and Win 11 24H2.
-See this issue for more information:
+This module contains a glob function with two backends:
+- an `os.scandir()`-based implementation that caches directory listings per run
+- a C++ implementation (`res/glob.dll`) to workaround issues with MO2's VFS on
+  Windows 11 24H2. See this issue for more information:
     https://github.com/ModOrganizer2/modorganizer/issues/2174
 """
 
 import ctypes
+import logging
 import os
+import re
+import sys
+import threading
+from collections.abc import Generator, Iterable
+from contextlib import contextmanager
+from enum import StrEnum
 from pathlib import Path
+from typing import Optional
 
-from cutleast_core_lib.core.utilities.exe_info import get_current_path
-
-lib = ctypes.CDLL(os.path.join(get_current_path(), "res", "glob.dll"))
+log: logging.Logger = logging.getLogger("Glob")
 
 ENCODING: str = "cp1252"
 """
 The encoding used by the underlying C++ code.
 """
 
-# Define function signatures
-lib.glob_cpp.argtypes = [
-    ctypes.POINTER(ctypes.c_char),
-    ctypes.POINTER(ctypes.c_char),
-    ctypes.c_bool,
-    ctypes.POINTER(ctypes.c_size_t),
-]
-lib.glob_cpp.restype = ctypes.POINTER(ctypes.c_char_p)
-lib.glob_clear.argtypes = []
-lib.glob_clear.restype = None
 
+class GlobBackend(StrEnum):
+    """
+    Enum for the available glob backends.
+    """
+
+    Auto = "auto"
+    """Uses the DLL when running in MO2's VFS and scandir otherwise."""
+
+    Scandir = "scandir"
+    """Pure Python implementation based on `os.scandir()`."""
+
+    Dll = "dll"
+    """C++ implementation in `res/glob.dll`. Only available on Windows."""
+
+
+__backend: GlobBackend = GlobBackend.Auto
+__lib: Optional[ctypes.CDLL] = None
+__mo2_vfs: Optional[bool] = None
+
+__listing_cache = threading.local()
+"""
+Per-thread cache of directory listings, enabled by `cached_listings()`. Its `entries`
+map folders to lists of their entries' names and whether they are files or folders.
+"""
+
+
+def set_backend(backend: GlobBackend) -> None:
+    """
+    Sets the backend used by `glob()`.
+
+    Args:
+        backend (GlobBackend): The backend to use.
+    """
+
+    global __backend
+
+    __backend = backend
 
-def glob(path: Path, pattern: str, recursive: bool = True) -> list[Path]:
+
+def get_backend() -> GlobBackend:
+    """
+    Returns the backend that is actually used by `glob()`, with `GlobBackend.Auto`
+    resolved.
+
+    Returns:
+        GlobBackend: The used backend
     """
-    A glob.glob-like function that is implemented in C++ to workaround issues with MO2's
-    VFS on Windows 11 24H2.
+
+    if __backend == GlobBackend.Auto:
+        return GlobBackend.Dll if __is_mo2_vfs() else GlobBackend.Scandir
+
+    return __backend
+
+
+def glob(
+    path: Path, pattern: str | Iterable[str], recursive: bool = True
+) -> list[Path]:
+    """
+    A glob.glob-like function that matches the file names of all files in a folder
+    against one or more patterns in a single walk.
+
+    Only regular files are returned. Patterns support `*` and `?` as wildcards and
+    are matched against the file names only, like the C++ implementation does.
 
     Args:
         path (Path): Base path to search in.
-        pattern (str): Glob pattern.
+        pattern (str | Iterable[str]): Glob pattern or several glob patterns.
         recursive (bool, optional): Whether to search recursively. Defaults to True.
 
     Returns:
-        list[str]: List of matching filenames
+        list[Path]: List of files matching any of the patterns
+    """
+
+    patterns: list[str] = [pattern] if isinstance(pattern, str) else list(pattern)
+
+    if get_backend() == GlobBackend.Dll:
+        # the DLL only supports one pattern per walk
+        results: dict[Path, None] = {}
+        for p in patterns:
+            results.update(dict.fromkeys(__glob_dll(path, p, recursive)))
+
+        return list(results)
+
+    regex: re.Pattern[str] = re.compile(
+        "|".join(f"(?:{__pattern_to_regex(p)})" for p in patterns)
+    )
+
+    return __glob_scandir(path, regex, recursive)
+
+
+@contextmanager
+def cached_listings() -> Generator[None, None, None]:
+    """
+    Caches the directory listings of the scandir backend in the current thread until
+    the outermost `cached_listings()` context is left. Folders that are changed within
+    the context must be passed to `invalidate_listings()`.
+    """
+
+    if getattr(__listing_cache, "entries", None) is not None:
+        yield
+        return
+
+    __listing_cache.entries = {}
+    try:
+        yield
+    finally:
+        __listing_cache.entries = None
+
+
+def invalidate_listings(path: Path, recursive: bool = False) -> None:
+    """
+    Removes the listing of a folder from the listing cache of the current thread.
+
+    Args:
+        path (Path): Path to the folder
+        recursive (bool, optional):
+            Whether to also remove the listings of all folders in the specified folder.
+            Defaults to False.
+    """
+
+    entries: Optional[dict[Path, list[tuple[str, bool, bool]]]] = getattr(
+        __listing_cache, "entries", None
+    )
+    if entries is None:
+        return
+
+    entries.pop(path, None)
+
+    if recursive:
+        for folder in [f for f in entries if f.is_relative_to(path)]:
+            del entries[folder]
+
+
+def __pattern_to_regex(pattern: str) -> str:
+    """
+    Converts a glob pattern to a regex pattern the same way the C++ implementation
+    does. Characters other than `*`, `?` and `.` are used as they are.
+
+    Args:
+        pattern (str): Glob pattern
+
+    Returns:
+        str: Regex pattern
     """
 
+    return pattern.replace(".", r"\.").replace("*", ".*").replace("?", ".")
+
+
+def __glob_scandir(path: Path, regex: re.Pattern[str], recursive: bool) -> list[Path]:
+    """
+    Walks a folder with `os.scandir()` and returns the files whose names fully match
+    the specified regex. Symlinked folders are not followed.
+
+    Args:
+        path (Path): Base path to search in.
+        regex (re.Pattern[str]): Regex the file names have to match.
+        recursive (bool): Whether to search recursively.
+
+    Returns:
+        list[Path]: List of matching files, in the order they were found
+    """
+
+    results: list[Path] = []
+
+    def walk(folder: Path) -> None:
+        for name, is_file, is_dir in __list_folder(folder):
+            if is_file and regex.fullmatch(name):
+                results.append(folder / name)
+            elif is_dir and recursive:
+                walk(folder / name)
+
+    walk(path)
+
+    return results
+
+
+def __list_folder(folder: Path) -> list[tuple[str, bool, bool]]:
+    """
+    Lists the entries of a folder. Uses the listing cache of the current thread, if
+    enabled.
+
+    Args:
+        folder (Path): Path to the folder
+
+    Returns:
+        list[tuple[str, bool, bool]]:
+            Names of the entries and whether they are regular files or real folders
+    """
+
+    entries: Optional[dict[Path, list[tuple[str, bool, bool]]]] = getattr(
+        __listing_cache, "entries", None
+    )
+    if entries is not None and folder in entries:
+        return entries[folder]
+
+    with os.scandir(folder) as it:
+        listing: list[tuple[str, bool, bool]] = [
+            (entry.name, entry.is_file(), entry.is_dir(follow_symlinks=False))
+            for entry in it
+        ]
+
+    if entries is not None:
+        entries[folder] = listing
+
+    return listing
+
+
+def __glob_dll(path: Path, pattern: str, recursive: bool) -> list[Path]:
+    """
+    Runs the C++ implementation of glob.
+
+    Args:
+        path (Path): Base path to search in.
+        pattern (str): Glob pattern.
+        recursive (bool): Whether to search recursively.
+
+    Returns:
+        list[Path]: List of matching filenames
+    """
+
+    lib: ctypes.CDLL = __get_lib()
     count = ctypes.c_size_t()
 
     encoded_path: bytes = str(path).encode(ENCODING)
@@ -59,3 +263,62 @@ def glob(path: Path, pattern: str, recursive: bool = True) -> list[Path]:
     ]
 
     return results
+
+
+def __get_lib() -> ctypes.CDLL:
+    """
+    Loads `res/glob.dll` on first use.
+
+    Returns:
+        ctypes.CDLL: The loaded library
+    """
+
+    global __lib
+
+    if __lib is None:
+        from cutleast_core_lib.core.utilities.exe_info import get_current_path
+
+        lib = ctypes.CDLL(os.path.join(get_current_path(), "res", "glob.dll"))
+
+        # Define function signatures
+        lib.glob_cpp.argtypes = [
+            ctypes.POINTER(ctypes.c_char),
+            ctypes.POINTER(ctypes.c_char),
+            ctypes.c_bool,
+            ctypes.POINTER(ctypes.c_size_t),
+        ]
+        lib.glob_cpp.restype = ctypes.POINTER(ctypes.c_char_p)
+        lib.glob_clear.argtypes = []
+        lib.glob_clear.restype = None
+
+        log.debug("Loaded glob.dll.")
+        __lib = lib
+
+    return __lib
+
+
+def __is_mo2_vfs() -> bool:
+    """
+    Checks whether DIP runs in MO2's VFS by looking for the injected usvfs library.
+    The result is cached since the library can't be injected later on.
+
+    Returns:
+        bool: True if the usvfs library is loaded, False otherwise
+    """
+
+    global __mo2_vfs
+
+    if __mo2_vfs is None:
+        if sys.platform == "win32":
+            kernel32 = ctypes.WinDLL("kernel32")  # pyright: ignore[reportAttributeAccessIssue]
+            __mo2_vfs = any(
+                kernel32.GetModuleHandleW(name)
+                for name in ("usvfs_x64.dll", "usvfs_x86.dll")
+            )
+        else:
+            __mo2_vfs = False
+
+        if __mo2_vfs:
+            log.info("Detected MO2's VFS. Using glob.dll for searching files.")
+
+    return __mo2_vfs
@@ -0,0 +1,195 @@
+"""
+Copyright (c) Cutleast
+
+This module contains a profiler for the time spent importing modules, similar to
+`python -X importtime`.
+"""
+
+import importlib.abc
+import importlib.machinery
+import logging
+import sys
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass
+from types import ModuleType
+from typing import Any, Optional, override
+
+
+@dataclass
+class ImportTiming:
+    """
+    Time spent importing a single module.
+    """
+
+    name: str
+    """The name of the module."""
+
+    depth: int
+    """The number of imports that were running when the module was imported."""
+
+    cumulative: float = 0.0
+    """Time in seconds including the imports done by the module."""
+
+    own: float = 0.0
+    """Time in seconds excluding the imports done by the module."""
+
+
+class ImportProfiler(importlib.abc.MetaPathFinder):
+    """
+    Meta path finder that measures how long executing each newly imported module
+    takes. Finding the modules is done by the other finders in `sys.meta_path`.
+    """
+
+    log: logging.Logger = logging.getLogger("ImportProfiler")
+
+    timings: list[ImportTiming]
+    """The timings of the imported modules in the order they were imported."""
+
+    __running: list[ImportTiming]
+    """The imports that are currently running, the innermost one last."""
+
+    __start_time: float
+
+    def __init__(self) -> None:
+        self.timings = []
+        self.__running = []
+        self.__start_time = time.perf_counter()
+
+    def install(self) -> None:
+        """
+        Installs the profiler as first finder in `sys.meta_path`.
+        """
+
+        if self not in sys.meta_path:
+            sys.meta_path.insert(0, self)
+            self.__start_time = time.perf_counter()
+
+    def uninstall(self) -> None:
+        """
+        Removes the profiler from `sys.meta_path`.
+        """
+
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+    @override
+    def find_spec(
+        self,
+        fullname: str,
+        path: Optional[Sequence[str]],
+        target: Optional[ModuleType] = None,
+    ) -> Optional[importlib.machinery.ModuleSpec]:
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+
+            spec: Optional[importlib.machinery.ModuleSpec] = finder.find_spec(
+                fullname, path, target
+            )
+            if spec is None:
+                continue
+
+            if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                spec.loader = _TimedLoader(spec.loader, self)
+
+            return spec
+
+        return None
+
+    def start_import(self, name: str) -> None:
+        """
+        Called by the timed loaders before a module is executed.
+
+        Args:
+            name (str): The name of the module.
+        """
+
+        timing = ImportTiming(name=name, depth=len(self.__running))
+        timing.cumulative = time.perf_counter()
+        self.timings.append(timing)
+        self.__running.append(timing)
+
+    def finish_import(self) -> None:
+        """
+        Called by the timed loaders after a module was executed.
+        """
+
+        timing: ImportTiming = self.__running.pop()
+        timing.cumulative = time.perf_counter() - timing.cumulative
+        timing.own += timing.cumulative
+
+        # the time of nested imports is excluded from the parent's own time
+        if self.__running:
+            self.__running[-1].own -= timing.cumulative
+
+    def get_report(self, limit: int = 30) -> str:
+        """
+        Creates a report of the slowest imports, sorted by their cumulative time.
+
+        Args:
+            limit (int, optional): The maximum number of listed modules. Defaults to 30.
+
+        Returns:
+            str: The report
+        """
+
+        total: float = time.perf_counter() - self.__start_time
+        imports: float = sum(t.cumulative for t in self.timings if t.depth == 0)
+        lines: list[str] = [
+            f"Imported {len(self.timings)} module(s) in {imports:.3f} second(s) "
+            f"({total:.3f} second(s) since start).",
+            "cumulative [ms] |  self [ms] | module",
+        ]
+
+        for timing in sorted(self.timings, key=lambda t: t.cumulative, reverse=True)[
+            :limit
+        ]:
+            lines.append(
+                f"{timing.cumulative * 1000:15.1f} | {timing.own * 1000:10.1f} | "
+                f"{'  ' * timing.depth}{timing.name}"
+            )
+
+        return "\n".join(lines)
+
+    def log_report(self, limit: int = 30) -> None:
+        """
+        Logs the report created by `get_report()`.
+
+        Args:
+            limit (int, optional): The maximum number of listed modules. Defaults to 30.
+        """
+
+        self.log.info(self.get_report(limit))
+
+
+class _TimedLoader(importlib.abc.Loader):
+    """
+    Wrapper for a loader that reports the execution of its modules to an
+    `ImportProfiler`. The original loader is restored on the module afterwards.
+    """
+
+    def __init__(self, loader: importlib.abc.Loader, profiler: ImportProfiler) -> None:
+        self.__loader = loader
+        self.__profiler = profiler
+
+    @override
+    def create_module(
+        self, spec: importlib.machinery.ModuleSpec
+    ) -> Optional[ModuleType]:
+        return self.__loader.create_module(spec)
+
+    @override
+    def exec_module(self, module: ModuleType) -> None:
+        module.__loader__ = self.__loader
+        if module.__spec__ is not None:
+            module.__spec__.loader = self.__loader
+
+        self.__profiler.start_import(module.__name__)
+        try:
+            self.__loader.exec_module(module)
+        finally:
+            self.__profiler.finish_import()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.__loader, name)
@@ -0,0 +1,541 @@
+"""
+Copyright (c) Cutleast
+
+This module contains typed progress events and a reporter that emits them for the
+stages and files of a run, with an ETA estimated from the throughput of previous runs.
+"""
+
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections.abc import Callable, Generator, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional
+
+from pydantic import BaseModel, Field, ValidationError
+
+from core.utilities import trace
+
+
+@dataclass(frozen=True)
+class ProgressEvent:
+    """
+    Base class for all progress events. The counts are the ones of the stage after the
+    event.
+    """
+
+    stage: str
+    """The name of the stage."""
+
+    items_done: int
+    """The number of finished items of the stage."""
+
+    items_total: int
+    """The number of items of the stage."""
+
+    bytes_done: int
+    """The size of the finished items of the stage in bytes."""
+
+    bytes_total: int
+    """The size of all items of the stage in bytes, 0 if it's unknown."""
+
+    elapsed: float
+    """The time in seconds since the run was started."""
+
+    eta: Optional[float]
+    """The estimated time in seconds until the run is finished or None if unknown."""
+
+
+@dataclass(frozen=True)
+class StageStarted(ProgressEvent):
+    """
+    Emitted when a stage is started.
+    """
+
+
+@dataclass(frozen=True)
+class StageFinished(ProgressEvent):
+    """
+    Emitted when a stage is finished, also when it failed.
+    """
+
+    duration: float
+    """The time in seconds spent in the stage."""
+
+
+@dataclass(frozen=True)
+class FileStarted(ProgressEvent):
+    """
+    Emitted when a file of a stage is started.
+    """
+
+    file: Path
+    """The file that is processed."""
+
+    size: int
+    """The size of the file in bytes, 0 if it doesn't exist yet."""
+
+
+@dataclass(frozen=True)
+class FileFinished(ProgressEvent):
+    """
+    Emitted when a file of a stage is finished, also when it failed.
+    """
+
+    file: Path
+    """The file that was processed."""
+
+    size: int
+    """The size of the file in bytes."""
+
+    duration: float
+    """The time in seconds spent on the file."""
+
+    skipped: bool = False
+    """Whether the file was skipped, for example because it was already done."""
+
+
+type ProgressListener = Callable[[ProgressEvent], None]
+
+
+class StageThroughput(BaseModel):
+    """
+    Model representing the average throughput of a stage in previous runs.
+    """
+
+    seconds_per_item: Optional[float] = None
+    """The average time in seconds per item."""
+
+    seconds_per_byte: Optional[float] = None
+    """The average time in seconds per byte."""
+
+
+class ThroughputHistory(BaseModel):
+    """
+    Model representing the throughput of the stages in previous runs.
+    """
+
+    stages: dict[str, StageThroughput] = Field(default_factory=dict)
+    """The throughput of the stages by their names."""
+
+
+class ProgressReporter:
+    """
+    Emits progress events for the stages and files of a run to its listeners. The
+    listeners are called in the thread that reports the progress.
+    """
+
+    log: logging.Logger = logging.getLogger("ProgressReporter")
+
+    HISTORY_PATH: Path = Path(tempfile.gettempdir()) / "DIP_throughput.json"
+    """Path to the throughput history of previous runs."""
+
+    SMOOTHING: float = 0.3
+    """Weight of the throughput of the latest run in the history."""
+
+    history_path: Optional[Path]
+    """Path to the throughput history or None if it's not persisted."""
+
+    __listeners: list[ProgressListener]
+    __history: Optional[ThroughputHistory] = None
+    __lock: threading.Lock
+
+    __run_start: float
+    __planned: dict[str, int]
+    """Item counts of the stages that were planned but not started yet."""
+
+    __stage: Optional[str] = None
+    __stage_start: float = 0.0
+    __items_done: int = 0
+    __items_total: int = 0
+    __bytes_done: int = 0
+    __bytes_total: int = 0
+    __items_skipped: int = 0
+    __bytes_skipped: int = 0
+    """Count and size of the finished items of the stage that were skipped."""
+
+    __file_skipped: bool = False
+    """Whether the file of the current `file()` context was skipped."""
+
+    def __init__(self, history_path: Optional[Path] = HISTORY_PATH) -> None:
+        """
+        Args:
+            history_path (Optional[Path], optional):
+                Path to the throughput history. Defaults to `HISTORY_PATH`. None
+                disables persisting the history.
+        """
+
+        self.history_path = history_path
+        self.__listeners = []
+        self.__lock = threading.Lock()
+        self.__run_start = time.time()
+        self.__planned = {}
+
+    def add_listener(self, listener: ProgressListener) -> None:
+        """
+        Adds a listener that is called for every event.
+
+        Args:
+            listener (ProgressListener): The listener to add.
+        """
+
+        with self.__lock:
+            self.__listeners.append(listener)
+
+    def remove_listener(self, listener: ProgressListener) -> None:
+        """
+        Removes a listener.
+
+        Args:
+            listener (ProgressListener): The listener to remove.
+        """
+
+        with self.__lock:
+            if listener in self.__listeners:
+                self.__listeners.remove(listener)
+
+    def start_run(self) -> None:
+        """
+        Starts a new run and forgets the planned stages of the previous one.
+        """
+
+        self.__run_start = time.time()
+        self.__planned = {}
+        self.__stage = None
+
+    def plan(self, stage: str, items: int) -> None:
+        """
+        Announces a stage of the run, so that it's included in the ETA before it's
+        started. Stages without items are not planned.
+
+        Args:
+            stage (str): The name of the stage.
+            items (int): The number of items of the stage.
+        """
+
+        if items > 0:
+            self.__planned[stage] = items
+
+    def finish_run(self) -> None:
+        """
+        Finishes the run and saves the throughput history.
+        """
+
+        self.__planned = {}
+        self.__save_history()
+
+    @contextmanager
+    def stage(
+        self, name: str, files: Sequence[Path] = (), items: Optional[int] = None
+    ) -> Generator[None, None, None]:
+        """
+        Context manager for a stage of the run. Emits `StageStarted` when it's entered
+        and `StageFinished` when it's left. The stage is also traced as a span.
+
+        Args:
+            name (str): The name of the stage.
+            files (Sequence[Path], optional):
+                The files of the stage. Their sizes are summed up if they exist.
+                Defaults to no files.
+            items (Optional[int], optional):
+                The number of items of the stage. Defaults to the number of files.
+        """
+
+        self.__planned.pop(name, None)
+        self.__stage = name
+        self.__stage_start = time.time()
+        self.__items_done = 0
+        self.__items_total = items if items is not None else len(files)
+        self.__bytes_done = 0
+        self.__bytes_total = sum(ProgressReporter.__get_size(file) for file in files)
+        self.__items_skipped = 0
+        self.__bytes_skipped = 0
+
+        self.__emit(StageStarted)
+
+        try:
+            with trace.span(name, "stage", items=self.__items_total):
+                yield
+
+            # stages without file events count as done as a whole
+            if not self.__items_done:
+                self.__items_done = self.__items_total
+
+            # failed stages would distort the throughput
+            self.__update_history(name, time.time() - self.__stage_start)
+        finally:
+            self.__emit(StageFinished, duration=time.time() - self.__stage_start)
+            self.__stage = None
+
+    @contextmanager
+    def file(self, path: Path) -> Generator[None, None, None]:
+        """
+        Context manager for a single file of the current stage. Emits `FileStarted`
+        when it's entered and `FileFinished` when it's left. The file is also traced as
+        a span.
+
+        Args:
+            path (Path): The file that is processed.
+        """
+
+        size: int = ProgressReporter.__get_size(path)
+        start_time: float = time.time()
+        self.__file_skipped = False
+        self.__emit(FileStarted, file=path, size=size)
+
+        try:
+            with trace.span(path.name, "file", stage=self.__stage, file=path):
+                yield
+        finally:
+            self.advance(
+                path, size, time.time() - start_time, skipped=self.__file_skipped
+            )
+            self.__file_skipped = False
+
+    def skip_file(self) -> None:
+        """
+        Marks the file of the current `file()` context as skipped, so that it's
+        excluded from the throughput history.
+        """
+
+        self.__file_skipped = True
+
+    def advance(
+        self,
+        path: Path,
+        size: Optional[int] = None,
+        duration: float = 0.0,
+        skipped: bool = False,
+    ) -> None:
+        """
+        Marks a file of the current stage as finished and emits `FileFinished`. Used
+        for files that are processed elsewhere, for example in worker processes.
+
+        Args:
+            path (Path): The file that was processed.
+            size (Optional[int], optional):
+                The size of the file in bytes. Defaults to its current size.
+            duration (float, optional):
+                The time in seconds spent on the file. Defaults to 0.0.
+            skipped (bool, optional):
+                Whether the file was skipped, for example because it was already done
+                by an interrupted run. Skipped files count as finished but are excluded
+                from the throughput history. Defaults to False.
+        """
+
+        if not size:
+            size = ProgressReporter.__get_size(path)
+
+        self.__items_done += 1
+        self.__bytes_done += size
+        if skipped:
+            self.__items_skipped += 1
+            self.__bytes_skipped += size
+
+        self.__emit(
+            FileFinished, file=path, size=size, duration=duration, skipped=skipped
+        )
+
+    def get_eta(self) -> Optional[float]:
+        """
+        Estimates the remaining time of the run from the throughput of the current
+        stage and the throughput of previous runs. Planned stages without history are
+        not included.
+
+        Returns:
+            Optional[float]: The remaining time in seconds or None if it's unknown.
+        """
+
+        history: ThroughputHistory = self.__load_history()
+        eta: Optional[float] = None
+
+        if self.__stage is not None:
+            eta = self.__estimate(
+                history.stages.get(self.__stage),
+                self.__items_total - self.__items_done,
+                self.__bytes_total - self.__bytes_done if self.__bytes_total else 0,
+            )
+
+            # fall back to the throughput of the current stage so far
+            processed: int = self.__items_done - self.__items_skipped
+            if eta is None and processed:
+                elapsed: float = time.time() - self.__stage_start
+                eta = elapsed / processed * (self.__items_total - self.__items_done)
+
+        for stage, items in self.__planned.items():
+            stage_eta: Optional[float] = self.__estimate(
+                history.stages.get(stage), items, 0
+            )
+            if stage_eta is not None:
+                eta = (eta or 0.0) + stage_eta
+
+        return eta
+
+    @staticmethod
+    def __estimate(
+        throughput: Optional[StageThroughput], items: int, size: int
+    ) -> Optional[float]:
+        """
+        Estimates the time for the remaining items of a stage, preferring the
+        throughput in bytes if the size is known.
+
+        Args:
+            throughput (Optional[StageThroughput]): The throughput of the stage, if any.
+            items (int): The number of remaining items.
+            size (int): The size of the remaining items in bytes, 0 if it's unknown.
+
+        Returns:
+            Optional[float]: The estimated time in seconds or None if it's unknown.
+        """
+
+        if throughput is None:
+            return None
+
+        if size > 0 and throughput.seconds_per_byte is not None:
+            return size * throughput.seconds_per_byte
+
+        if throughput.seconds_per_item is not None:
+            return items * throughput.seconds_per_item
+
+        return None
+
+    def __emit(self, event_type: type[ProgressEvent], **kwargs: Any) -> None:
+        """
+        Creates an event with the current state of the run and calls the listeners
+        with it. Failing listeners are logged and don't interrupt the run.
+
+        Args:
+            event_type (type[ProgressEvent]): The type of the event.
+            **kwargs: The fields specific to the event type.
+        """
+
+        with self.__lock:
+            listeners: list[ProgressListener] = list(self.__listeners)
+
+        if not listeners:
+            return
+
+        event: ProgressEvent = event_type(
+            stage=self.__stage or "",
+            items_done=self.__items_done,
+            items_total=self.__items_total,
+            bytes_done=self.__bytes_done,
+            bytes_total=self.__bytes_total,
+            elapsed=time.time() - self.__run_start,
+            eta=self.get_eta(),
+            **kwargs,
+        )
+        for listener in listeners:
+            try:
+                listener(event)
+            except Exception as ex:
+                self.log.warning(f"Progress listener failed: {ex}", exc_info=ex)
+
+    def __update_history(self, stage: str, duration: float) -> None:
+        """
+        Updates the average throughput of a finished stage in the history. Skipped
+        files are not included since they took almost no time.
+
+        Args:
+            stage (str): The name of the stage.
+            duration (float): The time in seconds spent in the stage.
+        """
+
+        items: int = self.__items_done - self.__items_skipped
+        size: int = self.__bytes_done - self.__bytes_skipped
+
+        if not items:
+            return
+
+        history: ThroughputHistory = self.__load_history()
+        throughput: StageThroughput = history.stages.setdefault(
+            stage, StageThroughput()
+        )
+
+        def smooth(average: Optional[float], latest: float) -> float:
+            if average is None:
+                return latest
+
+            return average + ProgressReporter.SMOOTHING * (latest - average)
+
+        throughput.seconds_per_item = smooth(
+            throughput.seconds_per_item, duration / items
+        )
+        if size:
+            throughput.seconds_per_byte = smooth(
+                throughput.seconds_per_byte, duration / size
+            )
+
+    def __load_history(self) -> ThroughputHistory:
+        """
+        Loads the throughput history on first access.
+
+        Returns:
+            ThroughputHistory: The history or an empty one if it doesn't exist or is
+                invalid.
+        """
+
+        if self.__history is None:
+            self.__history = ThroughputHistory()
+
+            if self.history_path is not None:
+                try:
+                    self.__history = ThroughputHistory.model_validate_json(
+                        self.history_path.read_bytes()
+                    )
+                except FileNotFoundError:
+                    pass
+                except (OSError, ValidationError) as ex:
+                    self.log.warning(f"Failed to load throughput history: {ex}")
+
+        return self.__history
+
+    def __save_history(self) -> None:
+        """
+        Saves the throughput history if it was loaded.
+        """
+
+        if self.history_path is None or self.__history is None:
+            return
+
+        try:
+            self.history_path.write_text(
+                self.__history.model_dump_json(), encoding="utf8"
+            )
+        except OSError as ex:
+            self.log.warning(f"Failed to save throughput history: {ex}")
+
+    @staticmethod
+    def __get_size(path: Path) -> int:
+        """
+        Returns the size of a file in bytes or 0 if it doesn't exist.
+        """
+
+        try:
+            return os.path.getsize(path)
+        except OSError:
+            return 0
+
+
+def format_duration(seconds: float) -> str:
+    """
+    Formats a duration for displaying it, for example `1:05:09` or `5:09`.
+
+    Args:
+        seconds (float): The duration in seconds.
+
+    Returns:
+        str: The formatted duration
+    """
+
+    minutes, secs = divmod(round(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+
+    if hours:
+        return f"{hours}:{minutes:02d}:{secs:02d}"
+
+    return f"{minutes}:{secs:02d}"
@@ -0,0 +1,223 @@
+"""
+Copyright (c) Cutleast
+
+This module contains functions for staging files into and out of temp folders with the
+cheapest method the platform and file system support.
+"""
+
+import ctypes
+import logging
+import os
+import shutil
+import sys
+from enum import StrEnum
+from pathlib import Path
+
+log: logging.Logger = logging.getLogger("Staging")
+
+FICLONE: int = 0x40049409
+"""Linux ioctl request for cloning a file on a copy-on-write file system."""
+
+
+class StagingMethod(StrEnum):
+    """
+    Enum for the methods a file can be staged with, from the cheapest to the most
+    expensive one.
+    """
+
+    Move = "move"
+    """The file was moved on the same file system."""
+
+    Reflink = "reflink"
+    """The file was cloned on a copy-on-write file system (Linux only)."""
+
+    Hardlink = "hardlink"
+    """The file was hardlinked. Only used for files that are never modified."""
+
+    Kernel = "kernel"
+    """
+    The file was copied by the kernel (`CopyFileW` on Windows, which also clones
+    blocks on ReFS, or `copy_file_range`/`sendfile` on Linux).
+    """
+
+    Copy = "copy"
+    """The file was copied with a buffered copy."""
+
+
+def stage_file(src: Path, dst: Path, read_only: bool = False) -> StagingMethod:
+    """
+    Copies a file with the cheapest supported method. An existing destination file is
+    removed first so that a hardlink of a previous run is never written through.
+
+    Args:
+        src (Path): Path to the source file.
+        dst (Path): Path to the destination file.
+        read_only (bool, optional):
+            Whether the destination file is never modified, so that it may be a
+            hardlink of the source file. Defaults to False.
+
+    Returns:
+        StagingMethod: The method the file was copied with
+    """
+
+    try:
+        os.remove(dst)
+    except FileNotFoundError:
+        pass
+
+    method: StagingMethod
+    if __reflink(src, dst):
+        method = StagingMethod.Reflink
+    elif read_only and __hardlink(src, dst):
+        method = StagingMethod.Hardlink
+    elif __kernel_copy(src, dst):
+        method = StagingMethod.Kernel
+    else:
+        shutil.copyfile(src, dst)
+        method = StagingMethod.Copy
+
+    log.debug(f"Staged '{src}' -> '{dst}' ({method}).")
+
+    return method
+
+
+def move_file(src: Path, dst: Path) -> StagingMethod:
+    """
+    Moves a file. If it can't be renamed, for example because the destination is on
+    another file system, it's staged with `stage_file()` and removed afterwards.
+
+    Args:
+        src (Path): Path to the source file.
+        dst (Path): Path to the destination file.
+
+    Returns:
+        StagingMethod: The method the file was moved with
+    """
+
+    try:
+        os.replace(src, dst)
+        log.debug(f"Moved '{src}' -> '{dst}'.")
+        return StagingMethod.Move
+    except OSError:
+        pass
+
+    method: StagingMethod = stage_file(src, dst)
+    os.remove(src)
+
+    return method
+
+
+def __reflink(src: Path, dst: Path) -> bool:
+    """
+    Clones a file with the `FICLONE` ioctl on Linux.
+
+    Args:
+        src (Path): Path to the source file.
+        dst (Path): Path to the destination file.
+
+    Returns:
+        bool: Whether the file was cloned
+    """
+
+    if sys.platform != "linux":
+        return False
+
+    import fcntl
+
+    try:
+        with open(src, "rb") as src_file, open(dst, "wb") as dst_file:
+            fcntl.ioctl(dst_file.fileno(), FICLONE, src_file.fileno())
+    except OSError:
+        __remove(dst)
+        return False
+
+    return True
+
+
+def __hardlink(src: Path, dst: Path) -> bool:
+    """
+    Creates a hardlink of a file.
+
+    Args:
+        src (Path): Path to the source file.
+        dst (Path): Path to the destination file.
+
+    Returns:
+        bool: Whether the hardlink was created
+    """
+
+    try:
+        os.link(src, dst)
+    except OSError:
+        return False
+
+    return True
+
+
+def __kernel_copy(src: Path, dst: Path) -> bool:
+    """
+    Copies a file without passing its content through Python.
+
+    Args:
+        src (Path): Path to the source file.
+        dst (Path): Path to the destination file.
+
+    Returns:
+        bool: Whether the file was copied
+    """
+
+    if sys.platform == "win32":
+        kernel32 = ctypes.WinDLL("kernel32")  # pyright: ignore[reportAttributeAccessIssue]
+        kernel32.CopyFileW.argtypes = [
+            ctypes.c_wchar_p,
+            ctypes.c_wchar_p,
+            ctypes.c_bool,
+        ]
+        kernel32.CopyFileW.restype = ctypes.c_bool
+
+        return bool(kernel32.CopyFileW(str(src), str(dst), False))
+
+    if not hasattr(os, "copy_file_range") and not hasattr(os, "sendfile"):
+        return False
+
+    try:
+        with open(src, "rb") as src_file, open(dst, "wb") as dst_file:
+            size: int = os.fstat(src_file.fileno()).st_size
+            try:
+                __copy_range(src_file.fileno(), dst_file.fileno(), size)
+            except (OSError, AttributeError):
+                # copy_file_range is not supported for all file systems and kernels
+                src_file.seek(0)
+                dst_file.seek(0)
+                dst_file.truncate()
+                __send_file(src_file.fileno(), dst_file.fileno(), size)
+    except (OSError, AttributeError):
+        __remove(dst)
+        return False
+
+    return True
+
+
+def __copy_range(src_fd: int, dst_fd: int, size: int) -> None:
+    copied: int = 0
+    while copied < size:
+        count: int = os.copy_file_range(src_fd, dst_fd, size - copied)
+        if count == 0:
+            break
+        copied += count
+
+
+def __send_file(src_fd: int, dst_fd: int, size: int) -> None:
+    copied: int = 0
+    while copied < size:
+        count: int = os.sendfile(dst_fd, src_fd, copied, size - copied)
+        if count == 0:
+            break
+        copied += count
+
+
+def __remove(path: Path) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
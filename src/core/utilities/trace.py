@@ -0,0 +1,164 @@
+"""
+Copyright (c) Cutleast
+
+This module contains spans for tracing the stages of a run and the external processes
+and I/O they spend their time in. Tracing is disabled by default and the spans cost
+next to nothing then. The collected spans are saved in the Chrome trace event format,
+which can be viewed with Perfetto (https://ui.perfetto.dev) or `chrome://tracing`.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from collections.abc import Generator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Optional
+
+log: logging.Logger = logging.getLogger("Trace")
+
+
+class Tracer:
+    """
+    Collects spans as complete events of the Chrome trace event format.
+    """
+
+    events: list[dict[str, Any]]
+    """The collected events in the order the spans were finished."""
+
+    __thread_names: dict[int, str]
+    __lock: threading.Lock
+    __start_time: int
+
+    def __init__(self) -> None:
+        self.events = []
+        self.__thread_names = {}
+        self.__lock = threading.Lock()
+        self.__start_time = time.perf_counter_ns()
+
+    @contextmanager
+    def span(
+        self, name: str, category: str, **args: Any
+    ) -> Generator[None, None, None]:
+        """
+        Context manager that records the time spent in it as a span.
+
+        Args:
+            name (str): The name of the span, for example the name of a stage.
+            category (str): The category of the span, for example "process".
+            **args: Additional details shown with the span, for example the file.
+        """
+
+        start_time: int = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            end_time: int = time.perf_counter_ns()
+            thread: threading.Thread = threading.current_thread()
+            event: dict[str, Any] = {
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": (start_time - self.__start_time) / 1000,
+                "dur": (end_time - start_time) / 1000,
+                "pid": os.getpid(),
+                "tid": thread.ident,
+            }
+            if args:
+                event["args"] = {key: str(value) for key, value in args.items()}
+
+            with self.__lock:
+                self.events.append(event)
+                if thread.ident is not None:
+                    self.__thread_names.setdefault(thread.ident, thread.name)
+
+    def save(self, path: Path) -> None:
+        """
+        Saves the collected spans in the Chrome trace event format.
+
+        Args:
+            path (Path): The path to the JSON file.
+        """
+
+        with self.__lock:
+            events: list[dict[str, Any]] = [
+                {
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": os.getpid(),
+                    "tid": tid,
+                    "args": {"name": name},
+                }
+                for tid, name in self.__thread_names.items()
+            ] + list(self.events)
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(
+            json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}),
+            encoding="utf8",
+        )
+        log.info(f"Saved {len(events)} trace event(s) to '{path}'.")
+
+
+__tracer: Optional[Tracer] = None
+
+
+def start_tracing() -> Tracer:
+    """
+    Enables tracing. Spans are recorded from now on.
+
+    Returns:
+        Tracer: The tracer that collects the spans.
+    """
+
+    global __tracer
+
+    if __tracer is None:
+        __tracer = Tracer()
+
+    return __tracer
+
+
+def stop_tracing(path: Optional[Path] = None) -> None:
+    """
+    Disables tracing and optionally saves the collected spans.
+
+    Args:
+        path (Optional[Path], optional):
+            The path to save the spans to. Defaults to None.
+    """
+
+    global __tracer
+
+    tracer: Optional[Tracer] = __tracer
+    __tracer = None
+
+    if tracer is not None and path is not None:
+        try:
+            tracer.save(path)
+        except OSError as ex:
+            log.error(f"Failed to save trace: {ex}", exc_info=ex)
+
+
+@contextmanager
+def span(name: str, category: str, **args: Any) -> Generator[None, None, None]:
+    """
+    Context manager that records the time spent in it as a span if tracing is
+    enabled.
+
+    Args:
+        name (str): The name of the span, for example the name of a stage.
+        category (str): The category of the span, for example "process".
+        **args: Additional details shown with the span, for example the file.
+    """
+
+    tracer: Optional[Tracer] = __tracer
+
+    if tracer is None:
+        yield
+        return
+
+    with tracer.span(name, category, **args):
+        yield
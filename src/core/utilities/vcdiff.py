@@ -0,0 +1,541 @@
+"""
+Copyright (c) Cutleast
+
+This module contains an encoder and a decoder for VCDIFF deltas (RFC 3284) that are
+compatible with xdelta3.
+
+The decoder doesn't support secondary compression and custom code tables and raises a
+`NotImplementedError` for them, so that the caller can fall back to xdelta itself.
+The encoder never uses them.
+"""
+
+import logging
+import mmap
+import zlib
+from contextlib import ExitStack
+from enum import IntEnum
+from pathlib import Path
+from typing import BinaryIO, Optional
+
+log: logging.Logger = logging.getLogger("VCDiff")
+
+MAGIC: bytes = b"\xd6\xc3\xc4\x00"
+"""The magic bytes and version at the start of every VCDIFF file."""
+
+# Header indicator bits
+VCD_DECOMPRESS: int = 0x01
+"""The delta uses a secondary compressor."""
+VCD_CODETABLE: int = 0x02
+"""The delta uses a custom code table."""
+VCD_APPHEADER: int = 0x04
+"""The header contains application data (xdelta3 extension)."""
+
+# Window indicator bits
+VCD_SOURCE: int = 0x01
+"""The window copies from a segment of the source file."""
+VCD_TARGET: int = 0x02
+"""The window copies from a segment of the already decoded target file."""
+VCD_ADLER32: int = 0x04
+"""The window contains an Adler-32 checksum of its target data (xdelta3 extension)."""
+
+NEAR_CACHE_SIZE: int = 4
+"""Size of the "near" address cache of the default code table."""
+
+SAME_CACHE_SIZE: int = 3
+"""Size of the "same" address cache of the default code table (times 256)."""
+
+MATCH_SIZE: int = 16
+"""Minimum length of the matches the encoder looks for in the source file."""
+
+WINDOW_SIZE: int = 8 * 1024 * 1024
+"""Maximum size of the target windows written by the encoder."""
+
+
+class Instruction(IntEnum):
+    """
+    Enum for the delta instructions.
+    """
+
+    NoOp = 0
+    """No instruction."""
+
+    Add = 1
+    """Appends bytes from the data section."""
+
+    Run = 2
+    """Appends a single byte from the data section repeatedly."""
+
+    Copy = 3
+    """Appends bytes from the source segment or the target window."""
+
+
+type Buffer = bytes | mmap.mmap
+"""A file's content, either read or memory-mapped."""
+
+type CodeTableEntry = tuple[tuple[Instruction, int, int], tuple[Instruction, int, int]]
+"""Two pairs of instruction, size (0 if it's read separately) and address mode."""
+
+
+def __build_default_code_table() -> list[CodeTableEntry]:
+    """
+    Builds the default code table as specified in section 5.6 of RFC 3284.
+
+    Returns:
+        list[CodeTableEntry]: The 256 entries of the code table
+    """
+
+    noop: tuple[Instruction, int, int] = (Instruction.NoOp, 0, 0)
+    copy_modes: int = 2 + NEAR_CACHE_SIZE + SAME_CACHE_SIZE
+
+    table: list[CodeTableEntry] = [((Instruction.Run, 0, 0), noop)]
+    table += [((Instruction.Add, size, 0), noop) for size in range(18)]
+    for mode in range(copy_modes):
+        table.append(((Instruction.Copy, 0, mode), noop))
+        table += [((Instruction.Copy, size, mode), noop) for size in range(4, 19)]
+    for mode in range(copy_modes):
+        copy_sizes: range = range(4, 7) if mode < 2 + NEAR_CACHE_SIZE else range(4, 5)
+        table += [
+            ((Instruction.Add, add_size, 0), (Instruction.Copy, copy_size, mode))
+            for add_size in range(1, 5)
+            for copy_size in copy_sizes
+        ]
+    table += [
+        ((Instruction.Copy, 4, mode), (Instruction.Add, 1, 0))
+        for mode in range(copy_modes)
+    ]
+
+    return table
+
+
+DEFAULT_CODE_TABLE: list[CodeTableEntry] = __build_default_code_table()
+
+
+def decode(delta_path: Path, source_path: Optional[Path], target_path: Path) -> None:
+    """
+    Decodes a VCDIFF delta. The source file is memory-mapped and the target file is
+    written window by window.
+
+    Args:
+        delta_path (Path): Path to the delta file.
+        source_path (Optional[Path]): Path to the source file, if any.
+        target_path (Path): Path to the target file. Overwritten if it exists.
+
+    Raises:
+        NotImplementedError:
+            When the delta uses secondary compression or a custom code table.
+        ValueError: When the delta is invalid or doesn't match the source file.
+    """
+
+    with ExitStack() as stack:
+        delta: Buffer = __map_file(stack, delta_path)
+        source: Buffer = (
+            __map_file(stack, source_path) if source_path is not None else b""
+        )
+        target_file: BinaryIO = stack.enter_context(open(target_path, "w+b"))
+
+        try:
+            __decode(delta, source, target_file)
+        except IndexError as ex:
+            raise ValueError(f"Truncated VCDIFF file '{delta_path}'.") from ex
+
+    log.debug(f"Decoded '{delta_path}' to '{target_path}'.")
+
+
+def encode(source_path: Optional[Path], target_path: Path, delta_path: Path) -> None:
+    """
+    Encodes the differences between two files as a VCDIFF delta. Only copies from the
+    source file and added bytes are used, so the delta can be decoded by this module
+    and by xdelta3.
+
+    Args:
+        source_path (Optional[Path]): Path to the source file, if any.
+        target_path (Path): Path to the target file.
+        delta_path (Path): Path to the delta file. Overwritten if it exists.
+    """
+
+    with ExitStack() as stack:
+        source: Buffer = (
+            __map_file(stack, source_path) if source_path is not None else b""
+        )
+        target: Buffer = __map_file(stack, target_path)
+        delta_file: BinaryIO = stack.enter_context(open(delta_path, "wb"))
+
+        # index the source at every MATCH_SIZE bytes, keeping the first occurrences
+        index: dict[bytes, int] = {
+            source[pos : pos + MATCH_SIZE]: pos
+            for pos in reversed(range(0, len(source) - MATCH_SIZE + 1, MATCH_SIZE))
+        }
+
+        delta_file.write(MAGIC + bytes([0]))
+        for start in range(0, len(target), WINDOW_SIZE):
+            end: int = min(start + WINDOW_SIZE, len(target))
+            delta_file.write(__encode_window(source, index, target, start, end))
+
+    log.debug(f"Encoded '{target_path}' to '{delta_path}'.")
+
+
+def __encode_window(
+    source: Buffer, index: dict[bytes, int], target: Buffer, start: int, end: int
+) -> bytes:
+    """
+    Encodes a single window of the target file.
+
+    Args:
+        source (Buffer): The source file.
+        index (dict[bytes, int]): Positions of the source's blocks by their content.
+        target (Buffer): The target file.
+        start (int): Start of the window in the target file.
+        end (int): End of the window in the target file.
+
+    Returns:
+        bytes: The encoded window
+    """
+
+    data = bytearray()
+    instructions = bytearray()
+    addresses = bytearray()
+
+    add_start: int = start
+    pos: int = start
+    while pos + MATCH_SIZE <= end:
+        source_pos: Optional[int] = index.get(target[pos : pos + MATCH_SIZE])
+        if source_pos is None:
+            pos += 1
+            continue
+
+        # extend the match backwards into the pending added bytes
+        while (
+            pos > add_start
+            and source_pos > 0
+            and source[source_pos - 1] == target[pos - 1]
+        ):
+            pos -= 1
+            source_pos -= 1
+
+        # extend the match forwards, in blocks first
+        limit: int = min(end - pos, len(source) - source_pos)
+        length: int = MATCH_SIZE
+        while (
+            length + 64 <= limit
+            and source[source_pos + length : source_pos + length + 64]
+            == target[pos + length : pos + length + 64]
+        ):
+            length += 64
+        while length < limit and source[source_pos + length] == target[pos + length]:
+            length += 1
+
+        if pos > add_start:
+            __write_add(instructions, data, target[add_start:pos])
+        __write_copy(instructions, addresses, length, source_pos)
+
+        pos += length
+        add_start = pos
+
+    if add_start < end:
+        __write_add(instructions, data, target[add_start:end])
+
+    encoding = bytearray()
+    __write_int(encoding, end - start)
+    encoding.append(0)  # delta indicator
+    __write_int(encoding, len(data))
+    __write_int(encoding, len(instructions))
+    __write_int(encoding, len(addresses))
+    encoding += zlib.adler32(target[start:end]).to_bytes(4, "big")
+    encoding += data + instructions + addresses
+
+    window = bytearray()
+    if source:
+        window.append(VCD_SOURCE | VCD_ADLER32)
+        __write_int(window, len(source))
+        __write_int(window, 0)
+    else:
+        window.append(VCD_ADLER32)
+    __write_int(window, len(encoding))
+    window += encoding
+
+    return bytes(window)
+
+
+def __write_add(instructions: bytearray, data: bytearray, content: bytes) -> None:
+    # ADD with sizes 1-17 have their own codes (2-18), code 1 reads the size
+    if len(content) <= 17:
+        instructions.append(len(content) + 1)
+    else:
+        instructions.append(1)
+        __write_int(instructions, len(content))
+
+    data += content
+
+
+def __write_copy(
+    instructions: bytearray, addresses: bytearray, size: int, address: int
+) -> None:
+    # COPY in mode VCD_SELF with sizes 4-18 have their own codes (20-34), code 19
+    # reads the size
+    if 4 <= size <= 18:
+        instructions.append(20 + size - 4)
+    else:
+        instructions.append(19)
+        __write_int(instructions, size)
+
+    __write_int(addresses, address)
+
+
+def __write_int(buffer: bytearray, value: int) -> None:
+    """
+    Writes a variable-length integer (base 128, most significant digit first).
+
+    Args:
+        buffer (bytearray): The buffer to write to.
+        value (int): The integer.
+    """
+
+    digits: list[int] = [value & 0x7F]
+    value >>= 7
+    while value:
+        digits.append(0x80 | (value & 0x7F))
+        value >>= 7
+
+    buffer += bytes(reversed(digits))
+
+
+def __map_file(stack: ExitStack, path: Path) -> Buffer:
+    """
+    Memory-maps a file for reading. The map is closed when the stack is closed.
+
+    Args:
+        stack (ExitStack): The stack that owns the map.
+        path (Path): Path to the file.
+
+    Returns:
+        Buffer: The mapped file
+    """
+
+    file: BinaryIO = stack.enter_context(open(path, "rb"))
+
+    # empty files can't be mapped
+    try:
+        return stack.enter_context(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+    except ValueError:
+        return b""
+
+
+def __decode(delta: Buffer, source: Buffer, target_file: BinaryIO) -> None:
+    if delta[:4] != MAGIC:
+        raise ValueError("Not a VCDIFF file or unsupported version.")
+
+    header_indicator: int = delta[4]
+    pos: int = 5
+
+    if header_indicator & VCD_DECOMPRESS:
+        raise NotImplementedError("Secondary compression is not supported.")
+    if header_indicator & VCD_CODETABLE:
+        raise NotImplementedError("Custom code tables are not supported.")
+    if header_indicator & VCD_APPHEADER:
+        app_header_length: int
+        app_header_length, pos = __read_int(delta, pos)
+        pos += app_header_length
+
+    while pos < len(delta):
+        pos = __decode_window(delta, pos, source, target_file)
+
+
+def __decode_window(
+    delta: Buffer, pos: int, source: Buffer, target_file: BinaryIO
+) -> int:
+    """
+    Decodes a single window and appends it to the target file.
+
+    Args:
+        delta (Buffer): The delta.
+        pos (int): Position of the window in the delta.
+        source (Buffer): The source file.
+        target_file (BinaryIO): The target file.
+
+    Returns:
+        int: The position of the next window
+    """
+
+    window_indicator: int = delta[pos]
+    pos += 1
+
+    segment: Buffer = b""
+    segment_pos: int = 0
+    segment_size: int = 0
+    if window_indicator & VCD_SOURCE and window_indicator & VCD_TARGET:
+        raise ValueError("Window copies from source and target.")
+    elif window_indicator & (VCD_SOURCE | VCD_TARGET):
+        segment_size, pos = __read_int(delta, pos)
+        segment_pos, pos = __read_int(delta, pos)
+
+        if window_indicator & VCD_SOURCE:
+            if segment_pos + segment_size > len(source):
+                raise ValueError("Source segment is out of range.")
+            segment = source
+        else:
+            target_file.seek(segment_pos)
+            segment = target_file.read(segment_size)
+            target_file.seek(0, 2)
+            if len(segment) != segment_size:
+                raise ValueError("Target segment is out of range.")
+            segment_pos = 0
+
+    # length of the delta encoding, not needed
+    _, pos = __read_int(delta, pos)
+
+    target_size: int
+    target_size, pos = __read_int(delta, pos)
+
+    if delta[pos]:
+        raise NotImplementedError("Secondary compression is not supported.")
+    pos += 1
+
+    data_length: int
+    instructions_length: int
+    addresses_length: int
+    data_length, pos = __read_int(delta, pos)
+    instructions_length, pos = __read_int(delta, pos)
+    addresses_length, pos = __read_int(delta, pos)
+
+    checksum: Optional[int] = None
+    if window_indicator & VCD_ADLER32:
+        checksum = int.from_bytes(delta[pos : pos + 4], "big")
+        pos += 4
+
+    data: bytes = delta[pos : pos + data_length]
+    pos += data_length
+    instructions: bytes = delta[pos : pos + instructions_length]
+    pos += instructions_length
+    addresses: bytes = delta[pos : pos + addresses_length]
+    pos += addresses_length
+
+    window: bytearray = __decode_instructions(
+        segment, segment_pos, segment_size, data, instructions, addresses
+    )
+
+    if len(window) != target_size:
+        raise ValueError(
+            f"Decoded window has {len(window)} byte(s) instead of {target_size}."
+        )
+    if checksum is not None and zlib.adler32(window) != checksum:
+        raise ValueError("Checksum of decoded window doesn't match.")
+
+    target_file.write(window)
+
+    return pos
+
+
+def __decode_instructions(
+    segment: Buffer,
+    segment_pos: int,
+    segment_size: int,
+    data: bytes,
+    instructions: bytes,
+    addresses: bytes,
+) -> bytearray:
+    """
+    Runs the instructions of a window.
+
+    Args:
+        segment (Buffer): The source file or target segment of the window.
+        segment_pos (int): Position of the window's segment in `segment`.
+        segment_size (int): Size of the window's segment.
+        data (bytes): The data section of the window.
+        instructions (bytes): The instructions section of the window.
+        addresses (bytes): The addresses section of the window.
+
+    Returns:
+        bytearray: The target data of the window
+    """
+
+    window = bytearray()
+    near: list[int] = [0] * NEAR_CACHE_SIZE
+    next_near: int = 0
+    same: list[int] = [0] * (SAME_CACHE_SIZE * 256)
+
+    data_pos: int = 0
+    instruction_pos: int = 0
+    address_pos: int = 0
+    while instruction_pos < len(instructions):
+        entry: CodeTableEntry = DEFAULT_CODE_TABLE[instructions[instruction_pos]]
+        instruction_pos += 1
+
+        for instruction, size, mode in entry:
+            if instruction == Instruction.NoOp:
+                continue
+
+            if size == 0:
+                size, instruction_pos = __read_int(instructions, instruction_pos)
+
+            if instruction == Instruction.Add:
+                window += data[data_pos : data_pos + size]
+                data_pos += size
+
+            elif instruction == Instruction.Run:
+                window += data[data_pos : data_pos + 1] * size
+                data_pos += 1
+
+            else:
+                here: int = segment_size + len(window)
+
+                address: int
+                if mode == 0:
+                    address, address_pos = __read_int(addresses, address_pos)
+                elif mode == 1:
+                    address, address_pos = __read_int(addresses, address_pos)
+                    address = here - address
+                elif mode < 2 + NEAR_CACHE_SIZE:
+                    address, address_pos = __read_int(addresses, address_pos)
+                    address += near[mode - 2]
+                else:
+                    mode -= 2 + NEAR_CACHE_SIZE
+                    address = same[mode * 256 + addresses[address_pos]]
+                    address_pos += 1
+
+                near[next_near] = address
+                next_near = (next_near + 1) % NEAR_CACHE_SIZE
+                same[address % len(same)] = address
+
+                if not 0 <= address < here:
+                    raise ValueError(f"Invalid copy address {address}.")
+
+                # copy from the segment first and continue in the target window
+                start: int = 0
+                if address < segment_size:
+                    count: int = min(size, segment_size - address)
+                    window += segment[
+                        segment_pos + address : segment_pos + address + count
+                    ]
+                    size -= count
+                else:
+                    start = address - segment_size
+
+                # overlapping copies repeat the copied bytes
+                while size:
+                    count = min(size, len(window) - start)
+                    window += window[start : start + count]
+                    start += count
+                    size -= count
+
+    return window
+
+
+def __read_int(data: Buffer, pos: int) -> tuple[int, int]:
+    """
+    Reads a variable-length integer (base 128, most significant digit first).
+
+    Args:
+        data (Buffer): The data to read from.
+        pos (int): Position of the integer.
+
+    Returns:
+        tuple[int, int]: The integer and the position after it
+    """
+
+    value: int = 0
+    while True:
+        byte: int = data[pos]
+        pos += 1
+        value = (value << 7) | (byte & 0x7F)
+        if not byte & 0x80:
+            return value, pos
@@ -0,0 +1,9 @@
+"""
+Copyright (c) Cutleast
+
+This module contains the name and version of the application. It doesn't import Qt,
+so that they can be used without loading the GUI, for example in the batch mode.
+"""
+
+APP_NAME: str = "Dynamic Interface Patcher"
+APP_VERSION: str = "development"
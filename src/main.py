@@ -4,8 +4,12 @@ Copyright (c) Cutleast
 
 import sys
 from argparse import ArgumentParser, Namespace
+from pathlib import Path
+from typing import Optional
 
-from app import App
+from core import version
+from core.utilities import trace
+from core.utilities.import_profiler import ImportProfiler
 
 
 def __init_argparser() -> ArgumentParser:
@@ -15,7 +19,7 @@ def __init_argparser() -> ArgumentParser:
 
     parser = ArgumentParser(
         prog=sys.executable,
-        description=f"{App.APP_NAME} v{App.APP_VERSION} (c) Cutleast "
+        description=f"{version.APP_NAME} v{version.APP_VERSION} (c) Cutleast "
         "- An automated patcher for UI (swf) files.",
     )
     parser.add_argument(
@@ -53,12 +57,65 @@ def __init_argparser() -> ArgumentParser:
         help="Toggles whether the GUI is shown while patching automatically.",
         action="store_true",
     )
+    parser.add_argument(
+        "--batch",
+        help="Runs the patches of a JSON manifest with 'patch' and 'original' paths or "
+        "all DIP patches in a folder in one session without GUI.",
+    )
+    parser.add_argument(
+        "--batch-original",
+        help="Path to original mod that gets patched by the patches of a folder.",
+    )
+    parser.add_argument(
+        "--profile-startup",
+        help="Logs the time spent importing modules during startup.",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--trace",
+        help="Writes the time spent in each stage and external process to the "
+        "specified JSON file in Chrome trace event format.",
+    )
 
     return parser
 
 
 if __name__ == "__main__":
+    import_profiler: Optional[ImportProfiler] = None
+    if "--profile-startup" in sys.argv:
+        import_profiler = ImportProfiler()
+        import_profiler.install()
+
     parser: ArgumentParser = __init_argparser()
     arg_namespace: Namespace = parser.parse_args()
 
-    sys.exit(App(arg_namespace).exec())
+    if arg_namespace.batch:
+        from core.patcher.__main__ import main as run_headless
+
+        if import_profiler is not None:
+            import_profiler.uninstall()
+
+        try:
+            batch_exit_code: int = run_headless(arg_namespace)
+        finally:
+            # logged after the run since the headless patcher configures the logging
+            if import_profiler is not None:
+                import_profiler.log_report()
+
+        sys.exit(batch_exit_code)
+
+    # only imported after the batch mode, so that it doesn't load Qt
+    from app import App
+
+    if arg_namespace.trace:
+        trace.start_tracing()
+
+    app = App(arg_namespace)
+
+    if import_profiler is not None:
+        import_profiler.uninstall()
+        import_profiler.log_report()
+
+    exit_code: int = app.exec()
+    trace.stop_tracing(Path(arg_namespace.trace) if arg_namespace.trace else None)
+    sys.exit(exit_code)
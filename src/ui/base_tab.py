@@ -25,6 +25,15 @@ class BaseTab(QWidget):
         StatusUpdate: The status update to reflect in the UI.
     """
 
+    progress_signal = Signal(object)
+    """
+    Signal emitted for every progress event of the running process. Emitted from the
+    thread of the process.
+
+    Args:
+        ProgressEvent: The progress event.
+    """
+
     valid_signal = Signal(bool)
     """
     Signal emitted everytime the validation status of the user input changes.
@@ -3,7 +3,8 @@ Copyright (c) Cutleast
 """
 
 import logging
-from typing import override
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Optional, override
 
 from cutleast_core_lib.core.utilities.logger import Logger
 from cutleast_core_lib.ui.widgets.copy_button import CopyButton
@@ -23,14 +24,18 @@ from PySide6.QtWidgets import (
 
 from core.config.config import Config
 from core.config.patch_creator_config import PatchCreatorConfig
-from core.patch_creator.patch_creator import PatchCreator
 from core.patcher.patcher import Patcher
+from core.utilities.progress import ProgressEvent, StageStarted
 from core.utilities.status_update import StatusUpdate
 
 from .base_tab import BaseTab
-from .patch_creator_widget import PatchCreatorWidget
 from .patcher_widget import PatcherWidget
 
+if TYPE_CHECKING:
+    from core.patch_creator.patch_creator import PatchCreator
+
+    from .patch_creator_widget import PatchCreatorWidget
+
 
 class MainWidget(QWidget):
     """
@@ -43,13 +48,14 @@ class MainWidget(QWidget):
     config: Config
     patch_creator_config: PatchCreatorConfig
     patcher: Patcher
-    patch_creator: PatchCreator
+    get_patch_creator: Callable[[], "PatchCreator"]
 
     __vlayout: QVBoxLayout
 
     __tab_widget: QTabWidget
     __patcher_widget: PatcherWidget
-    __patch_creator_widget: PatchCreatorWidget
+    __patch_creator_widget: Optional["PatchCreatorWidget"] = None
+    """Created when its tab is opened for the first time."""
     __protocol_widget: QTextEdit
     __progress_bar: QProgressBar
     __run_button: QPushButton
@@ -57,13 +63,22 @@ class MainWidget(QWidget):
     log_signal = Signal(str)
     incr_progress_signal = Signal()
 
+    progress_signal = Signal(object)
+    """
+    Signal emitted for every progress event of the running process and with None when
+    it's finished.
+
+    Args:
+        Optional[ProgressEvent]: The progress event or None.
+    """
+
     def __init__(
         self,
         logger: Logger,
         config: Config,
         patch_creator_config: PatchCreatorConfig,
         patcher: Patcher,
-        patch_creator: PatchCreator,
+        get_patch_creator: Callable[[], "PatchCreator"],
     ) -> None:
         super().__init__()
 
@@ -71,12 +86,12 @@ class MainWidget(QWidget):
         self.config = config
         self.patch_creator_config = patch_creator_config
         self.patcher = patcher
-        self.patch_creator = patch_creator
+        self.get_patch_creator = get_patch_creator
 
         self.__init_ui()
 
         self.__patcher_widget.status_signal.connect(self.__handle_status_update)
-        self.__patch_creator_widget.status_signal.connect(self.__handle_status_update)
+        self.__patcher_widget.progress_signal.connect(self.__handle_progress)
         self.logger.set_callback(self.log_signal.emit)
         self.log_signal.connect(self.__handle_log_message)
         self.incr_progress_signal.connect(
@@ -109,10 +124,29 @@ class MainWidget(QWidget):
         self.__patcher_widget = PatcherWidget(self.config, self.patcher)
         self.__tab_widget.addTab(self.__patcher_widget, "Patcher")
 
+        # the patch creator is only loaded if its tab is opened
+        self.__tab_widget.addTab(QWidget(), "Patch Creator")
+        self.__tab_widget.currentChanged.connect(self.__on_tab_changed)
+
+    def __on_tab_changed(self, index: int) -> None:
+        if index != 1 or self.__patch_creator_widget is not None:
+            return
+
+        from .patch_creator_widget import PatchCreatorWidget
+
         self.__patch_creator_widget = PatchCreatorWidget(
-            self.config, self.patch_creator_config, self.patch_creator
+            self.config, self.patch_creator_config, self.get_patch_creator()
         )
-        self.__tab_widget.addTab(self.__patch_creator_widget, "Patch Creator")
+        self.__patch_creator_widget.status_signal.connect(self.__handle_status_update)
+        self.__patch_creator_widget.progress_signal.connect(self.__handle_progress)
+
+        placeholder: QWidget = self.__tab_widget.widget(index)
+        self.__tab_widget.blockSignals(True)
+        self.__tab_widget.removeTab(index)
+        self.__tab_widget.insertTab(index, self.__patch_creator_widget, "Patch Creator")
+        self.__tab_widget.setCurrentIndex(index)
+        self.__tab_widget.blockSignals(False)
+        placeholder.deleteLater()
 
     def __init_protocol_widget(self) -> None:
         self.__protocol_widget = QTextEdit()
@@ -192,9 +226,20 @@ class MainWidget(QWidget):
                 self.__run_button.clicked.connect(self.__run)
 
                 self.__tab_widget.setDisabled(False)
+                self.progress_signal.emit(None)
 
         self.update()
 
+    def __handle_progress(self, event: ProgressEvent) -> None:
+        # stages without files are shown as busy
+        if event.items_total > 0:
+            self.__progress_bar.setRange(0, event.items_total)
+            self.__progress_bar.setValue(event.items_done)
+        elif isinstance(event, StageStarted):
+            self.__progress_bar.setRange(0, 0)
+
+        self.progress_signal.emit(event)
+
     @override
     def update(self) -> None:  # type: ignore
         self.style().unpolish(self)
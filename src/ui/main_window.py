@@ -2,7 +2,8 @@
 Copyright (c) Cutleast
 """
 
-from typing import override
+from collections.abc import Callable
+from typing import TYPE_CHECKING, override
 
 from cutleast_core_lib.core.utilities.logger import Logger
 from cutleast_core_lib.ui.widgets.about_dialog import AboutDialog
@@ -11,7 +12,6 @@ from PySide6.QtWidgets import QApplication, QMainWindow, QMessageBox
 
 from core.config.config import Config
 from core.config.patch_creator_config import PatchCreatorConfig
-from core.patch_creator.patch_creator import PatchCreator
 from core.patcher.patcher import Patcher
 from core.utilities.licenses import LICENSES
 
@@ -19,6 +19,9 @@ from .main_widget import MainWidget
 from .menubar import MenuBar
 from .statusbar import StatusBar
 
+if TYPE_CHECKING:
+    from core.patch_creator.patch_creator import PatchCreator
+
 
 class MainWindow(QMainWindow):
     """
@@ -34,13 +37,13 @@ class MainWindow(QMainWindow):
         config: Config,
         patch_creator_config: PatchCreatorConfig,
         patcher: Patcher,
-        patch_creator: PatchCreator,
+        get_patch_creator: Callable[[], "PatchCreator"],
     ) -> None:
         super().__init__()
 
         self.resize(1000, 600)
 
-        self.__init_ui(logger, config, patch_creator_config, patcher, patch_creator)
+        self.__init_ui(logger, config, patch_creator_config, patcher, get_patch_creator)
 
         self.__menu_bar.exit_signal.connect(self.close)
         self.__menu_bar.about_signal.connect(self.__show_about)
@@ -52,11 +55,11 @@ class MainWindow(QMainWindow):
         config: Config,
         patch_creator_config: PatchCreatorConfig,
         patcher: Patcher,
-        patch_creator: PatchCreator,
+        get_patch_creator: Callable[[], "PatchCreator"],
     ) -> None:
         self.__init_menu_bar()
         self.__init_main_widget(
-            logger, config, patch_creator_config, patcher, patch_creator
+            logger, config, patch_creator_config, patcher, get_patch_creator
         )
         self.__init_status_bar()
 
@@ -70,16 +73,17 @@ class MainWindow(QMainWindow):
         config: Config,
         patch_creator_config: PatchCreatorConfig,
         patcher: Patcher,
-        patch_creator: PatchCreator,
+        get_patch_creator: Callable[[], "PatchCreator"],
     ) -> None:
         self.__main_widget = MainWidget(
-            logger, config, patch_creator_config, patcher, patch_creator
+            logger, config, patch_creator_config, patcher, get_patch_creator
         )
         self.setCentralWidget(self.__main_widget)
 
     def __init_status_bar(self) -> None:
         self.__status_bar = StatusBar()
         self.setStatusBar(self.__status_bar)
+        self.__main_widget.progress_signal.connect(self.__status_bar.set_progress)
 
     @override
     def closeEvent(self, event: QCloseEvent) -> None:
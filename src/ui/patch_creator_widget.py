@@ -8,7 +8,13 @@ from typing import Optional, override
 
 from cutleast_core_lib.core.utilities.thread import Thread
 from cutleast_core_lib.ui.widgets.browse_edit import BrowseLineEdit
-from PySide6.QtWidgets import QApplication, QFileDialog, QFormLayout, QMessageBox
+from PySide6.QtWidgets import (
+    QApplication,
+    QCheckBox,
+    QFileDialog,
+    QFormLayout,
+    QMessageBox,
+)
 
 from core.config.config import Config
 from core.config.patch_creator_config import PatchCreatorConfig
@@ -33,6 +39,7 @@ class PatchCreatorWidget(BaseTab):
     __original_path_entry: BrowseLineEdit
     __patched_path_entry: BrowseLineEdit
     __output_path_entry: BrowseLineEdit
+    __watch_checkbox: QCheckBox
 
     def __init__(
         self,
@@ -58,6 +65,7 @@ class PatchCreatorWidget(BaseTab):
         self.__original_path_entry.pathChanged.connect(lambda _, __: self.__on_change())
         self.__patched_path_entry.pathChanged.connect(lambda _, __: self.__on_change())
         self.__output_path_entry.pathChanged.connect(lambda _, __: self.__on_change())
+        self.patch_creator.progress.add_listener(self.progress_signal.emit)
 
         self.status_signal.emit(StatusUpdate.Ready)
 
@@ -83,6 +91,15 @@ class PatchCreatorWidget(BaseTab):
         self.__output_path_entry.setFileMode(QFileDialog.FileMode.Directory)
         flayout.addRow("Path to output folder:", self.__output_path_entry)
 
+        self.__watch_checkbox = QCheckBox(
+            "Watch patched mod for changes and update the patch automatically"
+        )
+        self.__watch_checkbox.setToolTip(
+            "Keeps running after the patch was created and only updates the patch "
+            "files of SWF files that are saved again.\nClick on Cancel to stop watching."
+        )
+        flayout.addRow(self.__watch_checkbox)
+
     def __on_change(self) -> None:
         original_path: Optional[Path] = self.__original_path_entry.getPath(
             absolute=True
@@ -98,6 +115,7 @@ class PatchCreatorWidget(BaseTab):
         self.__original_path_entry.setEnabled(enabled)
         self.__patched_path_entry.setEnabled(enabled)
         self.__output_path_entry.setEnabled(enabled)
+        self.__watch_checkbox.setEnabled(enabled)
 
     @override
     def run(self) -> None:
@@ -106,11 +124,18 @@ class PatchCreatorWidget(BaseTab):
 
         self.status_signal.emit(StatusUpdate.Running)
 
-        self._thread = Thread(
-            lambda: self.patch_creator.create_patch(patched_path, original_path),
-            "PatchCreatorThread",
-            self,
-        )
+        if self.__watch_checkbox.isChecked():
+            self._thread = Thread(
+                lambda: self.patch_creator.watch_patch(patched_path, original_path),
+                "PatchCreatorThread",
+                self,
+            )
+        else:
+            self._thread = Thread(
+                lambda: self.patch_creator.create_patch(patched_path, original_path),
+                "PatchCreatorThread",
+                self,
+            )
         self._thread.finished.connect(self.__on_done)
         self._thread.start()
 
@@ -144,6 +169,11 @@ class PatchCreatorWidget(BaseTab):
 
     @override
     def cancel(self) -> None:
+        # Let the watch mode finish gracefully instead of terminating it
+        if self.patch_creator.is_watching():
+            self.patch_creator.stop_watching()
+            return
+
         if self._thread is not None:
             self._thread.terminate()
             self._thread = None
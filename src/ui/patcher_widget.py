@@ -5,11 +5,11 @@ Copyright (c) Cutleast
 import logging
 import os
 from pathlib import Path
-from typing import override
+from typing import Optional, override
 
 from cutleast_core_lib.core.utilities.thread import Thread
 from cutleast_core_lib.ui.utilities.icon_provider import IconProvider
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, Signal
 from PySide6.QtWidgets import (
     QApplication,
     QCheckBox,
@@ -25,7 +25,7 @@ from PySide6.QtWidgets import (
 
 from core.config.config import Config
 from core.patch.patch_provider import PatchProvider
-from core.patcher.patcher import Patcher
+from core.patcher.patcher import PatchCancelledError, Patcher
 from core.utilities.filesystem import is_dir
 from core.utilities.status_update import StatusUpdate
 
@@ -39,6 +39,14 @@ class PatcherWidget(BaseTab):
 
     log: logging.Logger = logging.getLogger("Patcher")
 
+    patch_found_signal = Signal(str)
+    """
+    Signal emitted from the scan thread for every patch that is found.
+
+    Args:
+        str: The path to the found patch.
+    """
+
     config: Config
     patcher: Patcher
     cwd_path: Path = Path.cwd()
@@ -46,6 +54,7 @@ class PatcherWidget(BaseTab):
     __patch_path_entry: QComboBox
     __mod_path_entry: QComboBox
     __repack_checkbox: QCheckBox
+    __scan_thread: Optional[Thread[None]] = None
 
     def __init__(self, config: Config, patcher: Patcher) -> None:
         super().__init__()
@@ -55,6 +64,7 @@ class PatcherWidget(BaseTab):
 
         self.__init_ui()
 
+        self.patcher.progress.add_listener(self.progress_signal.emit)
         self.status_signal.emit(StatusUpdate.Ready)
 
     def __init_ui(self) -> None:
@@ -142,7 +152,10 @@ class PatcherWidget(BaseTab):
         self.config.repack_bsas = self.__repack_checkbox.isChecked()
 
     def __init_entries(self) -> None:
-        self.__patch_path_entry.addItems(PatchProvider.get_patches())
+        # the patches are added while the scan is running
+        self.patch_found_signal.connect(self.__add_patch)
+        self.__scan_thread = Thread(self.__scan_patches, "PatchScanThread", self)
+        self.__scan_thread.start()
 
         # If the current working directory is the data folder,
         # set the mod path to the parent folder
@@ -158,6 +171,20 @@ class PatcherWidget(BaseTab):
         if self.config.original_path is not None:
             self.__mod_path_entry.setCurrentText(str(self.config.original_path))
 
+    def __scan_patches(self) -> None:
+        roots: Optional[list[Path]] = self.config.patch_search_paths or None
+
+        for patch in PatchProvider.scan(roots, self.config.patch_search_depth):
+            self.patch_found_signal.emit(str(patch))
+
+    def __add_patch(self, patch: str) -> None:
+        current_text: str = self.__patch_path_entry.currentText()
+        self.__patch_path_entry.addItem(patch)
+
+        # keep a path that was already entered or configured
+        if current_text:
+            self.__patch_path_entry.setCurrentText(current_text)
+
     def __validate(self) -> None:
         patch_path = Path(self.__patch_path_entry.currentText()).resolve()
         mod_path = Path(self.__mod_path_entry.currentText()).resolve()
@@ -194,6 +221,16 @@ class PatcherWidget(BaseTab):
         duration: float | Exception = self._thread.get_result()
         self._thread = None
 
+        if isinstance(duration, PatchCancelledError):
+            self.__mod_path_entry.setEnabled(True)
+            self.__patch_path_entry.setEnabled(True)
+            self.log.warning(
+                "Patch incomplete! It's resumed from where it was cancelled when it's "
+                "run again."
+            )
+            self.status_signal.emit(StatusUpdate.Failed)
+            return
+
         if isinstance(duration, Exception):
             self.log.error(f"Failed to patch: {duration}", exc_info=duration)
             self.status_signal.emit(StatusUpdate.Failed)
@@ -244,10 +281,7 @@ class PatcherWidget(BaseTab):
 
     @override
     def cancel(self) -> None:
+        # the run stops cooperatively before its next stage and reports back via
+        # on_done(), so that its checkpoint is consistent
         if self._thread is not None:
-            self._thread.terminate()
-            self._thread = None
-
-        self.__mod_path_entry.setEnabled(True)
-        self.__patch_path_entry.setEnabled(True)
-        self.log.warning("Patch incomplete!")
+            self.patcher.cancel()
@@ -2,9 +2,13 @@
 Copyright (c) Cutleast
 """
 
+from typing import Optional
+
 from PySide6.QtGui import Qt
 from PySide6.QtWidgets import QLabel, QStatusBar
 
+from core.utilities.progress import ProgressEvent, format_duration
+
 
 class StatusBar(QStatusBar):
     """
@@ -13,9 +17,14 @@ class StatusBar(QStatusBar):
 
     DOCS_URL: str = "https://github.com/Cutleast/Dynamic-Interface-Patcher/blob/main/DOCUMENTATION.md"
 
+    __progress_label: QLabel
+
     def __init__(self) -> None:
         super().__init__()
 
+        self.__progress_label = QLabel()
+        self.addWidget(self.__progress_label)
+
         docs_label = QLabel(
             self.tr(
                 "Interested in creating own patches? Read the documentation "
@@ -26,3 +35,24 @@ class StatusBar(QStatusBar):
         docs_label.setAlignment(Qt.AlignmentFlag.AlignRight)
         docs_label.setOpenExternalLinks(True)
         self.addPermanentWidget(docs_label)
+
+    def set_progress(self, event: Optional[ProgressEvent]) -> None:
+        """
+        Shows the current stage of a running process with its progress and ETA.
+
+        Args:
+            event (Optional[ProgressEvent]):
+                The latest progress event or None to clear the progress.
+        """
+
+        if event is None:
+            self.__progress_label.clear()
+            return
+
+        text: str = event.stage
+        if event.items_total > 1:
+            text += f" ({event.items_done}/{event.items_total})"
+        if event.eta is not None:
+            text += " - " + self.tr("{0} remaining").format(format_duration(event.eta))
+
+        self.__progress_label.setText(text)
@@ -0,0 +1,52 @@
+"""
+Copyright (c) Cutleast
+"""
+
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+from core.bench.original_mod import create_original_xml
+from core.patch.patch_data import PatchData
+from core.patch.patch_file import PatchFile
+from core.patch.patch_type import PatchType
+from core.utilities.xml_utils import split_frames
+from tests.base_test import BaseTest
+
+
+class TestOriginalMod(BaseTest):
+    """
+    Tests `core.bench.original_mod`.
+    """
+
+    def test_create_original_xml(self) -> None:
+        """
+        Tests that every element addressed by the patch data is found exactly once
+        after splitting the frames of the created XML.
+        """
+
+        # given
+        sprite: str = "/tags/item[@type='DefineSpriteTag'][@spriteId='12']/subTags"
+        filters: list[str] = [
+            f"{sprite}/frame[@frameId='3']/subTags/item[@type='PlaceObject2Tag']"
+            "[@depth='1']/matrix",
+            f"{sprite}/frame[@frameId='1']/subTags/item[@type='PlaceObject2Tag']"
+            "[@depth='1']",
+            "/tags/item[@type='DefineEditTextTag'][@characterID='4']",
+        ]
+        file = PatchFile(
+            path=Path("interface") / "hudmenu.json",
+            type=PatchType.Json,
+            optional=False,
+            shapes={Path("example.svg"): [1, 2]},
+            data=PatchData((filter, {"translateX": "20"}) for filter in filters),
+        )
+
+        # when
+        root: ET.Element = create_original_xml(file)
+
+        # then
+        assert len(root.findall(".//item[@type='ShowFrameTag']")) == 3
+        assert len(root.findall(".//item[@type='DefineShapeTag']")) == 2
+        split_root: ET.Element = split_frames(root)
+        for filter in filters:
+            assert len(split_root.findall("." + filter)) == 1
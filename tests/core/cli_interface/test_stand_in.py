@@ -0,0 +1,123 @@
+"""
+Copyright (c) Cutleast
+"""
+
+import subprocess
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+import pytest
+
+from core.cli_interface import stand_in
+from tests.base_test import BaseTest
+
+
+class TestStandIn(BaseTest):
+    """
+    Tests `core.cli_interface.stand_in`.
+    """
+
+    XML: bytes = (
+        b'<swf type="SWF"><tags>'
+        b'<item type="DefineShapeTag" shapeId="1"><shapes><shapeRecords>'
+        b'<item type="EndShapeRecord" /></shapeRecords></shapes></item>'
+        b'<item type="DefineShapeTag" shapeId="2"><shapes><shapeRecords>'
+        b'<item type="StraightEdgeRecord" deltaX="20" deltaY="0" />'
+        b'<item type="EndShapeRecord" /></shapeRecords></shapes></item>'
+        b"</tags></swf>"
+    )
+
+    @pytest.fixture(autouse=True)
+    def no_cost(self) -> None:
+        """
+        Disables the simulated cost of the stand-ins.
+        """
+
+        stand_in.set_cost(0.0, 0.0)
+
+    @staticmethod
+    def run(tool: str, *args: Path | str) -> None:
+        """
+        Runs a stand-in like the tool interfaces do.
+
+        Args:
+            tool (str): "ffdec" or "xdelta".
+            *args (Path | str): The arguments of the real tool.
+        """
+
+        subprocess.run(
+            stand_in.get_command(tool) + [str(arg) for arg in args], check=True
+        )
+
+    def test_swf2xml_xml2swf(self, tmp_path: Path) -> None:
+        """
+        Tests that stand-in SWF files are converted to XML and back.
+        """
+
+        # given
+        swf_file: Path = tmp_path / "hudmenu.swf"
+        xml_file: Path = tmp_path / "hudmenu.xml"
+        stand_in.write_swf(TestStandIn.XML, swf_file)
+
+        # when
+        TestStandIn.run("ffdec", "-swf2xml", swf_file, xml_file)
+        swf_file.unlink()
+        TestStandIn.run("ffdec", "-xml2swf", xml_file, swf_file)
+
+        # then
+        assert swf_file.read_bytes().startswith(b"CWS")
+        assert xml_file.read_bytes() == TestStandIn.XML
+        assert stand_in.read_swf(swf_file) == TestStandIn.XML
+
+    def test_invalid_swf(self, tmp_path: Path) -> None:
+        """
+        Tests that the stand-in fails for files that are not stand-in SWF files.
+        """
+
+        # given
+        swf_file: Path = tmp_path / "hudmenu.swf"
+        swf_file.write_bytes(b"FWS\x0f")
+
+        # then
+        with pytest.raises(subprocess.CalledProcessError):
+            TestStandIn.run("ffdec", "-swf2xml", swf_file, tmp_path / "hudmenu.xml")
+
+    def test_export_replace_shapes(self, tmp_path: Path) -> None:
+        """
+        Tests that exported shapes replace the shapes of another file.
+        """
+
+        # given
+        patched_swf_file: Path = tmp_path / "Patch" / "hudmenu.swf"
+        original_swf_file: Path = tmp_path / "Original" / "hudmenu.swf"
+        shapes_path: Path = tmp_path / "Shapes"
+        patched_swf_file.parent.mkdir()
+        original_swf_file.parent.mkdir()
+        stand_in.write_swf(TestStandIn.XML, patched_swf_file)
+        stand_in.write_swf(
+            TestStandIn.XML.replace(b'deltaX="20"', b'deltaX="10"'), original_swf_file
+        )
+
+        # when
+        TestStandIn.run(
+            "ffdec",
+            "-format",
+            "shape:svg",
+            "-selectid",
+            "2",
+            "-export",
+            "shape",
+            shapes_path,
+            patched_swf_file,
+        )
+        cmd_file: Path = tmp_path / "shapes.txt"
+        cmd_file.write_text(f"2\n{shapes_path / '2.svg'}\n")
+        TestStandIn.run(
+            "ffdec", "-replace", original_swf_file, original_swf_file, cmd_file
+        )
+
+        # then
+        assert [path.name for path in shapes_path.iterdir()] == ["2.svg"]
+        assert ET.canonicalize(stand_in.read_swf(original_swf_file)) == ET.canonicalize(
+            TestStandIn.XML
+        )
@@ -0,0 +1,71 @@
+"""
+Copyright (c) Cutleast
+"""
+
+from pathlib import Path
+
+import pytest
+
+from core.patch.patch import Patch
+from core.patch.patch_type import PatchType
+from tests.base_test import BaseTest
+
+
+class TestPatch(BaseTest):
+    """
+    Tests `core.patch.patch.Patch`.
+    """
+
+    @staticmethod
+    def create_patch(patch_path: Path, json_files: int) -> None:
+        """
+        Creates a patch with the specified number of JSON files, a binary patch file
+        and an invalid JSON file.
+
+        Args:
+            patch_path (Path): Path to the patch's root folder.
+            json_files (int): Number of valid JSON files.
+        """
+
+        patch_folder: Path = patch_path / "Patch" / "interface"
+        patch_folder.mkdir(parents=True)
+
+        for i in range(json_files):
+            (patch_folder / f"menu{i}.json").write_text(
+                '{"optional": true, "swf": {"displayRect": {"~Xmax": "%d"}}}' % i,
+                encoding="utf-8",
+            )
+
+        (patch_folder / "invalid.json").write_text("{", encoding="utf-8")
+        (patch_folder / "menu.bin").write_bytes(b"")
+
+    @pytest.mark.parametrize("use_cache", [False, True])
+    @pytest.mark.parametrize("lazy", [False, True])
+    def test_load_parallel(self, tmp_path: Path, use_cache: bool, lazy: bool) -> None:
+        """
+        Tests that a patch is loaded in parallel with the same result as serially and
+        that an invalid file is skipped.
+
+        Args:
+            use_cache (bool): Whether to use the patch cache.
+            lazy (bool): Whether to load the patch data lazily.
+        """
+
+        # given
+        TestPatch.create_patch(tmp_path, Patch.PARALLEL_THRESHOLD)
+
+        # when
+        serial_patch: Patch = Patch.load(tmp_path, use_cache=False, workers=1)
+        parallel_patch: Patch = Patch.load(
+            tmp_path, use_cache=use_cache, lazy=lazy, workers=2
+        )
+
+        # then
+        assert len(parallel_patch.files) == Patch.PARALLEL_THRESHOLD + 1
+        assert [f.path for f in parallel_patch.files] == [
+            f.path for f in serial_patch.files
+        ]
+        assert [f.data for f in parallel_patch.files] == [
+            f.data for f in serial_patch.files
+        ]
+        assert [f.type for f in parallel_patch.files].count(PatchType.Binary) == 1
@@ -0,0 +1,242 @@
+"""
+Copyright (c) Cutleast
+"""
+
+import hashlib
+import hmac
+import os
+import sys
+from pathlib import Path
+from typing import Optional
+
+import pytest
+
+from core.patch.patch_cache import PatchCache
+from core.patch.patch_file import PatchFile
+from core.patch.patch_item import PatchItem
+from tests.base_test import BaseTest
+
+
+class TestPatchCache(BaseTest):
+    """
+    Tests `core.patch.patch_cache.PatchCache`.
+    """
+
+    PATCH_JSON: str = """
+    {
+        // comment
+        "optional": true,
+        "shapes": [{"id": "1,2", "fileName": "example.svg"}],
+        "swf": {"displayRect": {"~Xmax": "25600"}}
+    }
+    """
+
+    @staticmethod
+    def create_patch(patch_path: Path) -> Path:
+        """
+        Creates a patch with a single JSON file at the specified path.
+
+        Args:
+            patch_path (Path): Path to the patch's root folder.
+
+        Returns:
+            Path: Path to the JSON file
+        """
+
+        json_file: Path = patch_path / "Patch" / "interface" / "hudmenu.json"
+        json_file.parent.mkdir(parents=True)
+        json_file.write_text(TestPatchCache.PATCH_JSON, encoding="utf-8")
+
+        return json_file
+
+    def test_load_file(self, tmp_path: Path) -> None:
+        """
+        Tests that a patch file is loaded from a saved cache.
+        """
+
+        # given
+        json_file: Path = TestPatchCache.create_patch(tmp_path)
+        expected_file: PatchFile = PatchFile.load(json_file, tmp_path / "Patch")
+        cache = PatchCache(tmp_path)
+        cache.load_file(json_file, tmp_path / "Patch")
+        cache.save()
+
+        # when
+        # change the file without changing its size and modification time
+        stat: os.stat_result = os.stat(json_file)
+        json_file.write_bytes(b"x" * stat.st_size)
+        os.utime(json_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        actual_file: PatchFile = PatchCache(tmp_path).load_file(
+            json_file, tmp_path / "Patch"
+        )
+
+        # then
+        assert (tmp_path / PatchCache.FILE_NAME).is_file()
+        assert actual_file == expected_file
+
+    def test_load_changed_file(self, tmp_path: Path) -> None:
+        """
+        Tests that a changed patch file is loaded again instead of from the cache.
+        """
+
+        # given
+        json_file: Path = TestPatchCache.create_patch(tmp_path)
+        cache = PatchCache(tmp_path)
+        cache.load_file(json_file, tmp_path / "Patch")
+        cache.save()
+
+        # when
+        json_file.write_text(
+            TestPatchCache.PATCH_JSON.replace("25600", "12800"), encoding="utf-8"
+        )
+        actual_file: PatchFile = PatchCache(tmp_path).load_file(
+            json_file, tmp_path / "Patch"
+        )
+
+        # then
+        assert actual_file.data == [
+            PatchItem(filter="/displayRect", changes={"Xmax": "12800"})
+        ]
+
+    def test_load_file_lazy(self, tmp_path: Path) -> None:
+        """
+        Tests that the patch data of a lazily loaded cached file is only unpickled when
+        it's accessed and that this doesn't change the cache entry.
+        """
+
+        # given
+        json_file: Path = TestPatchCache.create_patch(tmp_path)
+        cache = PatchCache(tmp_path)
+        cache.load_file(json_file, tmp_path / "Patch")
+        cache.save()
+        cache = PatchCache(tmp_path)
+
+        # when
+        first_file: PatchFile = cache.load_file(
+            json_file, tmp_path / "Patch", lazy=True
+        )
+        first_file.data = []
+        second_file: PatchFile = cache.load_file(
+            json_file, tmp_path / "Patch", lazy=True
+        )
+
+        # then
+        assert second_file.has_data
+        assert second_file.data == [
+            PatchItem(filter="/displayRect", changes={"Xmax": "25600"})
+        ]
+
+    def test_get_file_with_content(self, tmp_path: Path) -> None:
+        """
+        Tests that a cached file whose modification time changed is only returned if
+        its content is given and matches the cached digest.
+        """
+
+        # given
+        json_file: Path = TestPatchCache.create_patch(tmp_path)
+        cache = PatchCache(tmp_path)
+        cache.load_file(json_file, tmp_path / "Patch")
+
+        # when
+        os.utime(json_file, ns=(0, 0))
+        without_content: Optional[PatchFile] = cache.get_file(
+            json_file, tmp_path / "Patch"
+        )
+        with_content: Optional[PatchFile] = cache.get_file(
+            json_file, tmp_path / "Patch", json_file.read_bytes()
+        )
+
+        # then
+        assert without_content is None
+        assert with_content == PatchFile.load(json_file, tmp_path / "Patch")
+
+    def test_foreign_cache_is_ignored(self, tmp_path: Path) -> None:
+        """
+        Tests that a cache file that wasn't signed by the current user is ignored.
+        """
+
+        # given
+        json_file: Path = TestPatchCache.create_patch(tmp_path)
+        cache = PatchCache(tmp_path)
+        cache.load_file(json_file, tmp_path / "Patch")
+        cache.save()
+
+        # when
+        cache_file: Path = tmp_path / PatchCache.FILE_NAME
+        data = bytearray(cache_file.read_bytes())
+        data[-1] ^= 0xFF
+        cache_file.write_bytes(bytes(data))
+        json_file.write_text(
+            TestPatchCache.PATCH_JSON.replace("25600", "12800"), encoding="utf-8"
+        )
+        os.utime(json_file, ns=(0, 0))
+        actual_file: PatchFile = PatchCache(tmp_path).load_file(
+            json_file, tmp_path / "Patch"
+        )
+
+        # then
+        assert actual_file.data == [
+            PatchItem(filter="/displayRect", changes={"Xmax": "12800"})
+        ]
+
+    @pytest.mark.skipif(sys.platform == "win32", reason="POSIX permissions")
+    def test_untrusted_key_is_replaced(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """
+        Tests that a key file that is accessible by other users isn't used for signing
+        and is replaced with a private one.
+        """
+
+        # given
+        key_path: Path = tmp_path / "key" / "cache.key"
+        key_path.parent.mkdir()
+        planted_key: bytes = b"k" * 32
+        key_path.write_bytes(planted_key)
+        key_path.chmod(0o644)
+        monkeypatch.setattr(PatchCache, "KEY_PATH", key_path)
+        monkeypatch.setattr(PatchCache, "_PatchCache__key", None)
+        json_file: Path = TestPatchCache.create_patch(tmp_path / "patch")
+        cache = PatchCache(tmp_path / "patch")
+        cache.load_file(json_file, tmp_path / "patch" / "Patch")
+
+        # when
+        cache.save()
+
+        # then
+        cache_data: bytes = (tmp_path / "patch" / PatchCache.FILE_NAME).read_bytes()
+        header_size: int = len(PatchCache.MAGIC) + 1
+        signature: bytes = cache_data[header_size : header_size + 32]
+        payload: bytes = cache_data[header_size + 32 :]
+        assert signature != hmac.digest(planted_key, payload, hashlib.sha256)
+        assert key_path.read_bytes() != planted_key
+        assert key_path.stat().st_mode & 0o077 == 0
+
+    def test_deleted_files_are_pruned(self, tmp_path: Path) -> None:
+        """
+        Tests that the entries of deleted patch files are dropped when the cache is
+        saved.
+        """
+
+        # given
+        json_file: Path = TestPatchCache.create_patch(tmp_path)
+        renamed_file: Path = json_file.with_name("renamed.json")
+        cache = PatchCache(tmp_path)
+        cache.load_file(json_file, tmp_path / "Patch")
+        cache.save()
+
+        # when
+        json_file.rename(renamed_file)
+        cache = PatchCache(tmp_path)
+        cache.load_file(renamed_file, tmp_path / "Patch")
+        cache.save()
+        renamed_file.rename(json_file)
+
+        # then
+        # the digest of the old entry would match if it was still cached
+        assert (
+            PatchCache(tmp_path).get_file(
+                json_file, tmp_path / "Patch", json_file.read_bytes()
+            )
+            is None
+        )
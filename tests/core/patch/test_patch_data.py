@@ -0,0 +1,96 @@
+"""
+Copyright (c) Cutleast
+"""
+
+import pickle
+
+from core.patch.patch_data import PatchData
+from core.patch.patch_item import PatchItem
+from tests.base_test import BaseTest
+
+
+class TestPatchData(BaseTest):
+    """
+    Tests `core.patch.patch_data.PatchData`.
+    """
+
+    ITEMS: list[tuple[str, dict[str, str]]] = [
+        ("/displayRect", {"Xmax": "25600"}),
+        (
+            "/tags/item[@type='DefineSpriteTag'][@spriteId='3']/subTags/item[@depth='1']",
+            {"placeFlagHasMatrix": "true"},
+        ),
+        (
+            "./tags/item[@type='DefineSpriteTag'][@spriteId='3']/subTags//item",
+            {"visible": "0"},
+        ),
+        ("/displayRect", {"Ymax": "14400"}),
+        (
+            "/tags/item[@type='DefineSpriteTag'][@spriteId='3']/subTags/item[@depth='1']/matrix",
+            {"scaleX": "0"},
+        ),
+    ]
+
+    def test_items(self) -> None:
+        """
+        Tests that the items are returned exactly and in the order they were added.
+        """
+
+        # given
+        patch_data = PatchData(TestPatchData.ITEMS)
+
+        # when
+        actual_items: list[tuple[str, dict[str, str]]] = list(patch_data.items())
+
+        # then
+        assert actual_items == TestPatchData.ITEMS
+        assert len(patch_data) == len(TestPatchData.ITEMS)
+        assert patch_data[-1] == PatchItem(*TestPatchData.ITEMS[-1])
+        assert patch_data == [PatchItem(*item) for item in TestPatchData.ITEMS]
+
+    def test_shared_prefixes(self) -> None:
+        """
+        Tests that common prefixes of filters are stored only once.
+        """
+
+        # given
+        patch_data = PatchData(TestPatchData.ITEMS)
+
+        # when
+        nodes = [node for node, _, _ in patch_data._PatchData__items]  # type: ignore
+
+        # then
+        assert nodes[0] is nodes[3]
+        assert nodes[4].parent is nodes[1]
+
+    def test_shared_keys(self) -> None:
+        """
+        Tests that the attribute names of items with the same attributes are stored
+        only once per instance.
+        """
+
+        # given
+        first_data = PatchData([("a", {"x": "1"}), ("b", {"x": "2"})])
+        second_data = PatchData([("a", {"x": "1"})])
+
+        # when
+        first_keys = [keys for _, keys, _ in first_data._PatchData__items]  # type: ignore
+        second_keys = [keys for _, keys, _ in second_data._PatchData__items]  # type: ignore
+
+        # then
+        assert first_keys[0] is first_keys[1]
+        assert first_keys[0] is not second_keys[0]
+
+    def test_pickle(self) -> None:
+        """
+        Tests that pickled patch data is restored with the same items.
+        """
+
+        # given
+        patch_data = PatchData(TestPatchData.ITEMS)
+
+        # when
+        actual_data: PatchData = pickle.loads(pickle.dumps(patch_data))
+
+        # then
+        assert actual_data == patch_data
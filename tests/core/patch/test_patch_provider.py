@@ -0,0 +1,96 @@
+"""
+Copyright (c) Cutleast
+"""
+
+from pathlib import Path
+
+from core.patch.patch_provider import PatchIndex, PatchProvider
+from tests.base_test import BaseTest
+
+
+class TestPatchProvider(BaseTest):
+    """
+    Tests `core.patch.patch_provider.PatchProvider`.
+    """
+
+    @staticmethod
+    def create_patch(path: Path, file_name: str = "hudmenu.json") -> None:
+        """
+        Creates a minimal patch at the specified path.
+
+        Args:
+            path (Path): The path to the patch's root folder.
+            file_name (str, optional):
+                The name of the patch file in the "interface" folder. Defaults to
+                "hudmenu.json".
+        """
+
+        patch_file: Path = path / "Patch" / "interface" / file_name
+        patch_file.parent.mkdir(parents=True)
+        patch_file.write_text("{}")
+
+    def test_scan(self, tmp_path: Path) -> None:
+        """
+        Tests that only valid DIP patches up to the maximum depth are found.
+        """
+
+        # given
+        TestPatchProvider.create_patch(tmp_path / "SkyUI DIP Patch")
+        TestPatchProvider.create_patch(tmp_path / "SkyUI")
+        TestPatchProvider.create_patch(tmp_path / "HUD" / "HUD DIP Patch")
+        TestPatchProvider.create_patch(tmp_path / "HUD" / "A" / "Deep DIP Patch")
+        (tmp_path / "Empty DIP Patch" / "Patch").mkdir(parents=True)
+
+        # when
+        patches: list[Path] = list(
+            PatchProvider.scan([tmp_path], max_depth=2, index_path=None)
+        )
+
+        # then
+        assert sorted(patches) == [
+            tmp_path / "HUD" / "HUD DIP Patch",
+            tmp_path / "SkyUI DIP Patch",
+        ]
+
+    def test_scan_index(self, tmp_path: Path) -> None:
+        """
+        Tests that unchanged folders are taken from the index and that changed folders
+        are scanned again.
+        """
+
+        # given
+        mods_path: Path = tmp_path / "mods"
+        index_path: Path = tmp_path / "index.json"
+        TestPatchProvider.create_patch(mods_path / "SkyUI DIP Patch")
+        list(PatchProvider.scan([mods_path], index_path=index_path))
+
+        # when
+        (
+            mods_path / "SkyUI DIP Patch" / "Patch" / "interface" / "hudmenu.json"
+        ).unlink()
+        TestPatchProvider.create_patch(mods_path / "RaceMenu DIP Patch")
+        patches: list[Path] = list(
+            PatchProvider.scan([mods_path], index_path=index_path)
+        )
+
+        # then
+        assert index_path.is_file()
+        assert patches == [mods_path / "RaceMenu DIP Patch"]
+
+    def test_scan_max_depth(self, tmp_path: Path) -> None:
+        """
+        Tests that the subfolders of folders at the maximum depth are not listed.
+        """
+
+        # given
+        mods_path: Path = tmp_path / "mods"
+        index_path: Path = tmp_path / "index.json"
+        (mods_path / "SkyUI" / "interface").mkdir(parents=True)
+
+        # when
+        list(PatchProvider.scan([mods_path], max_depth=1, index_path=index_path))
+
+        # then
+        index: PatchIndex = PatchIndex.model_validate_json(index_path.read_bytes())
+        assert index.folders[str(mods_path)].folders == ["SkyUI"]
+        assert index.folders[str(mods_path / "SkyUI")].folders is None
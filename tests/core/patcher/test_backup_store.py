@@ -0,0 +1,120 @@
+"""
+Copyright (c) Cutleast
+"""
+
+import hashlib
+from pathlib import Path
+
+from core.patcher.backup_store import BackupEntry, BackupStore
+from tests.base_test import BaseTest
+
+
+class TestBackupStore(BaseTest):
+    """
+    Tests `core.patcher.backup_store.BackupStore`.
+    """
+
+    def test_backup(self, tmp_path: Path) -> None:
+        """
+        Tests that identical contents are stored only once and that the index is
+        restored by a new store.
+        """
+
+        # given
+        store = BackupStore(tmp_path, retention=3)
+        file: Path = tmp_path / "interface" / "hudmenu.swf"
+        other_file: Path = tmp_path / "interface" / "map.swf"
+        file.parent.mkdir()
+
+        # when
+        file.write_bytes(b"original")
+        store.backup(file)
+        other_file.write_bytes(b"original")
+        store.backup(other_file)
+        store.save()
+        actual_store = BackupStore(tmp_path, retention=3)
+
+        # then
+        assert not file.exists()
+        assert not other_file.exists()
+        assert len(list(store.objects_path.iterdir())) == 1
+        digest: str = hashlib.sha256(b"original").hexdigest()
+        assert (store.objects_path / digest).read_bytes() == b"original"
+        assert [
+            entry.digest for entry in actual_store.index.files["interface/map.swf"]
+        ] == [digest]
+        assert actual_store.index == store.index
+
+    def test_retention(self, tmp_path: Path) -> None:
+        """
+        Tests that only the newest backups of a file are kept and that contents that
+        are no longer referenced are deleted.
+        """
+
+        # given
+        store = BackupStore(tmp_path, retention=2)
+        file: Path = tmp_path / "hudmenu.swf"
+
+        # when
+        for content in [b"v1", b"v2", b"v3"]:
+            file.write_bytes(content)
+            store.backup(file)
+        store.save()
+
+        # then
+        entries: list[BackupEntry] = store.index.files["hudmenu.swf"]
+        assert [(store.objects_path / e.digest).read_bytes() for e in entries] == [
+            b"v2",
+            b"v3",
+        ]
+        assert len(list(store.objects_path.iterdir())) == 2
+
+    def test_corrupt_index(self, tmp_path: Path) -> None:
+        """
+        Tests that existing backups are kept if the index couldn't be read, also after
+        the index was written again.
+        """
+
+        # given
+        store = BackupStore(tmp_path, retention=1)
+        file: Path = tmp_path / "hudmenu.swf"
+        file.write_bytes(b"v1")
+        store.backup(file)
+        store.save()
+        (store.path / BackupStore.INDEX_FILE_NAME).write_text("{", encoding="utf-8")
+
+        # when
+        store = BackupStore(tmp_path, retention=1)
+        file.write_bytes(b"v2")
+        store.backup(file)
+        store.save()
+        store = BackupStore(tmp_path, retention=1)
+        file.write_bytes(b"v3")
+        store.backup(file)
+        store.save()
+
+        # then
+        assert sorted(p.name for p in store.objects_path.iterdir()) == sorted(
+            hashlib.sha256(content).hexdigest() for content in [b"v1", b"v3"]
+        )
+        assert [e.digest for e in store.index.files["hudmenu.swf"]] == [
+            hashlib.sha256(b"v3").hexdigest()
+        ]
+        assert (store.path / "index.corrupt").is_file()
+
+    def test_is_identical(self, tmp_path: Path) -> None:
+        """
+        Tests the comparison of files by their sizes and digests.
+        """
+
+        # given
+        file: Path = tmp_path / "a.swf"
+        file.write_bytes(b"abc")
+        same_file: Path = tmp_path / "b.swf"
+        same_file.write_bytes(b"abc")
+        other_file: Path = tmp_path / "c.swf"
+        other_file.write_bytes(b"abd")
+
+        # then
+        assert BackupStore.is_identical(file, same_file)
+        assert not BackupStore.is_identical(file, other_file)
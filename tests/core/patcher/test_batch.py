@@ -0,0 +1,139 @@
+"""
+Copyright (c) Cutleast
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from core.patcher.batch import Batch, BatchItem, BatchResult
+from tests.base_test import BaseTest
+
+
+class TestBatch(BaseTest):
+    """
+    Tests `core.patcher.batch.Batch`.
+    """
+
+    def test_load_manifest(self, tmp_path: Path) -> None:
+        """
+        Tests that the paths of a manifest are resolved relative to the manifest.
+        """
+
+        # given
+        manifest: Path = tmp_path / "batch.json"
+        manifest.write_text(
+            json.dumps(
+                [
+                    {"patch": "SkyUI DIP Patch", "original": "SkyUI"},
+                    {"patch": str(tmp_path / "RaceMenu DIP"), "original": "RaceMenu"},
+                ]
+            )
+        )
+
+        # when
+        items: list[BatchItem] = Batch.load(manifest)
+
+        # then
+        assert items == [
+            BatchItem(patch=tmp_path / "SkyUI DIP Patch", original=tmp_path / "SkyUI"),
+            BatchItem(patch=tmp_path / "RaceMenu DIP", original=tmp_path / "RaceMenu"),
+        ]
+
+    def test_load_folder(self, tmp_path: Path) -> None:
+        """
+        Tests that only the valid DIP patches of a folder are loaded in alphabetical
+        order.
+        """
+
+        # given
+        original_path: Path = tmp_path / "Data"
+        for name in ["SkyUI DIP Patch", "RaceMenu DIP Patch", "Empty DIP Patch"]:
+            (tmp_path / name / "Patch").mkdir(parents=True)
+        (tmp_path / "SkyUI DIP Patch" / "Patch" / "hudmenu.json").write_text("{}")
+        (tmp_path / "RaceMenu DIP Patch" / "Patch" / "racesex_menu.bin").write_bytes(
+            b""
+        )
+        (tmp_path / "SkyUI" / "Patch").mkdir(parents=True)
+        (tmp_path / "SkyUI" / "Patch" / "hudmenu.json").write_text("{}")
+
+        # when
+        items: list[BatchItem] = Batch.load(tmp_path, original_path)
+
+        # then
+        assert [item.patch.name for item in items] == [
+            "RaceMenu DIP Patch",
+            "SkyUI DIP Patch",
+        ]
+        assert all(item.original == original_path.resolve() for item in items)
+
+    def test_load_folder_without_original(self, tmp_path: Path) -> None:
+        """
+        Tests that a folder can't be loaded without an original mod path.
+        """
+
+        # then
+        with pytest.raises(ValueError):
+            Batch.load(tmp_path)
+
+    def test_group(self, tmp_path: Path) -> None:
+        """
+        Tests that patches for the same files of the same original mod are grouped
+        transitively and in load order.
+        """
+
+        # given
+        files: dict[str, list[str]] = {
+            "HUD DIP Patch": ["interface/hudmenu.json"],
+            "Map DIP Patch": ["interface/map.json"],
+            "Compass DIP Patch": ["interface/hudmenu.json", "interface/quest.json"],
+            "Quest DIP Patch": ["interface/quest.bin"],
+            "Other HUD DIP Patch": ["interface/hudmenu.json"],
+        }
+        items: list[BatchItem] = []
+        for name, patch_files in files.items():
+            for patch_file in patch_files:
+                path: Path = tmp_path / name / "Patch" / patch_file
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_text("{}")
+            original: str = "Other" if name.startswith("Other") else "SkyUI"
+            items.append(BatchItem(patch=tmp_path / name, original=tmp_path / original))
+
+        # when
+        groups: list[list[BatchItem]] = Batch.group(items)
+
+        # then
+        assert [[item.patch.name for item in group] for group in groups] == [
+            ["HUD DIP Patch", "Compass DIP Patch", "Quest DIP Patch"],
+            ["Map DIP Patch"],
+            ["Other HUD DIP Patch"],
+        ]
+
+    def test_get_summary(self) -> None:
+        """
+        Tests that the summary counts the successful patches and lists the errors.
+        """
+
+        # given
+        results: list[BatchResult] = [
+            BatchResult(
+                item=BatchItem(patch=Path("SkyUI DIP Patch"), original=Path("SkyUI")),
+                duration=1.5,
+            ),
+            BatchResult(
+                item=BatchItem(patch=Path("Broken DIP Patch"), original=Path("Broken")),
+                duration=0.5,
+                error="'hudmenu.swf' is required but does not exist!",
+            ),
+        ]
+
+        # when
+        summary: list[str] = Batch.get_summary(results).splitlines()
+
+        # then
+        assert summary[0] == "1/2 patch(es) succeeded in 2.000 second(s)."
+        assert summary[1].startswith("[OK]")
+        assert summary[2] == (
+            "[FAILED] 'Broken DIP Patch': 'hudmenu.swf' is required but does not exist!"
+        )
@@ -0,0 +1,178 @@
+"""
+Copyright (c) Cutleast
+"""
+
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from core.patcher.checkpoint import Checkpoint
+from tests.base_test import BaseTest
+
+
+class TestCheckpoint(BaseTest):
+    """
+    Tests `core.patcher.checkpoint.Checkpoint`.
+    """
+
+    def test_resume(self, tmp_path: Path) -> None:
+        """
+        Tests that only files with unchanged inputs that weren't interrupted in the
+        middle of a stage are resumed.
+        """
+
+        # given
+        work_folder: Path = tmp_path / "work"
+        checkpoint = Checkpoint(work_folder)
+        checkpoint.resume(
+            {
+                "interface/hudmenu.swf": "a",
+                "interface/map.swf": "b",
+                "interface/quest.swf": "c",
+            }
+        )
+        for file in ["interface/hudmenu.swf", "interface/map.swf"]:
+            with checkpoint.step(file, "Preparing mod files"):
+                pass
+        checkpoint.start("interface/quest.swf", "Preparing mod files")
+
+        # when
+        resumed = Checkpoint(work_folder)
+        reset: list[str] = resumed.resume(
+            {
+                "interface/hudmenu.swf": "a",
+                "interface/map.swf": "changed",
+                "interface/quest.swf": "c",
+            }
+        )
+
+        # then
+        assert reset == ["interface/map.swf", "interface/quest.swf"]
+        assert resumed.is_done("interface/hudmenu.swf", "Preparing mod files")
+        assert not resumed.is_done("interface/map.swf", "Preparing mod files")
+        assert not resumed.is_done("interface/quest.swf", "Preparing mod files")
+
+    def test_failed_step(self, tmp_path: Path) -> None:
+        """
+        Tests that a stage that raised an exception is not completed.
+        """
+
+        # given
+        checkpoint = Checkpoint(tmp_path / "work")
+        checkpoint.resume({"interface/hudmenu.swf": "a"})
+
+        # when
+        with pytest.raises(OSError):
+            with checkpoint.step("interface/hudmenu.swf", "Patching XMLs"):
+                raise OSError
+
+        # then
+        assert not checkpoint.is_done("interface/hudmenu.swf", "Patching XMLs")
+        assert Checkpoint(tmp_path / "work").resume({"interface/hudmenu.swf": "a"}) == [
+            "interface/hudmenu.swf"
+        ]
+
+    def test_folder_without_manifest(self, tmp_path: Path) -> None:
+        """
+        Tests that the files of a work folder without a checkpoint are removed.
+        """
+
+        # given
+        work_folder: Path = tmp_path / "work"
+        (work_folder / "interface").mkdir(parents=True)
+        (work_folder / "interface" / "hudmenu.swf").write_bytes(b"")
+
+        # when
+        Checkpoint(work_folder)
+
+        # then
+        assert work_folder.is_dir()
+        assert not (work_folder / "interface").exists()
+
+    def test_finish(self, tmp_path: Path) -> None:
+        """
+        Tests that a finished checkpoint is removed with or without its files.
+        """
+
+        # given
+        checkpoint = Checkpoint(tmp_path / "kept")
+        checkpoint.resume({"interface/hudmenu.swf": "a"})
+        (tmp_path / "kept" / "hudmenu.swf").write_bytes(b"")
+        removed = Checkpoint(tmp_path / "removed")
+
+        # when
+        checkpoint.finish(keep_files=True)
+        removed.finish()
+
+        # then
+        assert not checkpoint.path.exists()
+        assert (tmp_path / "kept" / "hudmenu.swf").is_file()
+        assert not (tmp_path / "removed").exists()
+
+    def test_get_inputs_digest(self, tmp_path: Path) -> None:
+        """
+        Tests that the digest changes when an input file changes.
+        """
+
+        # given
+        file: Path = tmp_path / "hudmenu.json"
+        file.write_text("{}")
+        digest: str = Checkpoint.get_inputs_digest([file, tmp_path / "missing.swf"])
+
+        # when
+        file.write_text('{"changed": true}')
+
+        # then
+        assert Checkpoint.get_inputs_digest([file, tmp_path / "missing.swf"]) != digest
+
+    def test_get_inputs_digest_hashed(self, tmp_path: Path) -> None:
+        """
+        Tests that the digest changes when a hashed file is rewritten with the same size
+        and modification time.
+        """
+
+        # given
+        file: Path = tmp_path / "hudmenu.json"
+        file.write_text('{"a": 1}')
+        stat: os.stat_result = os.stat(file)
+        digest: str = Checkpoint.get_inputs_digest([], [file])
+
+        # when
+        file.write_text('{"a": 2}')
+        os.utime(file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+        # then
+        assert Checkpoint.get_inputs_digest([], [file]) != digest
+
+    def test_prune(self, tmp_path: Path) -> None:
+        """
+        Tests that only work folders that weren't modified for too long are removed,
+        except for the work folder of the current run.
+        """
+
+        # given
+        now: float = time.time()
+        ages: dict[str, float] = {
+            "current": 30 * 24 * 60 * 60,
+            "recent": 60,
+            "older": 120,
+            "oldest": 180,
+            "outdated": 30 * 24 * 60 * 60,
+        }
+        for name, age in ages.items():
+            checkpoint = Checkpoint(tmp_path / name)
+            checkpoint.resume({"interface/hudmenu.swf": "a"})
+            os.utime(checkpoint.path, (now - age, now - age))
+
+        # when
+        Checkpoint.prune(tmp_path, keep=tmp_path / "current")
+
+        # then
+        assert sorted(folder.name for folder in tmp_path.iterdir()) == [
+            "current",
+            "older",
+            "oldest",
+            "recent",
+        ]
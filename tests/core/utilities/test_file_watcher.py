@@ -0,0 +1,111 @@
+"""
+Copyright (c) Cutleast
+"""
+
+import os
+from pathlib import Path
+from threading import Event, Timer
+
+from core.utilities.file_watcher import FileWatcher
+from tests.base_test import BaseTest
+
+
+class TestFileWatcher(BaseTest):
+    """
+    Tests `core.utilities.file_watcher.FileWatcher`.
+    """
+
+    @staticmethod
+    def write(path: Path, content: bytes, mtime_ns: int) -> None:
+        """
+        Writes a file with the specified modification time, so that its stamp changes
+        regardless of the resolution of the file system's timestamps.
+
+        Args:
+            path (Path): The path to the file.
+            content (bytes): The content of the file.
+            mtime_ns (int): The modification time in nanoseconds.
+        """
+
+        path.write_bytes(content)
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+    def test_poll(self, tmp_path: Path) -> None:
+        """
+        Tests that only the changed file is reported and only once its stamp didn't
+        change for one poll.
+        """
+
+        # given
+        hudmenu: Path = tmp_path / "hudmenu.swf"
+        map_menu: Path = tmp_path / "map.swf"
+        TestFileWatcher.write(hudmenu, b"original", 1_000_000_000)
+        TestFileWatcher.write(map_menu, b"original", 1_000_000_000)
+        watcher = FileWatcher(
+            {Path("hudmenu.json"): hudmenu, Path("map.json"): map_menu}
+        )
+
+        # when
+        unchanged: list[Path] = watcher.poll()
+        TestFileWatcher.write(hudmenu, b"partly", 2_000_000_000)
+        writing: list[Path] = watcher.poll()
+        TestFileWatcher.write(hudmenu, b"patched file", 3_000_000_000)
+        still_writing: list[Path] = watcher.poll()
+        stable: list[Path] = watcher.poll()
+        after_update: list[Path] = watcher.poll()
+
+        # then
+        assert unchanged == []
+        assert writing == []
+        assert still_writing == []
+        assert stable == [Path("hudmenu.json")]
+        assert after_update == []
+
+    def test_poll_missing_file(self, tmp_path: Path) -> None:
+        """
+        Tests that a file that is temporarily missing isn't reported and that it's
+        reported once it was saved again.
+        """
+
+        # given
+        hudmenu: Path = tmp_path / "hudmenu.swf"
+        TestFileWatcher.write(hudmenu, b"original", 1_000_000_000)
+        watcher = FileWatcher({Path("hudmenu.json"): hudmenu})
+
+        # when
+        hudmenu.unlink()
+        missing: list[Path] = watcher.poll() + watcher.poll()
+        TestFileWatcher.write(hudmenu, b"patched", 2_000_000_000)
+        changed: list[Path] = watcher.poll() + watcher.poll()
+
+        # then
+        assert missing == []
+        assert changed == [Path("hudmenu.json")]
+
+    def test_watch(self, tmp_path: Path) -> None:
+        """
+        Tests that the callback is called for a changed file until watching is stopped.
+        """
+
+        # given
+        hudmenu: Path = tmp_path / "hudmenu.swf"
+        TestFileWatcher.write(hudmenu, b"original", 1_000_000_000)
+        watcher = FileWatcher({Path("hudmenu.json"): hudmenu})
+        stop = Event()
+        changed: list[Path] = []
+
+        def callback(key: Path) -> None:
+            changed.append(key)
+            stop.set()
+
+        # stops the test if the callback isn't called
+        timeout = Timer(5, stop.set)
+
+        # when
+        TestFileWatcher.write(hudmenu, b"patched", 2_000_000_000)
+        timeout.start()
+        watcher.watch(stop, 0.01, callback)
+        timeout.cancel()
+
+        # then
+        assert changed == [Path("hudmenu.json")]
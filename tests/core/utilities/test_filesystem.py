@@ -0,0 +1,50 @@
+"""
+Copyright (c) Cutleast
+"""
+
+from pathlib import Path
+
+from core.utilities.filesystem import cached_stats, invalidate, is_dir, is_file, mkdir
+from tests.base_test import BaseTest
+
+
+class TestFilesystem(BaseTest):
+    """
+    Tests `core.utilities.filesystem`.
+    """
+
+    def test_cached_stats(self, tmp_path: Path) -> None:
+        """
+        Tests that path types are cached until they are invalidated.
+        """
+
+        # given
+        file: Path = tmp_path / "hudmenu.swf"
+
+        with cached_stats():
+            # when
+            missing: bool = is_file(file)
+            file.write_bytes(b"")
+            stale: bool = is_file(file)
+            invalidate(file)
+            written: bool = is_file(file)
+
+        # then
+        assert not missing
+        assert not stale
+        assert written
+
+    def test_mkdir(self, tmp_path: Path) -> None:
+        """
+        Tests that folders are created natively.
+        """
+
+        # given
+        folder: Path = tmp_path / "interface" / "skyui"
+
+        # when
+        mkdir(folder)
+
+        # then
+        assert is_dir(folder)
+        assert not is_file(folder)
@@ -0,0 +1,103 @@
+"""
+Copyright (c) Cutleast
+"""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from core.utilities.glob import cached_listings, glob, invalidate_listings
+from tests.base_test import BaseTest
+
+
+class TestGlob(BaseTest):
+    """
+    Tests the scandir backend of `core.utilities.glob.glob()`.
+    """
+
+    @staticmethod
+    def create_files(folder: Path, files: list[str]) -> None:
+        """
+        Creates empty files at the specified paths, relative to a folder.
+
+        Args:
+            folder (Path): Base folder.
+            files (list[str]): Relative paths of the files.
+        """
+
+        for file in files:
+            (folder / file).parent.mkdir(parents=True, exist_ok=True)
+            (folder / file).touch()
+
+    GLOB_DATA: list[tuple[str | list[str], bool, list[str]]] = [
+        ("*.json", True, ["a.json", "sub/b.json", "sub/deep/c.json"]),
+        ("*.json", False, ["a.json"]),
+        (
+            ["*.json", "*.bin"],
+            True,
+            ["a.json", "d.bin", "sub/b.json", "sub/deep/c.json"],
+        ),
+        ("?.bin", True, ["d.bin"]),
+        ("java.exe", True, ["sub/deep/java.exe"]),
+        ("*", False, ["a.json", "a.json.bak", "d.bin", "json"]),
+    ]
+
+    @pytest.mark.parametrize("pattern, recursive, expected_files", GLOB_DATA)
+    def test_glob(
+        self,
+        tmp_path: Path,
+        pattern: str | list[str],
+        recursive: bool,
+        expected_files: list[str],
+    ) -> None:
+        """
+        Tests that only regular files whose names fully match a pattern are returned.
+
+        Args:
+            pattern (str | list[str]): Pattern(s) to search for.
+            recursive (bool): Whether to search recursively.
+            expected_files (list[str]): Expected relative paths of the found files.
+        """
+
+        # given
+        TestGlob.create_files(
+            tmp_path,
+            [
+                "a.json",
+                "a.json.bak",
+                "d.bin",
+                "json",
+                "sub/b.json",
+                "sub/deep/c.json",
+                "sub/deep/java.exe",
+                "sub/deep/java.exe.old",
+            ],
+        )
+
+        # when
+        actual_files: list[Path] = glob(tmp_path, pattern, recursive)
+
+        # then
+        assert sorted(actual_files) == [tmp_path / f for f in expected_files]
+
+    def test_cached_listings(self, tmp_path: Path) -> None:
+        """
+        Tests that directory listings are cached until they're invalidated.
+        """
+
+        # given
+        TestGlob.create_files(tmp_path, ["a.json"])
+
+        with cached_listings():
+            # when
+            before: list[Path] = glob(tmp_path, "*.json")
+            TestGlob.create_files(tmp_path, ["b.json"])
+            cached: list[Path] = glob(tmp_path, "*.json")
+            invalidate_listings(tmp_path)
+            invalidated: list[Path] = glob(tmp_path, "*.json")
+
+        # then
+        assert before == cached == [tmp_path / "a.json"]
+        assert sorted(invalidated) == [tmp_path / "a.json", tmp_path / "b.json"]
+        assert len(glob(tmp_path, "*.json")) == len(os.listdir(tmp_path))
@@ -0,0 +1,50 @@
+"""
+Copyright (c) Cutleast
+"""
+
+import importlib
+import sys
+from pathlib import Path
+
+from core.utilities.import_profiler import ImportProfiler, ImportTiming
+from tests.base_test import BaseTest
+
+
+class TestImportProfiler(BaseTest):
+    """
+    Tests `core.utilities.import_profiler.ImportProfiler`.
+    """
+
+    def test_profile_imports(self, tmp_path: Path) -> None:
+        """
+        Tests that nested imports are timed and that the modules keep their original
+        loaders.
+        """
+
+        # given
+        (tmp_path / "dip_profiled_outer.py").write_text("import dip_profiled_inner\n")
+        (tmp_path / "dip_profiled_inner.py").write_text("VALUE = 1\n")
+        sys.path.insert(0, str(tmp_path))
+        profiler = ImportProfiler()
+
+        # when
+        profiler.install()
+        try:
+            module = importlib.import_module("dip_profiled_outer")
+        finally:
+            profiler.uninstall()
+            sys.path.remove(str(tmp_path))
+            sys.modules.pop("dip_profiled_outer", None)
+            sys.modules.pop("dip_profiled_inner", None)
+
+        # then
+        timings: dict[str, ImportTiming] = {t.name: t for t in profiler.timings}
+        assert timings["dip_profiled_outer"].depth == 0
+        assert timings["dip_profiled_inner"].depth == 1
+        assert (
+            timings["dip_profiled_outer"].cumulative
+            >= timings["dip_profiled_inner"].cumulative
+        )
+        assert type(module.__loader__).__name__ == "SourceFileLoader"
+        assert "dip_profiled_outer" in profiler.get_report()
+        assert profiler not in sys.meta_path
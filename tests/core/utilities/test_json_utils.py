@@ -0,0 +1,67 @@
+"""
+Copyright (c) Cutleast
+"""
+
+from pathlib import Path
+from typing import Any
+
+import jstyleson
+import pytest
+
+from core.utilities import json_utils
+
+JSONC_DATA: list[tuple[str, Any]] = [
+    ('{"a": "b"}', {"a": "b"}),
+    ('{\n    // comment\n    "a": "b" // comment\n}', {"a": "b"}),
+    ('{/* multi\n line\n comment */"a": /**/ "b"}', {"a": "b"}),
+    ('{"a": [1, 2, 3,], "b": {"c": "d",},}', {"a": [1, 2, 3], "b": {"c": "d"}}),
+    ('{"a": [1, 2, 3, // comment\n]}', {"a": [1, 2, 3]}),
+    ('{"a": [1, /* , */ 2,/**/ ]}', {"a": [1, 2]}),
+    (
+        '{"url": "https://example.com/*not a comment*/"}',
+        {"url": "https://example.com/*not a comment*/"},
+    ),
+    ('{"a": "escaped \\" // quote", "b": "c"}', {"a": 'escaped " // quote', "b": "c"}),
+    ('{"a": "trailing ,]", "b": "\\\\"}', {"a": "trailing ,]", "b": "\\"}),
+    ('{"a": [1, 2], "b": 3}', {"a": [1, 2], "b": 3}),
+    ('{\n    // he said "hi\n    "a": "b" /* "quoted" */\n}', {"a": "b"}),
+    ('{"a": "b" /* "quoted, */, "c": "// d",\n}', {"a": "b", "c": "// d"}),
+]
+
+
+@pytest.mark.parametrize("json_str, expected_data", JSONC_DATA)
+def test_loads(json_str: str, expected_data: Any) -> None:
+    """
+    Tests the deserialization of JSON strings with comments and trailing commas.
+    """
+
+    # when
+    actual_data: Any = json_utils.loads(json_str)
+
+    # then
+    assert actual_data == expected_data
+    assert actual_data == jstyleson.loads(json_str)
+
+
+REPO_PATH: Path = Path(__file__).parents[3]
+REPO_JSON_FILES: list[Path] = [
+    REPO_PATH / "res" / "config" / "patch_creator_config.json",
+    *(REPO_PATH / "Example Patch" / "Patch").rglob("*.json"),
+]
+
+
+@pytest.mark.parametrize("json_file", REPO_JSON_FILES)
+def test_loads_repo_files(json_file: Path) -> None:
+    """
+    Tests that the JSON files in this repository are deserialized exactly like
+    jstyleson does.
+    """
+
+    # given
+    json_str: str = json_file.read_text(encoding="utf-8")
+
+    # when
+    actual_data: Any = json_utils.loads(json_str)
+
+    # then
+    assert actual_data == jstyleson.loads(json_str)
@@ -0,0 +1,184 @@
+"""
+Copyright (c) Cutleast
+"""
+
+import time
+from pathlib import Path
+from typing import Optional
+
+import pytest
+
+from core.utilities.progress import (
+    FileFinished,
+    FileStarted,
+    ProgressEvent,
+    ProgressReporter,
+    StageFinished,
+    StageStarted,
+    StageThroughput,
+    ThroughputHistory,
+    format_duration,
+)
+from tests.base_test import BaseTest
+
+
+class TestProgress(BaseTest):
+    """
+    Tests `core.utilities.progress`.
+    """
+
+    def test_events(self, tmp_path: Path) -> None:
+        """
+        Tests that the events of a stage are emitted in order with the counts of the
+        stage.
+        """
+
+        # given
+        files: list[Path] = [tmp_path / "hudmenu.swf", tmp_path / "map.swf"]
+        files[0].write_bytes(b"0" * 10)
+        files[1].write_bytes(b"0" * 30)
+        reporter = ProgressReporter(history_path=None)
+        events: list[ProgressEvent] = []
+        reporter.add_listener(events.append)
+
+        # when
+        reporter.start_run()
+        with reporter.stage("Converting SWFs to XMLs", files):
+            for file in files:
+                with reporter.file(file):
+                    pass
+        reporter.finish_run()
+
+        # then
+        assert [type(event) for event in events] == [
+            StageStarted,
+            FileStarted,
+            FileFinished,
+            FileStarted,
+            FileFinished,
+            StageFinished,
+        ]
+        assert all(event.stage == "Converting SWFs to XMLs" for event in events)
+        assert [event.items_done for event in events] == [0, 0, 1, 1, 2, 2]
+        assert events[-1].items_total == 2
+        assert events[-1].bytes_done == events[-1].bytes_total == 40
+
+    def test_failed_stage(self, tmp_path: Path) -> None:
+        """
+        Tests that a failed stage is finished but not added to the history.
+        """
+
+        # given
+        history_path: Path = tmp_path / "history.json"
+        reporter = ProgressReporter(history_path=history_path)
+        events: list[ProgressEvent] = []
+        reporter.add_listener(events.append)
+
+        # when
+        with pytest.raises(FileNotFoundError):
+            with reporter.stage("Preparing mod files", items=3):
+                raise FileNotFoundError
+        reporter.finish_run()
+
+        # then
+        assert isinstance(events[-1], StageFinished)
+        assert "Preparing mod files" not in history_path.read_text()
+
+    def test_eta_from_history(self, tmp_path: Path) -> None:
+        """
+        Tests that the ETA of a run includes the planned stages with the throughput of
+        previous runs.
+        """
+
+        # given
+        history_path: Path = tmp_path / "history.json"
+        history_path.write_text(
+            '{"stages": {"Patching XMLs": {"seconds_per_item": 2.0}, '
+            '"Finalizing files": {"seconds_per_item": 0.5}}}'
+        )
+        reporter = ProgressReporter(history_path=history_path)
+
+        # when
+        reporter.start_run()
+        reporter.plan("Patching XMLs", 3)
+        reporter.plan("Finalizing files", 4)
+        reporter.plan("Applying binary patches", 2)
+        eta: Optional[float] = reporter.get_eta()
+
+        # then
+        assert eta == pytest.approx(3 * 2.0 + 4 * 0.5)
+
+    def test_history(self, tmp_path: Path) -> None:
+        """
+        Tests that the throughput of finished stages is saved and used by the next
+        reporter.
+        """
+
+        # given
+        history_path: Path = tmp_path / "history.json"
+        reporter = ProgressReporter(history_path=history_path)
+        reporter.start_run()
+        with reporter.stage("Setting up Java Runtime", items=1):
+            pass
+        reporter.finish_run()
+
+        # when
+        next_reporter = ProgressReporter(history_path=history_path)
+        next_reporter.start_run()
+        next_reporter.plan("Setting up Java Runtime", 1)
+        eta: Optional[float] = next_reporter.get_eta()
+
+        # then
+        assert history_path.is_file()
+        assert eta is not None
+
+    def test_skipped_files(self, tmp_path: Path) -> None:
+        """
+        Tests that skipped files count as finished but are excluded from the throughput
+        history.
+        """
+
+        # given
+        history_path: Path = tmp_path / "history.json"
+        files: list[Path] = [tmp_path / "hudmenu.swf", tmp_path / "map.swf"]
+        files[0].write_bytes(b"0" * 10)
+        files[1].write_bytes(b"0" * 30)
+        reporter = ProgressReporter(history_path=history_path)
+        events: list[ProgressEvent] = []
+        reporter.add_listener(events.append)
+
+        # when
+        reporter.start_run()
+        with reporter.stage("Patching XMLs", files):
+            with reporter.file(files[0]):
+                time.sleep(0.05)
+            with reporter.file(files[1]):
+                reporter.skip_file()
+        with reporter.stage("Applying binary patches", files):
+            for file in files:
+                reporter.advance(file, skipped=True)
+        reporter.finish_run()
+
+        # then
+        history: ThroughputHistory = ThroughputHistory.model_validate_json(
+            history_path.read_bytes()
+        )
+        throughput: StageThroughput = history.stages["Patching XMLs"]
+        assert throughput.seconds_per_item is not None
+        assert throughput.seconds_per_item >= 0.05
+        assert throughput.seconds_per_byte is not None
+        assert throughput.seconds_per_byte >= 0.05 / 10
+        assert "Applying binary patches" not in history.stages
+        assert [
+            event.skipped for event in events if isinstance(event, FileFinished)
+        ] == [False, True, True, True]
+        assert events[-1].items_done == 2
+
+    def test_format_duration(self) -> None:
+        """
+        Tests that durations are formatted with minutes and optionally hours.
+        """
+
+        assert format_duration(0) == "0:00"
+        assert format_duration(309.4) == "5:09"
+        assert format_duration(3909) == "1:05:09"
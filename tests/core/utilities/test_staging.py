@@ -0,0 +1,72 @@
+"""
+Copyright (c) Cutleast
+"""
+
+import os
+from pathlib import Path
+
+from core.utilities.staging import StagingMethod, move_file, stage_file
+from tests.base_test import BaseTest
+
+
+class TestStaging(BaseTest):
+    """
+    Tests `core.utilities.staging`.
+    """
+
+    def test_stage_file(self, tmp_path: Path) -> None:
+        """
+        Tests that a staged file that may be modified is never a hardlink.
+        """
+
+        # given
+        src: Path = tmp_path / "src.swf"
+        src.write_bytes(os.urandom(1024 * 1024))
+        dst: Path = tmp_path / "dst.swf"
+
+        # when
+        method: StagingMethod = stage_file(src, dst)
+
+        # then
+        assert method != StagingMethod.Hardlink
+        assert not os.path.samefile(src, dst)
+        assert dst.read_bytes() == src.read_bytes()
+
+    def test_stage_read_only_file(self, tmp_path: Path) -> None:
+        """
+        Tests that staging a file over a hardlink of a previous run doesn't change the
+        source file.
+        """
+
+        # given
+        src: Path = tmp_path / "src.swf"
+        src.write_bytes(b"original")
+        dst: Path = tmp_path / "dst.swf"
+        stage_file(src, dst, read_only=True)
+        other_src: Path = tmp_path / "other.swf"
+        other_src.write_bytes(b"other")
+
+        # when
+        stage_file(other_src, dst)
+
+        # then
+        assert src.read_bytes() == b"original"
+        assert dst.read_bytes() == b"other"
+
+    def test_move_file(self, tmp_path: Path) -> None:
+        """
+        Tests that a file is moved on the same file system.
+        """
+
+        # given
+        src: Path = tmp_path / "src.swf"
+        src.write_bytes(b"data")
+        dst: Path = tmp_path / "dst.swf"
+
+        # when
+        method: StagingMethod = move_file(src, dst)
+
+        # then
+        assert method == StagingMethod.Move
+        assert not src.exists()
+        assert dst.read_bytes() == b"data"
@@ -0,0 +1,63 @@
+"""
+Copyright (c) Cutleast
+"""
+
+import json
+from pathlib import Path
+from typing import Any
+
+from core.utilities import trace
+from tests.base_test import BaseTest
+
+
+class TestTrace(BaseTest):
+    """
+    Tests `core.utilities.trace`.
+    """
+
+    def test_span(self, tmp_path: Path) -> None:
+        """
+        Tests that nested spans are saved as complete events in Chrome trace event
+        format.
+        """
+
+        # given
+        trace_path: Path = tmp_path / "trace.json"
+        trace.start_tracing()
+
+        # when
+        with trace.span("Converting SWFs to XMLs", "stage"):
+            with trace.span("swf2xml", "process", file=Path("hudmenu.swf")):
+                pass
+        trace.stop_tracing(trace_path)
+
+        # then
+        data: dict[str, Any] = json.loads(trace_path.read_text())
+        events: list[dict[str, Any]] = [
+            event for event in data["traceEvents"] if event["ph"] == "X"
+        ]
+        assert [event["name"] for event in events] == [
+            "swf2xml",
+            "Converting SWFs to XMLs",
+        ]
+        assert events[0]["args"] == {"file": "hudmenu.swf"}
+        assert events[1]["ts"] <= events[0]["ts"]
+        assert events[0]["ts"] + events[0]["dur"] <= events[1]["ts"] + events[1]["dur"]
+        assert any(event["ph"] == "M" for event in data["traceEvents"])
+
+    def test_disabled(self, tmp_path: Path) -> None:
+        """
+        Tests that spans are not recorded while tracing is disabled.
+        """
+
+        # given
+        trace_path: Path = tmp_path / "trace.json"
+
+        # when
+        with trace.span("swf2xml", "process"):
+            pass
+        tracer: trace.Tracer = trace.start_tracing()
+        trace.stop_tracing(trace_path)
+
+        # then
+        assert tracer.events == []
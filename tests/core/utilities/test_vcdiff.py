@@ -0,0 +1,299 @@
+"""
+Copyright (c) Cutleast
+"""
+
+import os
+import zlib
+from pathlib import Path
+from typing import Optional
+
+import pytest
+
+from core.utilities import vcdiff
+from tests.base_test import BaseTest
+
+
+class TestVCDiff(BaseTest):
+    """
+    Tests `core.utilities.vcdiff`.
+    """
+
+    SOURCE: bytes = b"Hello, World! This is the source file."
+    TARGET: bytes = b"Hello, DIP!!!!!DIP!!!!!DIP!"
+
+    DATA: bytes = b"DIP!"
+    INSTRUCTIONS: bytes = bytes(
+        [
+            23,  # COPY 7 bytes, mode VCD_SELF
+            4,  # ADD 3 bytes
+            0,  # RUN with separate size
+            5,
+            44,  # COPY 12 bytes, mode VCD_HERE (overlapping the target window)
+        ]
+    )
+    ADDRESSES: bytes = bytes([0, 8])
+
+    DATA_PATH: Path = Path(__file__).parent / "data" / "vcdiff"
+    """
+    Folder with a delta created by xdelta 3.1.1 with
+    `xdelta3 -e -W 16384 -S none -s source.swf target.swf source.bin`. It has an
+    application header and multiple windows and uses all address modes.
+    """
+
+    @staticmethod
+    def build_window(
+        target: bytes,
+        data: bytes,
+        instructions: bytes,
+        addresses: bytes,
+        window_indicator: int = vcdiff.VCD_SOURCE,
+        segment: tuple[int, int] = (len(SOURCE), 0),
+        checksum: Optional[int] = None,
+    ) -> bytes:
+        """
+        Builds a single window with small sections.
+
+        Args:
+            target (bytes): The decoded window.
+            data (bytes): The data section.
+            instructions (bytes): The instructions section.
+            addresses (bytes): The addresses section.
+            window_indicator (int, optional):
+                The window indicator without `VCD_ADLER32`. Defaults to `VCD_SOURCE`.
+            segment (tuple[int, int], optional):
+                The size and position of the source or target segment. Defaults to
+                the whole `SOURCE`.
+            checksum (Optional[int], optional):
+                The Adler-32 checksum of the window. Defaults to the correct one.
+
+        Returns:
+            bytes: The window
+        """
+
+        window: bytes = (
+            bytes(
+                [
+                    len(target),
+                    0,  # delta indicator
+                    len(data),
+                    len(instructions),
+                    len(addresses),
+                ]
+            )
+            + (checksum if checksum is not None else zlib.adler32(target)).to_bytes(
+                4, "big"
+            )
+            + data
+            + instructions
+            + addresses
+        )
+
+        header: bytes = bytes([window_indicator | vcdiff.VCD_ADLER32])
+        if window_indicator & (vcdiff.VCD_SOURCE | vcdiff.VCD_TARGET):
+            header += bytes(segment)
+
+        return header + bytes([len(window)]) + window
+
+    @staticmethod
+    def build_delta(
+        header_indicator: int = 0, checksum: int = zlib.adler32(TARGET)
+    ) -> bytes:
+        """
+        Builds a delta with a single window that turns `SOURCE` into `TARGET`.
+
+        Args:
+            header_indicator (int, optional): The header indicator. Defaults to 0.
+            checksum (int, optional):
+                The Adler-32 checksum of the window. Defaults to the correct one.
+
+        Returns:
+            bytes: The delta
+        """
+
+        return (
+            vcdiff.MAGIC
+            + bytes([header_indicator])
+            + TestVCDiff.build_window(
+                TestVCDiff.TARGET,
+                TestVCDiff.DATA,
+                TestVCDiff.INSTRUCTIONS,
+                TestVCDiff.ADDRESSES,
+                checksum=checksum,
+            )
+        )
+
+    def test_decode(self, tmp_path: Path) -> None:
+        """
+        Tests decoding a delta with copies from the source and overlapping copies
+        within the target.
+        """
+
+        # given
+        source_path: Path = tmp_path / "source.swf"
+        source_path.write_bytes(TestVCDiff.SOURCE)
+        delta_path: Path = tmp_path / "source.bin"
+        delta_path.write_bytes(TestVCDiff.build_delta())
+        target_path: Path = tmp_path / "target.swf"
+
+        # when
+        vcdiff.decode(delta_path, source_path, target_path)
+
+        # then
+        assert target_path.read_bytes() == TestVCDiff.TARGET
+
+    def test_decode_xdelta3(self, tmp_path: Path) -> None:
+        """
+        Tests decoding a delta created by xdelta3.
+        """
+
+        # given
+        target_path: Path = tmp_path / "target.swf"
+
+        # when
+        vcdiff.decode(
+            TestVCDiff.DATA_PATH / "source.bin",
+            TestVCDiff.DATA_PATH / "source.swf",
+            target_path,
+        )
+
+        # then
+        assert (
+            target_path.read_bytes()
+            == (TestVCDiff.DATA_PATH / "target.swf").read_bytes()
+        )
+
+    def test_decode_address_caches(self, tmp_path: Path) -> None:
+        """
+        Tests decoding copies with addresses relative to the "near" cache and from
+        the "same" cache, including a copy that continues from the source segment into
+        the target window.
+        """
+
+        # given
+        source: bytes = b"0123456789abcdefghij"
+        target: bytes = b"abcdghijijababcd"
+        instructions: bytes = bytes(
+            [
+                20,  # COPY 4 bytes, mode VCD_SELF
+                52,  # COPY 4 bytes, mode near[0] + 6
+                68,  # COPY 4 bytes, mode near[1] + 2 (overlapping the target window)
+                116,  # COPY 4 bytes, mode same[0 * 256 + 10]
+            ]
+        )
+        addresses: bytes = bytes([10, 6, 2, 10])
+        source_path: Path = tmp_path / "source.swf"
+        source_path.write_bytes(source)
+        delta_path: Path = tmp_path / "source.bin"
+        delta_path.write_bytes(
+            vcdiff.MAGIC
+            + bytes([0])
+            + TestVCDiff.build_window(
+                target, b"", instructions, addresses, segment=(len(source), 0)
+            )
+        )
+        target_path: Path = tmp_path / "target.swf"
+
+        # when
+        vcdiff.decode(delta_path, source_path, target_path)
+
+        # then
+        assert target_path.read_bytes() == target
+
+    def test_decode_target_window(self, tmp_path: Path) -> None:
+        """
+        Tests decoding a delta with an application header and a second window that
+        copies from the already decoded target.
+        """
+
+        # given
+        app_header: bytes = b"target.swf//source.swf/"
+        first_window: bytes = TestVCDiff.build_window(
+            b"Hello",
+            b"",
+            bytes([21]),  # COPY 5 bytes, mode VCD_SELF
+            bytes([0]),
+            segment=(5, 0),
+        )
+        second_window: bytes = TestVCDiff.build_window(
+            b"Hello!",
+            b"!",
+            bytes([21, 2]),  # COPY 5 bytes, mode VCD_SELF, ADD 1 byte
+            bytes([0]),
+            window_indicator=vcdiff.VCD_TARGET,
+            segment=(5, 0),
+        )
+        source_path: Path = tmp_path / "source.swf"
+        source_path.write_bytes(b"Hello, World!")
+        delta_path: Path = tmp_path / "source.bin"
+        delta_path.write_bytes(
+            vcdiff.MAGIC
+            + bytes([vcdiff.VCD_APPHEADER, len(app_header)])
+            + app_header
+            + first_window
+            + second_window
+        )
+        target_path: Path = tmp_path / "target.swf"
+
+        # when
+        vcdiff.decode(delta_path, source_path, target_path)
+
+        # then
+        assert target_path.read_bytes() == b"HelloHello!"
+
+    def test_decode_invalid_checksum(self, tmp_path: Path) -> None:
+        """
+        Tests that a window with an invalid checksum is rejected.
+        """
+
+        # given
+        source_path: Path = tmp_path / "source.swf"
+        source_path.write_bytes(TestVCDiff.SOURCE)
+        delta_path: Path = tmp_path / "source.bin"
+        delta_path.write_bytes(TestVCDiff.build_delta(checksum=0))
+
+        # then
+        with pytest.raises(ValueError):
+            vcdiff.decode(delta_path, source_path, tmp_path / "target.swf")
+
+    def test_decode_secondary_compression(self, tmp_path: Path) -> None:
+        """
+        Tests that secondary compression is reported as not implemented.
+        """
+
+        # given
+        source_path: Path = tmp_path / "source.swf"
+        source_path.write_bytes(TestVCDiff.SOURCE)
+        delta_path: Path = tmp_path / "source.bin"
+        delta_path.write_bytes(
+            TestVCDiff.build_delta(header_indicator=vcdiff.VCD_DECOMPRESS)
+        )
+
+        # then
+        with pytest.raises(NotImplementedError):
+            vcdiff.decode(delta_path, source_path, tmp_path / "target.swf")
+
+    def test_encode(self, tmp_path: Path) -> None:
+        """
+        Tests that an encoded delta is decoded to the target file and only contains
+        the differences.
+        """
+
+        # given
+        source: bytes = os.urandom(256 * 1024)
+        target: bytes = (
+            source[:1000] + b"patched" + source[1000:200_000] + source[:5000]
+        )
+        source_path: Path = tmp_path / "source.swf"
+        source_path.write_bytes(source)
+        target_path: Path = tmp_path / "target.swf"
+        target_path.write_bytes(target)
+        delta_path: Path = tmp_path / "target.bin"
+        output_path: Path = tmp_path / "output.swf"
+
+        # when
+        vcdiff.encode(source_path, target_path, delta_path)
+        vcdiff.decode(delta_path, source_path, output_path)
+
+        # then
+        assert output_path.read_bytes() == target
+        assert delta_path.stat().st_size < 100